@@ -0,0 +1,5 @@
+"""
+This package contains scripts that measure the performance of weatherman,
+run them from the root of the repository e.g 'python -m benchmarks' for the
+main paths or 'python -m benchmarks.memory' for the memory of each layout
+"""
@@ -0,0 +1,291 @@
+"""
+This script times the main paths of weatherman on synthetic weather files and
+prints the wall time, rows per second and peak RSS of each stage as JSON
+usage: python -m benchmarks [--stations=N] [--years=M] [--first-year=YYYY]
+                            [--seed=N] [--path=DIR] [--output=FILE]
+--path times the weather files of a directory instead of synthetic ones
+It exits with status 1 if the year extremes of LazyYearData loaded any days
+"""
+import io
+import json
+import platform
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from getopt import GetoptError, getopt
+
+from benchmarks.generator import (
+    DEFAULT_FIRST_YEAR,
+    DEFAULT_STATIONS,
+    DEFAULT_YEARS,
+    generate,
+)
+from modules.data_models import DayData, MonthData, ReportGenerator, YearData
+from modules.file_index import get_file_index
+from modules.lazy_data import LazyYearData
+from modules.summary import get_summary_table
+from modules.utils import read_data, read_lines, read_schema
+
+try:
+    import resource
+except ImportError:
+    # resource is only available on Unix
+    resource = None  # pylint: disable=invalid-name
+
+LONG_OPTIONS = ["stations=", "years=", "first-year=", "seed=", "path=", "output="]
+
+
+def get_peak_rss():
+    """
+    Returns the peak resident set size of the process so far
+    Returns:
+        (int or None):  size in bytes
+                        Or
+                        None if the platform can't report it
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class Benchmark:
+    """
+    This class times the stages of a run and collects their results
+    """
+
+    def __init__(self):
+        """
+        Initializes the stages member
+        """
+        self.stages = []
+
+    def time(self, name, rows, function, *args):
+        """
+        Calls a function once and records its wall time, the stdout of the
+        function is discarded so reports are timed without the terminal
+        Args:
+            name(str):  name of the stage
+            rows(int):  number of rows the stage goes through
+            function(function): function running the stage
+            args:   arguments passed to function
+        Returns:
+            value returned by function
+        """
+        start = time.perf_counter()
+        with redirect_stdout(io.StringIO()):
+            result = function(*args)
+        seconds = time.perf_counter() - start
+        self.stages.append(
+            {
+                "name": name,
+                "seconds": round(seconds, 6),
+                "rows": rows,
+                "rows_per_second": round(rows / seconds) if rows and seconds else None,
+                # the peak of the whole process up to the end of this stage
+                "peak_rss_bytes": get_peak_rss(),
+            }
+        )
+        return result
+
+
+def consume_read_data(years, path):
+    """
+    Reads every line of the years with utils.read_data
+    Args:
+        years(list):    list of years(int)
+        path(str):  Value containing path to weather files e.g 'weatherfiles/'
+    Returns:
+        None
+    """
+    for year in years:
+        for lines in read_data(str(year), path):
+            for _ in lines:
+                pass
+
+
+def populate_days(files):
+    """
+    Returns a DayData object for every line of the files
+    Args:
+        files(list):    list of (schema, lines) tuples of the weather files
+    Returns:
+        (list): list of DayData objects
+    """
+    return [DayData(line, schema=schema) for schema, lines in files for line in lines]
+
+
+def build_months(months, path):
+    """
+    Returns a MonthData object for every month
+    Args:
+        months(list):   list of (year(int), month(int)) tuples
+        path(str):  Value containing path to weather files e.g 'weatherfiles/'
+    Returns:
+        (list): list of MonthData objects
+    """
+    return [MonthData(year, month, path) for year, month in months]
+
+
+def build_years(years, path):
+    """
+    Returns a YearData object for every year
+    Args:
+        years(list):    list of years(int)
+        path(str):  Value containing path to weather files e.g 'weatherfiles/'
+    Returns:
+        (list): list of YearData objects
+    """
+    return [YearData(year, path) for year in years]
+
+
+def browse_lazy_years(years, path):
+    """
+    Writes the extremes report of every year without loading the days
+    Args:
+        years(list):    list of years(int)
+        path(str):  Value containing path to weather files e.g 'weatherfiles/'
+    Returns:
+        (list): list of LazyYearData objects
+    """
+    year_data = [LazyYearData(year, path) for year in years]
+    for year in year_data:
+        ReportGenerator(year_data=year).generate_extremes_report()
+    return year_data
+
+
+def count_loaded_months(year_data):
+    """
+    Returns the number of months whose days have been loaded
+    Args:
+        year_data(list):    list of LazyYearData objects
+    Returns:
+        (int):  number of LazyMonthData objects having their days loaded
+    """
+    return sum(
+        month_data.is_loaded() for year in year_data for month_data in year.months_data
+    )
+
+
+def generate_reports(report, generators):
+    """
+    Calls a report method of every generator
+    Args:
+        report(str):    name of a ReportGenerator method
+        generators(list):   list of ReportGenerator objects
+    Returns:
+        None
+    """
+    for generator in generators:
+        getattr(generator, report)()
+
+
+def time_reports(benchmark, month_data, year_data, rows):
+    """
+    Times every report of ReportGenerator on loaded months and years
+    Args:
+        benchmark(Benchmark):   benchmark collecting the stages
+        month_data(list):   list of MonthData objects
+        year_data(list):    list of YearData objects
+        rows(int):  number of rows in the months
+    Returns:
+        None
+    """
+    month_generators = [ReportGenerator(month_data=month) for month in month_data]
+    year_generators = [ReportGenerator(year_data=year) for year in year_data]
+    reports = [
+        ("generate_extremes_report", year_generators),
+        ("generate_averages_report_month", month_generators),
+        ("generate_report_charts", month_generators),
+    ]
+    for report, generators in reports:
+        name = f"ReportGenerator.{report}"
+        benchmark.time(name, rows, generate_reports, report, generators)
+
+
+def run(path):
+    """
+    Times every stage on the weather files of a directory
+    Args:
+        path(str):  Value containing path to weather files e.g 'weatherfiles/'
+    Returns:
+        (dict): {"rows": rows(int), "files": files(int), "stages": [stage(dict), ...]}
+    """
+    benchmark = Benchmark()
+    index = get_file_index(path)
+    file_paths = sorted(index.files.values())
+    schemas = benchmark.time(
+        "read_schema", 0, lambda: list(map(read_schema, file_paths))
+    )
+    files = [
+        (schema, list(read_lines(file_path)))
+        for schema, file_path in zip(schemas, file_paths)
+        if schema is not None
+    ]
+    rows = sum(len(lines) for _, lines in files)
+    years = sorted({year for _, year, _ in index.files})
+    months = sorted(index.month_files)
+    # MonthData and YearData load the first station of each month
+    month_rows = sum(
+        sum(1 for _ in read_lines(index.get(year, month))) for year, month in months
+    )
+    benchmark.time("read_data", rows, consume_read_data, years, path)
+    benchmark.time("DayData.populate", rows, populate_days, files)
+    benchmark.time("MonthData (first load)", month_rows, build_months, months, path)
+    month_data = benchmark.time(
+        "MonthData (cached)", month_rows, build_months, months, path
+    )
+    year_data = benchmark.time("YearData", month_rows, build_years, years, path)
+    lazy_data = benchmark.time(
+        "LazyYearData", month_rows, browse_lazy_years, years, path
+    )
+    time_reports(benchmark, month_data, year_data, month_rows)
+    return {
+        "rows": rows,
+        "files": len(file_paths),
+        "stages": benchmark.stages,
+        # the year extremes are answered from the summary table, so no
+        # LazyMonthData may have read its days
+        "lazy_loaded_months": count_loaded_months(lazy_data),
+    }
+
+
+def main():
+    """
+    Generates the synthetic files, runs the stages and prints the results
+    Returns:
+        None
+    """
+    try:
+        options = dict(getopt(sys.argv[1:], "", LONG_OPTIONS)[0])
+    except GetoptError as error:
+        print(f"{error}\n{__doc__.strip()}")
+        return
+    stations = int(options.get("--stations", DEFAULT_STATIONS))
+    years = int(options.get("--years", DEFAULT_YEARS))
+    first_year = int(options.get("--first-year", DEFAULT_FIRST_YEAR))
+    seed = int(options.get("--seed", 0))
+    results = {"python": platform.python_version(), "platform": sys.platform}
+    if "--path" in options:
+        results.update(run(options["--path"]))
+    else:
+        with tempfile.TemporaryDirectory() as path:
+            generate(path, stations, years, first_year=first_year, seed=seed)
+            results.update({"stations": stations, "years": years, "seed": seed})
+            results.update(run(path))
+            # written now, the directory is gone when the program exits
+            get_summary_table(path).save()
+    report = json.dumps(results, indent=2)
+    if "--output" in options:
+        with open(options["--output"], "w", encoding="utf-8") as file:
+            file.write(f"{report}\n")
+    print(report)
+    if results["lazy_loaded_months"]:
+        print("LazyYearData loaded the days of a month for the year extremes")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
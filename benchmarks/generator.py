@@ -0,0 +1,161 @@
+"""
+This script writes synthetic weather files in the format of the files in
+weatherfiles/, for N stations and M years. Some readings are missing and some
+rows are malformed like in the real exports
+usage: python -m benchmarks.generator path [stations] [years] [first_year]
+"""
+import calendar
+import os
+import random
+import sys
+
+from constants import months_list
+
+HEADER = (
+    "PKT,Max TemperatureC,Mean TemperatureC,Min TemperatureC,Dew PointC,"
+    "MeanDew PointC,Min DewpointC,Max Humidity, Mean Humidity, Min Humidity,"
+    " Max Sea Level PressurehPa, Mean Sea Level PressurehPa,"
+    " Min Sea Level PressurehPa, Max VisibilityKm, Mean VisibilityKm,"
+    " Min VisibilitykM, Max Wind SpeedKm/h, Mean Wind SpeedKm/h,"
+    " Max Gust SpeedKm/h,Precipitationmm, CloudCover, Events,WindDirDegrees"
+)
+EVENTS = ["", "", "", "Rain", "Fog", "Thunderstorm", "Rain-Thunderstorm", "Snow"]
+DEFAULT_STATIONS = 2
+DEFAULT_YEARS = 5
+DEFAULT_FIRST_YEAR = 2000
+# chance of a reading being empty and of a row being malformed
+MISSING_RATE = 0.05
+MALFORMED_RATE = 0.01
+
+
+def get_row(day, month, year, generator):
+    """
+    Returns the 23 fields of a day with readings that follow the seasons
+    Args:
+        day(int):   day of the month
+        month(int): Number containing value in range 1-12
+        year(int):  4 digit year e.g 2004
+        generator(random.Random):   source of random numbers
+    Returns:
+        (list): list of 23 strings
+    """
+    # temperatures peak in July and bottom out in January
+    season = 15 - abs(month - 7) * 3
+    max_temperature = season + generator.randint(5, 15)
+    min_temperature = max_temperature - generator.randint(3, 15)
+    max_humidity = generator.randint(40, 100)
+    min_humidity = max_humidity - generator.randint(0, 40)
+    dew_point = min_temperature - generator.randint(0, 8)
+    pressure = generator.randint(1000, 1025)
+    readings = [
+        max_temperature,
+        (max_temperature + min_temperature) // 2,
+        min_temperature,
+        dew_point + 3,
+        dew_point,
+        dew_point - 3,
+        max_humidity,
+        (max_humidity + min_humidity) // 2,
+        min_humidity,
+        pressure + 3,
+        pressure,
+        pressure - 3,
+        "10.0",
+        f"{generator.randint(2, 10)}.0",
+        f"{generator.randint(0, 2)}.0",
+        generator.randint(5, 40),
+        generator.randint(0, 10),
+        generator.choice(["", generator.randint(20, 70)]),
+        f"{generator.choice([0, 0, 0, 1.5, 12.2])}",
+        generator.randint(0, 8),
+        generator.choice(EVENTS),
+        generator.randint(-1, 360),
+    ]
+    fields = [f"{year}-{month}-{day}"]
+    for reading in readings:
+        fields.append("" if generator.random() < MISSING_RATE else str(reading))
+    return fields
+
+
+def malform(fields, generator):
+    """
+    Damages a row the ways real exports do, a row is cut short or a reading
+    holds text. Dates are kept intact
+    Args:
+        fields(list):   list of 23 strings returned by get_row
+        generator(random.Random):   source of random numbers
+    Returns:
+        (list): damaged list of strings
+    """
+    if generator.random() < 0.5:
+        return fields[: generator.randint(1, 5)]
+    index = generator.randint(1, len(fields) - 1)
+    fields[index] = generator.choice(["N/A", "-", "12.5.1", "abc"])
+    return fields
+
+
+def write_month(file_path, year, month, generator):
+    """
+    Writes the weather file of a month
+    Args:
+        file_path(str): path of the weather file
+        year(int):  4 digit year e.g 2004
+        month(int): Number containing value in range 1-12
+        generator(random.Random):   source of random numbers
+    Returns:
+        (int):  number of rows written
+    """
+    days = calendar.monthrange(year, month)[1]
+    with open(file_path, "w", encoding="utf-8") as file:
+        file.write(f"{HEADER}\n")
+        for day in range(1, days + 1):
+            fields = get_row(day, month, year, generator)
+            if generator.random() < MALFORMED_RATE:
+                fields = malform(fields, generator)
+            file.write(f"{','.join(fields)}\n")
+    return days
+
+
+def generate(path, stations=DEFAULT_STATIONS, years=DEFAULT_YEARS, **options):
+    """
+    Writes the weather files of every month for stations x years
+    Args:
+        path(str):  directory the files are written to, it is created if needed
+        stations(int):  number of stations, named Station1, Station2, ...
+        years(int): number of years
+        options:    first_year(int) first year written, seed(int) seed of the
+                    random numbers so the same files are written every time
+    Returns:
+        (int):  number of rows written
+    """
+    first_year = options.get("first_year", DEFAULT_FIRST_YEAR)
+    generator = random.Random(options.get("seed", 0))
+    os.makedirs(path, exist_ok=True)
+    rows = 0
+    for station in range(1, stations + 1):
+        for year in range(first_year, first_year + years):
+            for month, name in enumerate(months_list, 1):
+                file_name = f"Station{station}_weather_{year}_{name[:3]}.txt"
+                file_path = os.path.join(path, file_name)
+                rows += write_month(file_path, year, month, generator)
+    return rows
+
+
+def main():
+    """
+    Writes the files and prints the number of rows written
+    Returns:
+        None
+    """
+    if len(sys.argv) < 2:
+        print(__doc__.strip())
+        return
+    defaults = [DEFAULT_STATIONS, DEFAULT_YEARS, DEFAULT_FIRST_YEAR]
+    arguments = [int(argument) for argument in sys.argv[2:5]]
+    stations, years, first_year = arguments + defaults[len(arguments) :]
+    rows = generate(sys.argv[1], stations, years, first_year=first_year)
+    print(f"Wrote {rows} rows of {stations} stations x {years} years to {sys.argv[1]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+This script compares the memory used by the layouts that can hold the days of
+a month. The weather files are loaded `scale` times to simulate a larger archive
+usage: python -m benchmarks.memory [scale] [path]
+"""
+import os
+import sys
+import tracemalloc
+
+from constants import WEATHER_FILES_DIR
+from modules.cache import to_columns
+from modules.compact_data import CompactMonthData
+from modules.data_models import DayData
+from modules.file_index import get_file_index
+from modules.utils import get_record, parse_line, read_lines, read_schema
+
+DEFAULT_SCALE = 20
+
+
+class DictDayData:
+    """
+    This class holds data of a particular day in a __dict__ along with the
+    raw line, the layout DayData had before it used slots
+    """
+
+    def __init__(self, line, schema):
+        """
+        Initializes the members by parsing the line
+        Args:
+            line(str): string containing raw line read of weather file
+            schema(Schema): positions of the fields in the line
+        """
+        self.line = line
+        record = get_record(parse_line(line), schema)
+        for name, value in zip(DayData.__slots__[1:], record):
+            setattr(self, name, value)
+
+
+def build_dict_layout(months, scale):
+    """
+    Returns a list of DictDayData objects for each month
+    Args:
+        months(list):   list of ((station, year, month), file_path) tuples
+        scale(int): number of times each month is loaded
+    Returns:
+        (list): list of lists of DictDayData objects
+    """
+    layout = []
+    for _ in range(scale):
+        for _, file_path in months:
+            schema = read_schema(file_path)
+            layout.append([DictDayData(line, schema) for line in read_lines(file_path)])
+    return layout
+
+
+def build_slots_layout(months, scale, keep_line):
+    """
+    Returns a list of DayData objects for each month
+    Args:
+        months(list):   list of ((station, year, month), file_path) tuples
+        scale(int): number of times each month is loaded
+        keep_line(bool):    False to drop the raw lines
+    Returns:
+        (list): list of lists of DayData objects
+    """
+    layout = []
+    for _ in range(scale):
+        for _, file_path in months:
+            schema = read_schema(file_path)
+            layout.append(
+                [
+                    DayData(line, keep_line=keep_line, schema=schema)
+                    for line in read_lines(file_path)
+                ]
+            )
+    return layout
+
+
+def build_compact_layout(months, scale):
+    """
+    Returns a CompactMonthData object for each month
+    Args:
+        months(list):   list of ((station, year, month), file_path) tuples
+        scale(int): number of times each month is loaded
+    Returns:
+        (list): list of CompactMonthData objects
+    """
+    layout = []
+    for _ in range(scale):
+        for (_, year, month), file_path in months:
+            # devnull has no weather files so the month starts empty
+            month_data = CompactMonthData(year, month, os.devnull)
+            schema = read_schema(file_path)
+            records = (
+                get_record(parse_line(line), schema) for line in read_lines(file_path)
+            )
+            month_data.set_columns(to_columns(records))
+            layout.append(month_data)
+    return layout
+
+
+def measure(build, *args):
+    """
+    Returns the memory allocated by build that is still in use after it returns
+    Args:
+        build(function):    function building a layout
+        args:   arguments passed to build
+    Returns:
+        (int):  size in bytes
+    """
+    tracemalloc.start()
+    layout = build(*args)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del layout
+    return size
+
+
+def main():
+    """
+    Prints the memory used by each layout in total and per day
+    Returns:
+        None
+    """
+    scale = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_SCALE
+    path = sys.argv[2] if len(sys.argv) > 2 else WEATHER_FILES_DIR
+    if not get_file_index(path).file_paths:
+        print(f"There are no weather files in {path}")
+        return
+    months = sorted(get_file_index(path).files.items())
+    rows = scale * sum(sum(1 for _ in read_lines(file_path)) for _, file_path in months)
+    layouts = [
+        ("dict with line", build_dict_layout, months, scale),
+        ("slots with line", build_slots_layout, months, scale, True),
+        ("slots without line", build_slots_layout, months, scale, False),
+        ("compact columns", build_compact_layout, months, scale),
+    ]
+    print(f"{rows} days ({len(months)} files x {scale})")
+    for name, build, *args in layouts:
+        size = measure(build, *args)
+        print(f"{name:<20} {size:>12} bytes {size / rows:>8.1f} bytes/day")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+This script compares the rows per second of the field getters used by
+utils.get_record with the single pass parser of modules.parser, on every line
+of the weather files, and of the text and mmap file readers
+usage: python -m benchmarks.parser [rounds] [path]
+"""
+import sys
+import time
+
+from constants import WEATHER_FILES_DIR
+from modules import utils
+from modules.file_index import get_file_index
+
+DEFAULT_ROUNDS = 5
+
+
+def parse_with_getters(files):
+    """
+    Parses lines with parse_line and the get_* functions
+    Args:
+        files(list):    list of (schema, lines) tuples of the weather files
+    Returns:
+        None
+    """
+    for schema, lines in files:
+        for line in lines:
+            utils.get_record(utils.parse_line(line), schema)
+
+
+def parse_with_row_parser(files):
+    """
+    Parses lines with the single pass parser, dates are kept as ordinals
+    Args:
+        files(list):    list of (schema, lines) tuples of the weather files
+    Returns:
+        None
+    """
+    for schema, lines in files:
+        parse = schema.parse_row
+        for line in lines:
+            parse(line)
+
+
+def parse_with_row_parser_and_dates(files):
+    """
+    Parses lines with the single pass parser and creates a date for each row
+    Args:
+        files(list):    list of (schema, lines) tuples of the weather files
+    Returns:
+        None
+    """
+    for schema, lines in files:
+        parse = schema.parse_row
+        for line in lines:
+            utils.row_to_record(parse(line))
+
+
+def read_text_files(file_paths):
+    """
+    Reads and parses weather files opened in text mode
+    Args:
+        file_paths(list):   list of paths to weather files
+    Returns:
+        None
+    """
+    for file_path in file_paths:
+        for _ in utils.read_rows(file_path):
+            pass
+
+
+def map_files(file_paths):
+    """
+    Parses weather files mapped into memory as bytes
+    Args:
+        file_paths(list):   list of paths to weather files
+    Returns:
+        None
+    """
+    for file_path in file_paths:
+        for _ in utils.map_rows(file_path):
+            pass
+
+
+def get_rows_per_second(parse, files, rows, rounds):
+    """
+    Returns the rows per second of the fastest of some rounds
+    Args:
+        parse(function):    function parsing all lines
+        files(list):    list of (schema, lines) tuples of the weather files
+                        Or
+                        list of paths to weather files for the file readers
+        rows(int):  number of lines in the files
+        rounds(int):    number of times the lines are parsed
+    Returns:
+        (float):    rows parsed per second
+    """
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        parse(files)
+        best = min(best, time.perf_counter() - start)
+    return rows / best
+
+
+def main():
+    """
+    Prints the rows per second of each parser and its speedup over the getters
+    Returns:
+        None
+    """
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ROUNDS
+    path = sys.argv[2] if len(sys.argv) > 2 else WEATHER_FILES_DIR
+    file_paths = sorted(get_file_index(path).files.values())
+    files = [
+        (utils.read_schema(file_path), list(utils.read_lines(file_path)))
+        for file_path in file_paths
+    ]
+    files = [(schema, lines) for schema, lines in files if schema is not None]
+    if not files:
+        print(f"There are no weather files in {path}")
+        return
+    rows = sum(len(lines) for _, lines in files)
+    parsers = [
+        ("parse_line + getters", parse_with_getters),
+        ("row parser", parse_with_row_parser),
+        ("row parser + dates", parse_with_row_parser_and_dates),
+    ]
+    readers = [
+        ("read_rows (text)", read_text_files),
+        ("map_rows (mmap)", map_files),
+    ]
+    print(f"{rows} rows, best of {rounds} rounds")
+    baseline = None
+    for name, parse in parsers + readers:
+        data = file_paths if (name, parse) in readers else files
+        rows_per_second = get_rows_per_second(parse, data, rows, rounds)
+        baseline = baseline or rows_per_second
+        print(
+            f"{name:<22} {rows_per_second:>12.0f} rows/sec "
+            f"{rows_per_second / baseline:>6.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+This script measures the fixed cost of a weatherman process, it runs a month
+report with 'python -X importtime' and prints the slowest imports and the
+wall time of the fastest run. It exits with status 1 if the import time is
+over the budget or if a module that only other flags need was imported
+usage: python -m benchmarks.startup [rounds] [budget_ms] [path]
+"""
+import os
+import subprocess
+import sys
+import time
+
+from constants import WEATHER_FILES_DIR
+
+DEFAULT_ROUNDS = 5
+DEFAULT_BUDGET_MS = 75
+SLOWEST_IMPORTS = 10
+REPORT = ["-a", "2005/6"]
+# modules of the server, the client, --stats, the compressed files, the
+# archives, the databases, the worker pools and the span reports, a month
+# report of a directory must not import them
+UNNEEDED_MODULES = [
+    "asyncio",
+    "socket",
+    "cProfile",
+    "tarfile",
+    "zipfile",
+    "lzma",
+    "bz2",
+    "sqlite3",
+    "concurrent.futures",
+    "modules.server",
+    "modules.client",
+    "modules.stats",
+    "modules.converter",
+    "modules.watcher",
+    "modules.archive",
+    "modules.compressed",
+    "modules.database",
+    "modules.date_index",
+    "modules.quantiles",
+    "modules.rolling",
+    "modules.ranking",
+]
+
+
+def run_report(path):
+    """
+    Runs the month report in a new process with import times on
+    Args:
+        path(str):  Value containing path to weather files e.g 'weatherfiles/'
+    Returns:
+        (tuple):    (seconds(float), imports(dict)) wall time of the process
+                    and {module(str): (self(int), cumulative(int))} import
+                    times in microseconds
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    command = [sys.executable, "-X", "importtime", "weatherman.py", path, *REPORT]
+    start = time.perf_counter()
+    process = subprocess.run(
+        command,
+        cwd=root,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=False,
+    )
+    seconds = time.perf_counter() - start
+    imports = {}
+    # lines look like 'import time:       196 |       6727 |   constants'
+    for line in process.stderr.splitlines():
+        fields = line.split("|")
+        if line.startswith("import time:") and fields[1].strip().isdigit():
+            imports[fields[2].strip()] = (int(fields[0][12:]), int(fields[1]))
+    return seconds, imports
+
+
+def main():
+    """
+    Prints the import times of the fastest run and checks the fastest
+    import time against the budget
+    Returns:
+        None
+    """
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ROUNDS
+    budget = float(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_BUDGET_MS
+    path = sys.argv[3] if len(sys.argv) > 3 else WEATHER_FILES_DIR
+    runs = [run_report(path) for _ in range(rounds)]
+    seconds, imports = min(runs, key=lambda run: run[0])
+    if not imports:
+        print("Could not read the import times")
+        sys.exit(1)
+    print(f"weatherman.py {path} {' '.join(REPORT)}, best of {rounds} rounds")
+    print(f"wall time {seconds * 1000:.1f} ms")
+    slowest = sorted(imports, key=lambda name: imports[name][1], reverse=True)
+    for name in slowest[:SLOWEST_IMPORTS]:
+        print(f"{imports[name][1] / 1000:>8.1f} ms {name}")
+    failed = False
+    unneeded = [name for name in UNNEEDED_MODULES if name in imports]
+    if unneeded:
+        print(f"imported modules the report does not need: {', '.join(unneeded)}")
+        failed = True
+    # the self times of all modules add up to the import time of the process
+    total = min(sum(times[0] for times in run[1].values()) for run in runs) / 1000
+    print(f"import time {total:.1f} ms, budget {budget:.1f} ms")
+    if total > budget:
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
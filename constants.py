@@ -2,15 +2,70 @@
 This file contains constant values that are not expected to change throughout
 the run of a program
 """
-from modules.validators import is_year, is_year_month
-
-ALLOWED_PARAMETERS = ":e:a:c:"
+ALLOWED_PARAMETERS = ":e:a:c:r:w:t:p:"
+LONG_PARAMETERS = [
+    "backend=",
+    "jobs=",
+    "pool=",
+    "serve=",
+    "connect=",
+    "stats",
+    "profile",
+    "output=",
+    "no-color",
+    "watch=",
+    "station=",
+    "all-stations",
+    "db=",
+]
 WEATHER_FILES_DIR = "weatherfiles/"
+CACHE_DIR_NAME = ".weatherman_cache"
+# value stored in place of a missing reading in the typed columns
+MISSING = -32768
+# readings of the typed columns in their order after the date column
+COLUMNS = ["max_temperature", "min_temperature", "max_humidity", "mean_humidity"]
+# keys used instead of missing readings in the extremes, the `value or -1000`
+# and `value or 1000` keys of YearData
+MAX_KEY = -1000
+MIN_KEY = 1000
 FULL_MONTH_NAME = "%B"
 SHORT_MONTH_NAME = "%b"
-validators = {"-e": is_year, "-a": is_year_month, "-c": is_year_month}
+# {flag: name of the function of modules.validators checking its argument}, the
+# functions are looked up when a flag is validated
+validators = {
+    "-e": "is_year_or_year_range",
+    "-a": "is_year_month",
+    "-c": "is_year_month",
+    "-r": "is_date_range",
+    "-w": "is_window",
+    "-t": "is_top",
+    "-p": "is_year_or_year_range",
+    "--backend": "is_backend",
+    "--jobs": "is_positive_number",
+    "--pool": "is_pool",
+    "--serve": "is_address",
+    "--connect": "is_address",
+    "--stats": "is_empty",
+    "--profile": "is_empty",
+    "--output": "is_path",
+    "--no-color": "is_empty",
+    "--watch": "is_positive_number",
+    "--station": "is_station",
+    "--all-stations": "is_empty",
+    "--db": "is_path",
+}
+DEFAULT_BACKEND = "python"
+DEFAULT_JOBS = 1
+DEFAULT_POOL = "process"
+# station of a planner reporting every station, set by --all-stations
+ALL_STATIONS = "*"
+LOCALHOST = "127.0.0.1"
 TEMPERATURE_UNIT = "C"
 HUMIDITY_UNIT = "%"
+# escape sequences of the chart colors
+RESET_COLOR = "\33[0m"
+RED_COLOR = "\33[91m"
+BLUE_COLOR = "\33[94m"
 months_list = [
     "January",
     "February",
@@ -0,0 +1,327 @@
+"""
+This module reads and writes weather archives, single files holding every
+month of a directory of weather files as typed columns so nothing has to be
+parsed when they are opened. An archive is made of:
+    a header
+    a table of the fields with the typecode of their columns
+    a table of the event names, events are stored as their position in it
+    a directory with the station, year, month, offset and rows of each month
+    the data of each month at its offset, the column of every field followed
+    by the null bitmap of every field, bit i of a bitmap is set if row i has a value
+Null slots of a column hold NULL_VALUES[typecode], which for the columns used
+by the reports is the value used by cache.load_columns, so those columns are
+used as they are. Archives are mapped into memory and only the columns of the
+months that are read are copied
+"""
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from constants import MISSING, months_list
+
+MAGIC = b"WMA1"
+# magic, byteorder, number of fields, number of months, number of event names
+HEADER = struct.Struct("<4s?HIH")
+# field name, typecode of its column
+FIELD = struct.Struct("<24sc")
+# event name
+EVENT = struct.Struct("<48s")
+# station, year, month, offset of the month's data, rows
+ENTRY = struct.Struct("<64sHBqI")
+# (field name, header name, typecode) of the fields of the exports, the date
+# field is named after the station's time zone so it has no header name
+FIELDS = [
+    ("date", None, "i"),
+    ("max_temperature", "Max TemperatureC", "h"),
+    ("mean_temperature", "Mean TemperatureC", "h"),
+    ("min_temperature", "Min TemperatureC", "h"),
+    ("max_dew_point", "Dew PointC", "h"),
+    ("mean_dew_point", "MeanDew PointC", "h"),
+    ("min_dew_point", "Min DewpointC", "h"),
+    ("max_humidity", "Max Humidity", "h"),
+    ("mean_humidity", "Mean Humidity", "h"),
+    ("min_humidity", "Min Humidity", "h"),
+    ("max_pressure", "Max Sea Level PressurehPa", "f"),
+    ("mean_pressure", "Mean Sea Level PressurehPa", "f"),
+    ("min_pressure", "Min Sea Level PressurehPa", "f"),
+    ("max_visibility", "Max VisibilityKm", "f"),
+    ("mean_visibility", "Mean VisibilityKm", "f"),
+    ("min_visibility", "Min VisibilitykM", "f"),
+    ("max_wind_speed", "Max Wind SpeedKm/h", "h"),
+    ("mean_wind_speed", "Mean Wind SpeedKm/h", "h"),
+    ("max_gust_speed", "Max Gust SpeedKm/h", "h"),
+    ("precipitation", "Precipitationmm", "f"),
+    ("cloud_cover", "CloudCover", "h"),
+    ("events", "Events", "H"),
+    ("wind_direction", "WindDirDegrees", "h"),
+]
+# fields in the order of the columns returned by cache.load_columns, they
+# are at the positions of parser.DEFAULT_SCHEMA
+REPORT_FIELDS = [FIELDS[index][0] for index in (0, 1, 3, 7, 8)]
+NULL_VALUES = {"i": 0, "h": MISSING, "H": 0, "f": float("nan")}
+
+# {path(str): (file_key(tuple), Archive)}
+_archives = {}
+
+
+def pack_bits(flags):
+    """
+    Packs flags into a bitmap, flag i is bit i % 8 of byte i // 8
+    Args:
+        flags(list):    list of booleans
+    Returns:
+        (bytes):    bitmap of the flags
+    """
+    bits = bytearray((len(flags) + 7) // 8)
+    for index, flag in enumerate(flags):
+        if flag:
+            bits[index >> 3] |= 1 << (index & 7)
+    return bytes(bits)
+
+
+def get_member_name(station, year, month):
+    """
+    Returns the name of the weather file a month of an archive was converted from
+    Args:
+        station(str):   station name e.g 'Murree'
+        year(int):  4 digit year e.g 2004
+        month(int): Number containing value in range 1-12
+    Returns:
+        (str):  file name e.g 'Murree_weather_2004_Aug.txt'
+    """
+    return f"{station}_weather_{year}_{months_list[month - 1][:3]}.txt"
+
+
+def write_archive(path, months, events):
+    """
+    Writes an archive, it replaces the file at path only once it is complete
+    Args:
+        path(str):  path of the archive e.g 'weather.wma'
+        months(list):   list of ((station, year, month), columns, bitmaps) tuples,
+                        columns holds an array for each of FIELDS and bitmaps
+                        the null bitmap of each
+        events(list):   event names(str), the values of the events columns are
+                        positions in it
+    Returns:
+        None
+    """
+    offset = HEADER.size + FIELD.size * len(FIELDS)
+    offset += EVENT.size * len(events) + ENTRY.size * len(months)
+    directory = []
+    for (station, year, month), columns, bitmaps in months:
+        directory.append(
+            ENTRY.pack(station.encode(), year, month, offset, len(columns[0]))
+        )
+        offset += sum(len(column) * column.itemsize for column in columns)
+        offset += sum(len(bitmap) for bitmap in bitmaps)
+    temporary_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temporary_path, "wb") as file:
+            file.write(
+                HEADER.pack(
+                    MAGIC,
+                    sys.byteorder == "little",
+                    len(FIELDS),
+                    len(months),
+                    len(events),
+                )
+            )
+            for name, _, typecode in FIELDS:
+                file.write(FIELD.pack(name.encode(), typecode.encode()))
+            for name in events:
+                file.write(EVENT.pack(name.encode()))
+            file.write(b"".join(directory))
+            for _, columns, bitmaps in months:
+                for column in columns:
+                    column.tofile(file)
+                file.write(b"".join(bitmaps))
+        os.replace(temporary_path, path)
+    finally:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+
+
+class Archive:
+    """
+    This class gives random access to the months of an archive mapped into memory
+    """
+
+    def __init__(self, path):
+        """
+        Maps the archive and reads its tables
+        Args:
+            path(str):  path of the archive e.g 'weather.wma'
+        Raises:
+            ValueError: if the file is not an archive written on a machine of
+                        the same byteorder
+        """
+        self.path = path
+        with open(path, "rb") as file:
+            self.buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self.buffer) < HEADER.size:
+            raise ValueError(f"{path} is not a weather archive")
+        magic, little_endian, fields, months, events = HEADER.unpack_from(self.buffer)
+        if magic != MAGIC or little_endian != (sys.byteorder == "little"):
+            raise ValueError(f"{path} is not a weather archive of this machine")
+        fields, offset = self.read_table(FIELD, HEADER.size, fields)
+        self.typecodes = {
+            name.rstrip(b"\0").decode(): typecode.decode() for name, typecode in fields
+        }
+        events, offset = self.read_table(EVENT, offset, events)
+        self.events = [name.rstrip(b"\0").decode() for name, in events]
+        months = self.read_table(ENTRY, offset, months)[0]
+        # {(station, year, month): (offset(int), rows(int))}
+        self.entries = {
+            (station.rstrip(b"\0").decode(), year, month): (data_offset, rows)
+            for station, year, month, data_offset, rows in months
+        }
+        self.names = {get_member_name(*key): key for key in self.entries}
+
+    def read_table(self, record, offset, count):
+        """
+        Reads a table of the archive
+        Args:
+            record(struct.Struct):  format of the records of the table
+            offset(int):    offset of the table
+            count(int): number of records in the table
+        Returns:
+            (tuple):    (records(list), offset(int)) the unpacked records and
+                        the offset after the table
+        """
+        end = offset + record.size * count
+        return list(record.iter_unpack(self.buffer[offset:end])), end
+
+    def get_position(self, key, field):
+        """
+        Returns where the column and the null bitmap of a field of a month start
+        Args:
+            key(tuple): (station(str), year(int), month(int)) of the month
+            field(str): name of the field e.g 'max_temperature'
+        Returns:
+            (tuple):    (column offset(int), bitmap offset(int), rows(int))
+        """
+        offset, rows = self.entries[key]
+        column_offset = bitmap_offset = offset
+        for name, typecode in self.typecodes.items():
+            size = rows * array(typecode).itemsize
+            if name == field:
+                column_offset = bitmap_offset
+            bitmap_offset += size
+        bitmap_offset += list(self.typecodes).index(field) * ((rows + 7) // 8)
+        return column_offset, bitmap_offset, rows
+
+    def read_column(self, key, field):
+        """
+        Returns the column of a field of a month, null slots hold NULL_VALUES
+        Args:
+            key(tuple): (station(str), year(int), month(int)) of the month
+            field(str): name of the field e.g 'max_temperature'
+        Returns:
+            (array):    values of the field
+        """
+        column_offset, _, rows = self.get_position(key, field)
+        column = array(self.typecodes[field])
+        column.frombytes(
+            self.buffer[column_offset : column_offset + rows * column.itemsize]
+        )
+        return column
+
+    def read_values(self, key, field):
+        """
+        Returns the values of a field of a month with None for null values,
+        events are returned as their names
+        Args:
+            key(tuple): (station(str), year(int), month(int)) of the month
+            field(str): name of the field e.g 'max_temperature'
+        Returns:
+            (list): list of values(int, float, str or None)
+        """
+        column = self.read_column(key, field)
+        _, bitmap_offset, rows = self.get_position(key, field)
+        bitmap = self.buffer[bitmap_offset : bitmap_offset + (rows + 7) // 8]
+        values = [
+            value if bitmap[index >> 3] & (1 << (index & 7)) else None
+            for index, value in enumerate(column)
+        ]
+        if field == "events":
+            return [None if value is None else self.events[value] for value in values]
+        return values
+
+    def read_member(self, name):
+        """
+        Returns the columns used by the reports of a month
+        Args:
+            name(str):  name of the weather file of the month e.g 'Murree_weather_2004_Aug.txt'
+        Returns:
+            (list or None): list of arrays in the format returned by cache.load_columns
+                            Or
+                            None if the archive has no such month
+        """
+        key = self.names.get(name)
+        if key is None:
+            return None
+        return [self.read_column(key, field) for field in REPORT_FIELDS]
+
+
+def get_path_key(path):
+    """
+    Returns the values that tell if a file has changed
+    Args:
+        path(str):  path of a file e.g 'weather.wma'
+    Returns:
+        (tuple or None):    (size(int), mtime_ns(int)) of the file
+                            Or
+                            None if the file can't be read
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+def open_archive(path):
+    """
+    Returns the archive at a path, it is opened again only if the file changed
+    Args:
+        path(str):  path of the archive e.g 'weather.wma'
+    Returns:
+        (Archive or None):  archive
+                            Or
+                            None if path is not an archive
+    """
+    path = path.rstrip("/")
+    file_key = get_path_key(path)
+    if file_key is None:
+        return None
+    if path in _archives and _archives[path][0] == file_key:
+        return _archives[path][1]
+    try:
+        archive = Archive(path)
+    except (OSError, ValueError):
+        # other files are remembered too so they are only checked once
+        archive = None
+    _archives[path] = (file_key, archive)
+    return archive
+
+
+def read_member(file_path):
+    """
+    Returns the columns used by the reports of a weather file stored in an
+    archive, file_path is the path of the archive joined with the file name
+    Args:
+        file_path(str): e.g 'weather.wma/Murree_weather_2004_Aug.txt'
+    Returns:
+        (list or None): list of arrays in the format returned by cache.load_columns
+                        Or
+                        None if file_path is not in an archive
+    """
+    directory, name = os.path.split(file_path)
+    if directory not in _archives and not os.path.isfile(directory):
+        return None
+    archive = open_archive(directory)
+    if archive is None:
+        return None
+    return archive.read_member(name)
@@ -0,0 +1,240 @@
+"""
+This module provides MonthData and YearData classes that keep the readings of
+a month in NumPy arrays and compute the aggregates with vectorized reductions.
+NumPy is optional, NUMPY_AVAILABLE tells if these classes can be used
+"""
+from constants import (
+    COLUMNS,
+    HUMIDITY_UNIT,
+    MAX_KEY,
+    MIN_KEY,
+    MISSING,
+    TEMPERATURE_UNIT,
+    WEATHER_FILES_DIR,
+)
+from modules.data_models import MonthData, YearData
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None  # pylint: disable=invalid-name
+
+NUMPY_AVAILABLE = numpy is not None
+
+
+def to_array(column):
+    """
+    Converts a typed column to a float array without a loop over its readings
+    Args:
+        column(array):  column of readings returned by cache.load_columns
+    Returns:
+        (numpy.ndarray): array containing NaN in place of missing readings
+    """
+    values = numpy.frombuffer(column, dtype=numpy.int16).astype(float)
+    values[values == MISSING] = numpy.nan
+    return values
+
+
+def get_extreme_index(keys, find_max):
+    """
+    Returns the index of the first max or min key, ignoring NaN keys
+    Args:
+        keys(numpy.ndarray): array of keys
+        find_max(bool): True for max, False for min
+    Returns:
+        (int or None):  index of the extreme key
+                        Or
+                        None if all keys are NaN
+    """
+    if numpy.isnan(keys).all():
+        return None
+    return int(numpy.nanargmax(keys) if find_max else numpy.nanargmin(keys))
+
+
+class ArrayMonthData(MonthData):
+    """
+    This class holds the data of an entire month along with a NumPy array
+    for each reading used in the reports
+    """
+
+    def __init__(self, year, month, path=WEATHER_FILES_DIR, columns=None, station=None):
+        """
+        Initializes the columns member and calls MonthData.__init__
+        Args:
+            year(str or int):   Value containing 4 digit year e.g '2004'
+            month(int): Number containing value in range 1-12
+            path(str):  Value containing path to weather files e.g 'weatherfiles/'
+            columns(list or None):  already loaded columns of the month's file
+            station(str or None):   station name or None for the first station
+                                    having the month
+        """
+        self.columns = {}
+        super().__init__(year, month, path, columns, station)
+
+    def populate(self, columns=None):
+        """
+        Fills days_data by calling MonthData.populate and converts the typed
+        columns of the readings to arrays
+        Args:
+            columns(list or None):  columns returned by cache.load_columns
+                                    Or
+                                    None to load them from the month's file
+        Returns:
+            None
+        """
+        if columns is None:
+            columns = self.load_columns()
+        super().populate(columns)
+        # the typed columns hold the readings in the order of COLUMNS after the dates
+        for column, values in zip(COLUMNS, columns[1:]):
+            self.columns[column] = to_array(values)
+
+    def get_extreme(self, column, find_max):
+        """
+        Returns the max or min reading of a column with its date
+        Readings of 0 are skipped, exactly like the `value or -1000` keys of MonthData
+        Args:
+            column(str):    name of the column e.g 'max_temperature'
+            find_max(bool): True for max, False for min
+        Returns:
+            (dict): {
+                        'value'(int or None): reading or None if no data,
+                        'date'(date):   date object
+                    }
+        """
+        if not self.days_data:
+            return {"value": None}
+        values = self.columns[column]
+        index = get_extreme_index(numpy.where(values == 0, numpy.nan, values), find_max)
+        if index is None:
+            return {"value": MAX_KEY if find_max else MIN_KEY, "date": ""}
+        return {"value": int(values[index]), "date": self.days_data[index].date}
+
+    def get_average(self, column, unit):
+        """
+        Returns the average of a column rounded to 0 decimals, missing readings
+        count as 0 like in MonthData
+        Args:
+            column(str):    name of the column e.g 'max_temperature'
+            unit(str):  unit appended to the average
+        Returns:
+            (str):  average with unit
+        """
+        total = float(numpy.nansum(self.columns[column]))
+        return f"{round(total / len(self.days_data))}{unit}"
+
+    def get_max_month_humidity(self):
+        """
+        Returns the max humidity for the whole month with respective date
+        Returns:
+            same as MonthData.get_max_month_humidity
+        """
+        return self.get_extreme("max_humidity", True)
+
+    def get_max_month_temperature(self):
+        """
+        Returns the max highest temperature for the whole month with respective date
+        Returns:
+            same as MonthData.get_max_month_temperature
+        """
+        return self.get_extreme("max_temperature", True)
+
+    def get_min_month_temperature(self):
+        """
+        Returns the min lowest temperature for the whole month with respective date
+        Returns:
+            same as MonthData.get_min_month_temperature
+        """
+        return self.get_extreme("min_temperature", False)
+
+    def get_max_month_temperature_avg(self):
+        """
+        Returns the average highest_temperature rounded to 0 decimals
+        Returns:
+            same as MonthData.get_max_month_temperature_avg
+        """
+        if not self.days_data:
+            return super().get_max_month_temperature_avg()
+        return self.get_average("max_temperature", TEMPERATURE_UNIT)
+
+    def get_min_month_temperature_avg(self):
+        """
+        Returns the average lowest_temperature rounded to 0 decimals
+        Returns:
+            same as MonthData.get_min_month_temperature_avg
+        """
+        if not self.days_data:
+            return super().get_min_month_temperature_avg()
+        return self.get_average("min_temperature", TEMPERATURE_UNIT)
+
+    def get_max_month_humidity_avg(self):
+        """
+        Returns the average max humidity rounded to 0 decimals
+        Returns:
+            same as MonthData.get_max_month_humidity_avg
+        """
+        if not self.days_data:
+            return super().get_max_month_humidity_avg()
+        return self.get_average("max_humidity", HUMIDITY_UNIT)
+
+
+class ArrayYearData(YearData):
+    """
+    This class holds data of an entire year as ArrayMonthData objects
+    """
+
+    month_data_class = ArrayMonthData
+
+    def get_year_extreme(self, method_name, find_max, unit):
+        """
+        Returns the extreme of the month extremes with its date
+        Args:
+            method_name(str):   name of the ArrayMonthData method returning
+                                the extreme of a month
+            find_max(bool): True for max, False for min
+            unit(str):  unit appended to the value
+        Returns:
+            (dict or None): {"value": value_with_unit(str), "date": date(date)}
+                            Or
+                            None if there is no data for the year
+        """
+        if not self.months_data:
+            return None
+        default_key = MAX_KEY if find_max else MIN_KEY
+        extremes = [getattr(month, method_name)() for month in self.months_data]
+        keys = numpy.array([extreme["value"] or default_key for extreme in extremes])
+        index = get_extreme_index(keys, find_max)
+        if keys[index] == default_key:
+            extreme = {"value": default_key, "date": ""}
+        else:
+            extreme = extremes[index]
+        extreme["value"] = f"{extreme['value']}{unit}"
+        return extreme
+
+    def get_max_year_temperature(self):
+        """
+        Returns maximum Highest temperature, for the whole year with relevant date
+        Returns:
+            same as YearData.get_max_year_temperature
+        """
+        return self.get_year_extreme(
+            "get_max_month_temperature", True, TEMPERATURE_UNIT
+        )
+
+    def get_min_year_temperature(self):
+        """
+        Returns minimum lowest temperature for the whole year with relevant date
+        Returns:
+            same as YearData.get_min_year_temperature
+        """
+        return self.get_year_extreme(
+            "get_min_month_temperature", False, TEMPERATURE_UNIT
+        )
+
+    def get_max_year_humidity(self):
+        """
+        Returns maximum max humidity for the whole year with relevant date
+        Returns:
+            same as YearData.get_max_year_humidity
+        """
+        return self.get_year_extreme("get_max_month_humidity", True, HUMIDITY_UNIT)
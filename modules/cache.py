@@ -0,0 +1,299 @@
+"""
+This module keeps a binary copy of the parsed weather files on disk, so that
+files which have not changed since the last run don't have to be parsed again
+and files which have only grown only have their new lines parsed
+"""
+import os
+import struct
+import sys
+import zlib
+from array import array
+from datetime import date
+
+from constants import CACHE_DIR_NAME, COLUMNS, MISSING
+from modules.file_index import is_plain_file
+from modules.utils import map_rows
+
+# magic, byteorder, size of the weather file, mtime of the weather file, rows,
+# offset after the last complete line parsed, rows of the complete lines,
+# checksum of the parsed part of the weather file
+HEADER = struct.Struct("<4s?qqIqII")
+# changed whenever the parsed values of a file can differ from older versions
+MAGIC = b"WMC3"
+# bytes read at a time when the parsed part is checksummed
+CHECKSUM_CHUNK = 1 << 16
+# readings outside the range of the column type are not plausible so they
+# are stored as MISSING too
+MAX_VALUE = 32767
+DATE_TYPE = "i"
+VALUE_TYPE = "h"
+VALUE_COLUMNS = len(COLUMNS)
+
+
+def get_cache_path(file_path):
+    """
+    Returns the path of the cache file of a weather file
+    Args:
+        file_path(str): path to a weather file e.g 'weatherfiles/Murree_weather_2004_Aug.txt'
+    Returns:
+        (str):  path to the cache file
+                e.g 'weatherfiles/.weatherman_cache/Murree_weather_2004_Aug.txt.bin'
+    """
+    directory, name = os.path.split(file_path)
+    return os.path.join(directory, CACHE_DIR_NAME, f"{name}.bin")
+
+
+def get_file_key(file_path):
+    """
+    Returns the values that tell if a weather file has changed, a weather
+    file stored in an archive changes with the archive
+    Args:
+        file_path(str): path to a weather file
+    Returns:
+        (tuple):    (size(int), mtime_ns(int)) of the file
+    """
+    try:
+        stat = os.stat(file_path)
+    except NotADirectoryError:
+        stat = os.stat(os.path.dirname(file_path))
+    return stat.st_size, stat.st_mtime_ns
+
+
+def to_columns(records):
+    """
+    Converts records to typed columns
+    Args:
+        records(iterable):  list or generator of tuples returned by utils.get_record
+    Returns:
+        (list): list of arrays in the format returned by rows_to_columns
+    """
+    return rows_to_columns(
+        (record[0].toordinal() if record[0] else 0,) + tuple(record[1:])
+        for record in records
+    )
+
+
+def rows_to_columns(rows):
+    """
+    Converts rows to typed columns
+    Args:
+        rows(iterable): list or generator of tuples returned by utils.parse_row
+    Returns:
+        (list): [dates(array), max_temperatures(array), min_temperatures(array),
+                max_humidities(array), mean_humidities(array)]
+                dates contain ordinals, missing values contain MISSING
+    """
+    columns = [array(DATE_TYPE)] + [array(VALUE_TYPE) for _ in range(VALUE_COLUMNS)]
+    for row in rows:
+        columns[0].append(row[0])
+        for column, value in zip(columns[1:], row[1:]):
+            if value is None or not MISSING < value <= MAX_VALUE:
+                value = MISSING
+            column.append(value)
+    return columns
+
+
+def to_records(columns):
+    """
+    Converts typed columns back to records
+    Args:
+        columns(list): list of arrays returned by to_columns
+    Returns:
+        (list): list of tuples in the format returned by utils.get_record
+    """
+    dates = [date.fromordinal(ordinal) if ordinal else None for ordinal in columns[0]]
+    values = [
+        [None if value == MISSING else value for value in column]
+        for column in columns[1:]
+    ]
+    return list(zip(dates, *values))
+
+
+def get_checksum(file_path, offset):
+    """
+    Returns a checksum of the bytes before an offset of a weather file, a file
+    that was edited anywhere in its parsed part rather than appended to is very
+    unlikely to keep it
+    Args:
+        file_path(str): path to a weather file
+        offset(int):    offset after the last complete line parsed
+    Returns:
+        (int):  crc32 of the bytes
+    """
+    checksum = 0
+    with open(file_path, "rb") as file:
+        while offset > 0:
+            chunk = file.read(min(offset, CHECKSUM_CHUNK))
+            if not chunk:
+                break
+            checksum = zlib.crc32(chunk, checksum)
+            offset -= len(chunk)
+    return checksum
+
+
+def read_cache(file_path):
+    """
+    Reads the cache file of a weather file
+    Args:
+        file_path(str): path to a weather file
+    Returns:
+        (tuple or None):    (file_key(tuple), columns(list), offset(int),
+                            complete_rows(int), checksum(int)) as passed to write_cache
+                            Or
+                            None if there is no usable cache
+    """
+    try:
+        with open(get_cache_path(file_path), "rb") as file:
+            content = file.read()
+    except OSError:
+        return None
+    if len(content) < HEADER.size:
+        return None
+    magic, little_endian, size, mtime, rows, *progress = HEADER.unpack_from(content)
+    if magic != MAGIC or little_endian != (sys.byteorder == "little"):
+        return None
+    columns = [array(DATE_TYPE)] + [array(VALUE_TYPE) for _ in range(VALUE_COLUMNS)]
+    offset = HEADER.size
+    for column in columns:
+        length = rows * column.itemsize
+        column.frombytes(content[offset : offset + length])
+        offset += length
+    if len(columns[-1]) != rows:
+        return None
+    return ((size, mtime), columns, *progress)
+
+
+def write_cache(file_path, file_key, columns, offset=0, complete_rows=0):
+    """
+    Writes the columns of a weather file to its cache file. Failures are ignored
+    as the cache is only an optimization e.g when the directory is read only
+    Args:
+        file_path(str): path to a weather file
+        file_key(tuple):    value returned by get_file_key for the weather file
+        columns(list):  list of arrays returned by to_columns
+        offset(int):    offset after the last complete line parsed, the next
+                        run parses from it if the file has only grown
+        complete_rows(int): rows of columns parsed from lines before offset
+    Returns:
+        None
+    """
+    cache_path = get_cache_path(file_path)
+    temporary_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        checksum = get_checksum(file_path, offset)
+        header = HEADER.pack(
+            MAGIC,
+            sys.byteorder == "little",
+            *file_key,
+            len(columns[0]),
+            offset,
+            complete_rows,
+            checksum,
+        )
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        with open(temporary_path, "wb") as file:
+            file.write(header)
+            for column in columns:
+                column.tofile(file)
+        os.replace(temporary_path, cache_path)
+    except OSError:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+
+
+def read_stored_columns(file_path):
+    """
+    Returns the columns of a weather file stored in an archive or a database
+    Args:
+        file_path(str): e.g 'weather.wma/Murree_weather_2004_Aug.txt'
+    Returns:
+        (list or None): list of arrays in the format returned by to_columns
+                        Or
+                        None if file_path is neither in an archive nor in a database
+    """
+    # pylint: disable=import-outside-toplevel
+    from modules.archive import read_member
+    from modules.database import read_member as read_database_member
+
+    columns = read_member(file_path)
+    if columns is None:
+        columns = read_database_member(file_path)
+    return columns
+
+
+def update_columns(file_path):
+    """
+    Returns the columns of a weather file. They come from its cache if the file
+    has not changed since it was cached, if the file has grown past its cached
+    size and its parsed part is unchanged the cached columns are extended with
+    the rows of the new lines, otherwise the file is parsed again. The cache is
+    updated in both cases. Weather files stored in an archive or a database are
+    read from it without a cache, compressed weather files are parsed again
+    whenever they change
+    Args:
+        file_path(str): path to a weather file e.g 'weatherfiles/Murree_weather_2004_Aug.txt'
+    Returns:
+        (tuple):    (columns(list), file_key(tuple), previous_key(tuple or None),
+                    kept_rows(int)) the columns in the format returned by
+                    to_columns, the key of the file they belong to, the key of
+                    the cached version they extend and the number of their
+                    first rows coming from it, previous_key is None if the file
+                    was parsed again
+    """
+    file_key = get_file_key(file_path)
+    is_plain = is_plain_file(file_path)
+    columns = None if is_plain else read_stored_columns(file_path)
+    if columns is not None:
+        return columns, file_key, file_key, len(columns[0])
+    cached = read_cache(file_path)
+    if cached is not None and cached[0] == file_key:
+        return cached[1], file_key, file_key, len(cached[1][0])
+    if not is_plain:
+        # offsets in the decompressed content can't be checked against the file
+        columns = rows_to_columns(map_rows(file_path))
+        write_cache(file_path, file_key, columns)
+        return columns, file_key, None, 0
+    progress = {"end": 0, "complete_rows": 0}
+    # a file edited in place keeps or changes its size, only a grown file is
+    # extended and only if none of its parsed bytes changed
+    if (
+        cached is not None
+        and file_key[0] > cached[0][0]
+        and cached[4] == get_checksum(file_path, cached[2])
+    ):
+        previous_key, columns, offset, kept_rows, _ = cached
+        # rows of a line that had not been completed are parsed again
+        columns = [column[:kept_rows] for column in columns]
+        tail = rows_to_columns(map_rows(file_path, offset, progress))
+        for column, new_values in zip(columns, tail):
+            column.extend(new_values)
+        progress["end"] = max(progress["end"], offset)
+    else:
+        previous_key, kept_rows = None, 0
+        # the lines are streamed straight into the compact columns
+        columns = rows_to_columns(map_rows(file_path, 0, progress))
+    complete_rows = kept_rows + progress["complete_rows"]
+    write_cache(file_path, file_key, columns, progress["end"], complete_rows)
+    return columns, file_key, previous_key, kept_rows
+
+
+def load_columns(file_path):
+    """
+    Returns the columns of a weather file by using update_columns
+    Args:
+        file_path(str): path to a weather file e.g 'weatherfiles/Murree_weather_2004_Aug.txt'
+    Returns:
+        (list): list of arrays in the format returned by to_columns
+    """
+    return update_columns(file_path)[0]
+
+
+def load_records(file_path):
+    """
+    Returns the records of a weather file by using load_columns
+    Args:
+        file_path(str): path to a weather file e.g 'weatherfiles/Murree_weather_2004_Aug.txt'
+    Returns:
+        (list): list of tuples in the format returned by utils.get_record
+    """
+    return to_records(load_columns(file_path))
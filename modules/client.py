@@ -0,0 +1,49 @@
+"""
+This module sends report requests to a weatherman server started with --serve
+"""
+import socket
+
+from constants import LOCALHOST
+
+BUFFER_SIZE = 65536
+
+
+def connect(address):
+    """
+    Returns a socket connected to a weatherman server
+    Args:
+        address(str):   port number of a server on localhost e.g '8765'
+                        Or
+                        path of a Unix socket e.g '/tmp/weatherman.sock'
+    Returns:
+        (socket.socket):    connected socket
+    """
+    if address.isdigit():
+        return socket.create_connection((LOCALHOST, int(address)))
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        connection.connect(address)
+    except OSError:
+        connection.close()
+        raise
+    return connection
+
+
+def query(address, parameters):
+    """
+    Returns the reports generated by a server for the parameters
+    Args:
+        address(str):   port number or path of a Unix socket
+        parameters(list):   [[flag(str), argument(str)],...]
+    Returns:
+        (str):  text of the reports
+    """
+    request = " ".join(f"{flag} {argument}" for flag, argument in parameters)
+    chunks = []
+    with connect(address) as connection:
+        connection.sendall(f"{request}\n".encode())
+        chunk = connection.recv(BUFFER_SIZE)
+        while chunk:
+            chunks.append(chunk)
+            chunk = connection.recv(BUFFER_SIZE)
+    return b"".join(chunks).decode()
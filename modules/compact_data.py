@@ -0,0 +1,180 @@
+"""
+This module provides MonthData and YearData classes that keep the readings of
+a month in typed arrays instead of a DayData object per day. DayData objects
+are only created when days_data is indexed
+"""
+from array import array
+from collections.abc import Sequence
+from datetime import date
+
+from constants import COLUMNS, WEATHER_FILES_DIR
+from modules.cache import DATE_TYPE, MISSING, VALUE_TYPE, to_columns
+from modules.data_models import DayData, MonthData, YearData
+
+
+class DaysView(Sequence):
+    """
+    This class is a read only list of DayData objects for a CompactMonthData,
+    each DayData is created when it is accessed
+    """
+
+    def __init__(self, month_data):
+        """
+        Initializes the month_data member
+        Args:
+            month_data(CompactMonthData): month whose days are viewed
+        """
+        self.month_data = month_data
+
+    def __len__(self):
+        return len(self.month_data.ordinals)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        return DayData(None, self.month_data.get_record(index))
+
+
+class CompactMonthData(MonthData):
+    """
+    This class holds the data of an entire month as a date ordinal column
+    and a column for each reading, like the cached columns so rows dated in
+    another month keep their date
+    """
+
+    def __init__(self, year, month, path=WEATHER_FILES_DIR, columns=None, station=None):
+        """
+        Initializes the columns and calls MonthData.__init__
+        Args:
+            year(str or int):   Value containing 4 digit year e.g '2004'
+            month(int): Number containing value in range 1-12
+            path(str):  Value containing path to weather files e.g 'weatherfiles/'
+            columns(list or None):  already loaded columns of the month's file
+            station(str or None):   station name or None for the first station
+                                    having the month
+        """
+        self.ordinals = array(DATE_TYPE)
+        self.columns = {column: array(VALUE_TYPE) for column in COLUMNS}
+        super().__init__(year, month, path, columns, station)
+
+    @property
+    def days_data(self):
+        """
+        Returns a view creating DayData objects on demand
+        Returns:
+            (DaysView): sequence of DayData objects
+        """
+        return DaysView(self)
+
+    @days_data.setter
+    def days_data(self, days_data):
+        """
+        Replaces the columns with the values of DayData objects
+        Args:
+            days_data(list):    list of DayData objects
+        Returns:
+            None
+        """
+        self.set_columns(to_columns(day_data.get_record() for day_data in days_data))
+
+    def populate(self, columns=None):
+        """
+        Fills the columns from the given columns or the cached columns of the
+        month's weather file
+        Args:
+            columns(list or None):  columns returned by cache.load_columns
+                                    Or
+                                    None to load them from the month's file
+        Returns:
+            None
+        """
+        if columns is None:
+            columns = self.load_columns()
+        self.set_columns(columns)
+
+    def set_columns(self, columns):
+        """
+        Replaces the columns
+        Args:
+            columns(list):  list of arrays in the format returned by cache.to_columns
+        Returns:
+            None
+        """
+        self.ordinals = columns[0]
+        self.columns = dict(zip(COLUMNS, columns[1:]))
+
+    def get_date(self, index):
+        """
+        Returns the date of a day
+        Args:
+            index(int): index of the day in the columns
+        Returns:
+            (date or None): date object or None if the day has no date
+        """
+        ordinal = self.ordinals[index]
+        return date.fromordinal(ordinal) if ordinal else None
+
+    def get_values(self, column):
+        """
+        Returns the readings of a column
+        Args:
+            column(str):    name of the column e.g 'max_temperature'
+        Returns:
+            (list): list of readings(int or None)
+        """
+        return [None if value == MISSING else value for value in self.columns[column]]
+
+    def get_record(self, index):
+        """
+        Returns the values of a day
+        Args:
+            index(int): index of the day in the columns
+        Returns:
+            (tuple):    values in the format returned by utils.get_record
+        """
+        values = [self.columns[column][index] for column in COLUMNS]
+        return (self.get_date(index),) + tuple(
+            None if value == MISSING else value for value in values
+        )
+
+    def get_columns(self):
+        """
+        Returns the days of the month as columns
+        Returns:
+            (list): list of arrays in the format returned by cache.load_columns
+        """
+        return [self.ordinals] + [self.columns[column] for column in COLUMNS]
+
+    def get_month_max_temperatures(self):
+        """
+        Returns highest temperature of each day
+        Returns:
+            same as MonthData.get_month_max_temperatures
+        """
+        return self.get_values("max_temperature") if self.ordinals else None
+
+    def get_month_min_temperatures(self):
+        """
+        Returns lowest temperature of each day
+        Returns:
+            same as MonthData.get_month_min_temperatures
+        """
+        return self.get_values("min_temperature") if self.ordinals else None
+
+    def get_month_dates(self):
+        """
+        Returns date of each day
+        Returns:
+            same as MonthData.get_month_dates
+        """
+        if not self.ordinals:
+            return None
+        return [self.get_date(index) for index in range(len(self.ordinals))]
+
+
+class CompactYearData(YearData):
+    """
+    This class holds data of an entire year as CompactMonthData objects
+    """
+
+    month_data_class = CompactMonthData
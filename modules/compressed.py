@@ -0,0 +1,225 @@
+"""
+This module reads weather files that are compressed, on their own e.g
+'Murree_weather_2004_Aug.txt.gz' or as members of a tarball or zip file
+e.g 'weather_2004.tar.gz', without extracting them to disk. A member of a
+bundle has the path of the bundle joined with its file name like a file in a
+directory e.g 'weather_2004.tar.gz/Murree_weather_2004_Aug.txt'. Tarballs
+can only be read from the start, so a tarball is decompressed in a single
+streaming pass the first time it is opened and its weather files are kept in
+memory, zip files are read member by member as they are needed. The
+compression and bundle modules are only imported once such a file is read
+"""
+import importlib
+import io
+import os
+
+from modules.archive import get_path_key
+
+# {suffix of a compressed file: name of the module reading it}
+COMPRESSIONS = {".gz": "gzip", ".bz2": "bz2", ".xz": "lzma"}
+BUNDLE_SUFFIXES = (".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tbz2", ".tar.xz", ".zip")
+
+# {path(str): (file_key(tuple), Bundle or None)}
+_bundles = {}
+
+
+def get_compression(file_path):
+    """
+    Returns the functions reading a compressed file
+    Args:
+        file_path(str): path to a file e.g 'weatherfiles/Murree_weather_2004_Aug.txt.gz'
+    Returns:
+        (tuple or None):    (open(function), decompress(function)) of the file's suffix
+                            Or
+                            None if the file is not compressed
+    """
+    module_name = COMPRESSIONS.get(os.path.splitext(file_path)[1].lower())
+    if module_name is None:
+        return None
+    module = importlib.import_module(module_name)
+    return module.open, module.decompress
+
+
+def decompress(name, content):
+    """
+    Decompresses the content of a file if its name has a compression suffix
+    Args:
+        name(str):  file name e.g 'Murree_weather_2004_Aug.txt.gz'
+        content(bytes): content of the file
+    Returns:
+        (bytes):    decompressed content
+    """
+    compression = get_compression(name)
+    return content if compression is None else compression[1](content)
+
+
+def is_text_name(name):
+    """
+    Checks if a file name is the name of a text file, compressed or not
+    Args:
+        name(str):  file name e.g 'Murree_weather_2004_Aug.txt.gz'
+    Returns:
+        (boolean):  True if the name ends with '.txt' once a compression suffix is removed
+    """
+    if get_compression(name) is not None:
+        name = os.path.splitext(name)[0]
+    return name.endswith(".txt") and not name.startswith(".")
+
+
+def is_bundle_name(name):
+    """
+    Checks if a file name is the name of a tarball or a zip file
+    Args:
+        name(str):  file name e.g 'weather_2004.tar.gz'
+    Returns:
+        (boolean):  True if the name has a tarball or zip suffix
+    """
+    return name.lower().endswith(BUNDLE_SUFFIXES)
+
+
+class Bundle:
+    """
+    This class gives access to the weather files stored in a tarball or a zip file
+    """
+
+    def __init__(self, path):
+        """
+        Lists the text files of the bundle, a tarball is read completely
+        Args:
+            path(str):  path of the bundle e.g 'weather_2004.tar.gz'
+        Raises:
+            OSError:    if the bundle can't be read
+            tarfile.TarError or zipfile.BadZipFile:  if it is not a bundle
+        """
+        # pylint: disable=import-outside-toplevel
+        import tarfile
+        import zipfile
+
+        self.path = path
+        # {name(str): member name in a zip file(str) or content(bytes)}
+        self.names = {}
+        if zipfile.is_zipfile(path):
+            with zipfile.ZipFile(path) as bundle:
+                for member in bundle.infolist():
+                    name = os.path.basename(member.filename)
+                    if not member.is_dir() and is_text_name(name):
+                        self.names[name] = member.filename
+            return
+        # the tarball is decompressed incrementally while its members are read
+        with tarfile.open(path, "r|*") as bundle:
+            for member in bundle:
+                name = os.path.basename(member.name)
+                if member.isfile() and is_text_name(name):
+                    self.names[name] = bundle.extractfile(member).read()
+
+    def read(self, name):
+        """
+        Returns the decompressed content of a weather file of the bundle
+        Args:
+            name(str):  name of the weather file e.g 'Murree_weather_2004_Aug.txt'
+        Returns:
+            (bytes or None):    content of the weather file
+                                Or
+                                None if the bundle has no such file
+        """
+        # pylint: disable=import-outside-toplevel
+        import zipfile
+
+        member = self.names.get(name)
+        if isinstance(member, str):
+            with zipfile.ZipFile(self.path) as bundle:
+                member = bundle.read(member)
+        return None if member is None else decompress(name, member)
+
+
+def open_bundle(path):
+    """
+    Returns the bundle at a path, it is read again only if the file changed
+    Args:
+        path(str):  path of the bundle e.g 'weather_2004.tar.gz'
+    Returns:
+        (Bundle or None):   bundle
+                            Or
+                            None if path is not a tarball or a zip file
+    """
+    path = path.rstrip("/")
+    file_key = get_path_key(path)
+    if file_key is None:
+        return None
+    if path in _bundles and _bundles[path][0] == file_key:
+        return _bundles[path][1]
+    bundle = None
+    if os.path.isfile(path):
+        # pylint: disable=import-outside-toplevel
+        import tarfile
+        import zipfile
+
+        try:
+            bundle = Bundle(path)
+        except (OSError, EOFError, tarfile.TarError, zipfile.BadZipFile):
+            bundle = None
+    _bundles[path] = (file_key, bundle)
+    return bundle
+
+
+def get_bundle(file_path):
+    """
+    Returns the bundle a weather file is a member of, it is opened if no
+    bundle was opened at its path e.g in a worker process
+    Args:
+        file_path(str): e.g 'weather_2004.tar.gz/Murree_weather_2004_Aug.txt'
+    Returns:
+        (Bundle or None):   bundle holding the weather file
+                            Or
+                            None if file_path is not in a bundle
+    """
+    directory = os.path.dirname(file_path)
+    if directory in _bundles:
+        return _bundles[directory][1]
+    return open_bundle(directory) if is_bundle_name(directory) else None
+
+
+def read_compressed(file_path):
+    """
+    Returns the decompressed content of a compressed weather file or of a
+    member of a bundle
+    Args:
+        file_path(str): e.g 'weatherfiles/Murree_weather_2004_Aug.txt.gz'
+                        Or
+                        'weather_2004.tar.gz/Murree_weather_2004_Aug.txt'
+    Returns:
+        (bytes or None):    content of the weather file
+                            Or
+                            None if the file is neither compressed nor in a bundle
+    Raises:
+        OSError:    if the file can't be read or the bundle has no such member
+    """
+    bundle = get_bundle(file_path)
+    if bundle is not None:
+        content = bundle.read(os.path.basename(file_path))
+        if content is None:
+            raise FileNotFoundError(f"{file_path} is not in the bundle")
+        return content
+    compression = get_compression(file_path)
+    if compression is None:
+        return None
+    with compression[0](file_path, "rb") as file:
+        return file.read()
+
+
+def open_text(file_path):
+    """
+    Opens a weather file for reading text, compressed files are decompressed
+    while they are read
+    Args:
+        file_path(str): path to a weather file, compressed or in a bundle
+    Returns:
+        (stream):   text stream of the file
+    """
+    bundle = get_bundle(file_path)
+    if bundle is not None:
+        return io.StringIO(read_compressed(file_path).decode())
+    compression = get_compression(file_path)
+    if compression is not None:
+        return compression[0](file_path, "rt", encoding="utf-8")
+    return open(file_path, "r", encoding="utf-8")
@@ -0,0 +1,170 @@
+"""
+This module converts a directory of weather files into an archive, every
+field of the rows the reports would read is stored in a typed column so the
+archive is read without parsing text. It also ingests the days of the weather
+files into a database
+"""
+from array import array
+
+from constants import MISSING
+from modules.archive import (
+    FIELDS,
+    NULL_VALUES,
+    REPORT_FIELDS,
+    pack_bits,
+    write_archive,
+)
+from modules.cache import MAX_VALUE, load_columns, rows_to_columns
+from modules.compressed import open_text
+from modules.database import write_database
+from modules.file_index import get_file_index
+from modules.parser import DATE_FIELD_REGEX, get_schema
+from modules.utils import parse_line
+
+
+def get_positions(header):
+    """
+    Returns the position in the lines of each of the archive fields
+    Args:
+        header(str):    first line of a weather file
+    Returns:
+        (list): position(int or None) of each of FIELDS, None if the header lacks it
+    """
+    names = [name.strip() for name in parse_line(header)]
+    positions = []
+    for _, header_name, _ in FIELDS:
+        if header_name is None:
+            matches = [
+                index
+                for index, name in enumerate(names)
+                if DATE_FIELD_REGEX.match(name)
+            ]
+        else:
+            matches = [index for index, name in enumerate(names) if name == header_name]
+        positions.append(matches[0] if matches else None)
+    return positions
+
+
+def to_value(text, typecode, events):
+    """
+    Converts the text of a field to the value stored in its column
+    Args:
+        text(str):  text of the field
+        typecode(str):  typecode of the field's column
+        events(list):   event names, a name that is not in it yet is appended
+    Returns:
+        (int or float or None): value
+                                Or
+                                None if the field is empty or not a number
+    """
+    text = text.strip()
+    if not text:
+        return None
+    if typecode == "H":
+        if text not in events:
+            events.append(text)
+        return events.index(text)
+    try:
+        value = float(text) if typecode == "f" else int(text)
+    except ValueError:
+        return None
+    if typecode == "h" and not MISSING < value <= MAX_VALUE:
+        return None
+    return value
+
+
+def read_fields(header, lines, events):
+    """
+    Parses the lines of a weather file, the lines rejected by the row parser
+    are left out like they are from cache.load_columns
+    Args:
+        header(str):    first line of the weather file
+        lines(list):    lines after the header
+        events(list):   event names, names that are not in it yet are appended
+    Returns:
+        (tuple):    (rows(list), values(list)) the rows returned by the row
+                    parser and the values(list) of each of FIELDS
+    """
+    schema = get_schema(header)
+    positions = get_positions(header)
+    rows, values = [], [[] for _ in FIELDS]
+    if schema is None:
+        return rows, values
+    for line in lines:
+        row = schema.parse_row(line)
+        if row is None:
+            continue
+        rows.append(row)
+        fields = parse_line(line)
+        for field_values, position, (_, _, typecode) in zip(values, positions, FIELDS):
+            is_present = position is not None and position < len(fields)
+            field_values.append(
+                to_value(fields[position], typecode, events) if is_present else None
+            )
+    return rows, values
+
+
+def read_month(file_path, events):
+    """
+    Reads the columns and null bitmaps of a weather file
+    Args:
+        file_path(str): path to a weather file e.g 'weatherfiles/Murree_weather_2004_Aug.txt'
+        events(list):   event names, names that are not in it yet are appended
+    Returns:
+        (tuple):    (columns(list), bitmaps(list)) an array and a bitmap for each of FIELDS
+    """
+    with open_text(file_path) as file:
+        header = file.readline()
+        rows, values = read_fields(header, file.readlines(), events)
+    # the fields used by the reports are stored exactly as the cache stores them
+    parsed = dict(zip(REPORT_FIELDS, rows_to_columns(rows)))
+    columns, bitmaps = [], []
+    for field_values, (name, _, typecode) in zip(values, FIELDS):
+        null = NULL_VALUES[typecode]
+        if name in parsed:
+            column = parsed[name]
+            flags = [value != null for value in column]
+        else:
+            column = array(
+                typecode, [null if value is None else value for value in field_values]
+            )
+            flags = [value is not None for value in field_values]
+        columns.append(column)
+        bitmaps.append(pack_bits(flags))
+    return columns, bitmaps
+
+
+def convert(source, destination):
+    """
+    Converts the weather files of a directory into an archive
+    Args:
+        source(str):    Value containing path to weather files e.g 'weatherfiles/'
+        destination(str):   path of the archive e.g 'weather.wma'
+    Returns:
+        (tuple):    (months(int), rows(int)) written to the archive
+    """
+    index = get_file_index(source)
+    # position 0 is the null value of the events column
+    events = [""]
+    months = []
+    for key in sorted(index.files):
+        columns, bitmaps = read_month(index.files[key], events)
+        months.append((key, columns, bitmaps))
+    write_archive(destination, months, events)
+    return len(months), sum(len(columns[0]) for _, columns, _ in months)
+
+
+def ingest(source, destination):
+    """
+    Loads the days of the weather files of a directory into a database
+    Args:
+        source(str):    Value containing path to weather files e.g 'weatherfiles/'
+        destination(str):   path of the database e.g 'weather.sqlite'
+    Returns:
+        (tuple):    (months(int), rows(int)) written to the database
+    """
+    index = get_file_index(source)
+    keys = sorted(index.files)
+    # the files are parsed while the rows are inserted
+    months = ((key, load_columns(index.files[key])) for key in keys)
+    return len(keys), write_database(destination, months)
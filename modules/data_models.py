@@ -1,23 +1,29 @@
 """
 This module contains classes for easy data management
 """
+import sys
+
 from constants import (
+    BLUE_COLOR,
+    DEFAULT_POOL,
     FULL_MONTH_NAME,
     HUMIDITY_UNIT,
-    SHORT_MONTH_NAME,
+    MAX_KEY,
+    MIN_KEY,
+    RED_COLOR,
+    RESET_COLOR,
     TEMPERATURE_UNIT,
     WEATHER_FILES_DIR,
 )
-from modules.utils import (
-    get_date,
-    get_highest_temperature,
-    get_lowest_temperature,
-    get_max_humidity,
-    get_mean_humidity,
-    get_month_name,
-    parse_line,
-    read_data,
-)
+from modules.cache import load_columns, to_columns, to_records
+from modules.file_index import get_file_index
+from modules.parallel import load_columns_parallel, summarize_stations
+from modules.parser import DEFAULT_SCHEMA
+from modules.summary import MonthSummary, get_summary_table
+from modules.utils import get_month_name, get_year_range, parse_row, row_to_record
+
+# row of a line that does not have all the fields
+EMPTY_ROW = (0, None, None, None, None)
 
 
 class DayData:
@@ -25,28 +31,67 @@ class DayData:
     This class holds data of a particular day
     """
 
-    def __init__(self, line):
+    # slots keep the per day overhead low as a year holds hundreds of these
+    __slots__ = (
+        "line",
+        "date",
+        "max_temperature",
+        "min_temperature",
+        "max_humidity",
+        "mean_humidity",
+    )
+
+    def __init__(self, line, record=None, keep_line=True, schema=DEFAULT_SCHEMA):
         """
         Initializes the line member and calls populate to initialize other members
         Args:
-            line(str): string containing raw line read of weather file
+            line(str or None): string containing raw line read of weather file
+            record(tuple or None):  already parsed values of the line in the format
+                                    returned by utils.get_record
+            keep_line(bool):    False to drop the raw line once it is parsed
+            schema(Schema): positions of the fields in the line, from the header
+                            of the line's file
         """
         self.line = line
-        self.populate()
+        self.populate(record, schema)
+        if not keep_line:
+            self.line = None
 
-    def populate(self):
+    def populate(self, record=None, schema=DEFAULT_SCHEMA):
         """
         Sets the values of highest_temperature, lowest_temperature, max_humidity,
-        mean_humidity and date by using the parsed_line
+        mean_humidity and date by using the record or the parsed_line
+        Args:
+            record(tuple or None):  values returned by utils.get_record
+                                    Or
+                                    None to parse them from the line
+            schema(Schema): positions of the fields in the line
         Returns:
             None
         """
-        parsed_line = parse_line(self.line)
-        self.max_temperature = get_highest_temperature(parsed_line)
-        self.min_temperature = get_lowest_temperature(parsed_line)
-        self.max_humidity = get_max_humidity(parsed_line)
-        self.mean_humidity = get_mean_humidity(parsed_line)
-        self.date = get_date(parsed_line)
+        if record is None:
+            record = row_to_record(parse_row(self.line, schema) or EMPTY_ROW)
+        (
+            self.date,
+            self.max_temperature,
+            self.min_temperature,
+            self.max_humidity,
+            self.mean_humidity,
+        ) = record
+
+    def get_record(self):
+        """
+        Returns the values of the day
+        Returns:
+            (tuple):    values in the format returned by utils.get_record
+        """
+        return (
+            self.date,
+            self.max_temperature,
+            self.min_temperature,
+            self.max_humidity,
+            self.mean_humidity,
+        )
 
 
 class MonthData:
@@ -54,7 +99,7 @@ class MonthData:
     This class holds the data of an entire month
     """
 
-    def __init__(self, year, month, path=WEATHER_FILES_DIR):
+    def __init__(self, year, month, path=WEATHER_FILES_DIR, columns=None, station=None):
         """
         Initializes the members name, year and path and
         calls populate to fill days_data list
@@ -62,24 +107,47 @@ class MonthData:
             year(str or int):   Value containing 4 digit year e.g '2004'
             month(int): Number containing value in range 1-12
             path(str):  Value containing path to weather files e.g 'weatherfiles/'
+            columns(list or None):  already loaded columns of the month's file
+                                    in the format returned by cache.load_columns
+            station(str or None):   station name e.g 'Murree'
+                                    Or
+                                    None for the first station having the month
         """
         self.days_data = []
         self.month = month
         self.year = year
         self.path = path
-        self.populate()
+        self.station = station
+        self.summary = None
+        self.populate(columns)
 
-    def populate(self):
+    def populate(self, columns=None):
         """
         Initializes the days_data list with DayData objects for each day of the month
+        Args:
+            columns(list or None):  columns returned by cache.load_columns
+                                    Or
+                                    None to load them from the month's file
         Returns:
             None
         """
-        pattern = f"{self.year}_{self.get_name(SHORT_MONTH_NAME)}"
-        month_data = next(read_data(pattern, self.path))
-        for line in month_data:
-            day_data = DayData(line)
-            self.days_data.append(day_data)
+        if columns is None:
+            columns = self.load_columns()
+        for record in to_records(columns):
+            self.days_data.append(DayData(None, record))
+
+    def load_columns(self):
+        """
+        Returns the columns of the month's weather file, the parsed columns are
+        cached on disk so unchanged files are not parsed again
+        Returns:
+            (list): list of arrays in the format returned by cache.load_columns,
+                    empty arrays if there is no file for the month
+        """
+        file_path = get_file_index(self.path).get(self.year, self.month, self.station)
+        if file_path is None:
+            return to_columns([])
+        return load_columns(file_path)
 
     def get_name(self, flag=FULL_MONTH_NAME):
         """
@@ -92,6 +160,43 @@ class MonthData:
         """
         return get_month_name(self.month, flag)
 
+    def get_columns(self):
+        """
+        Returns the days of the month as columns
+        Returns:
+            (list): list of arrays in the format returned by cache.load_columns
+        """
+        return to_columns(day_data.get_record() for day_data in self.days_data)
+
+    def get_summary(self):
+        """
+        Returns the summary of the month, read from the summary table when the
+        month has a weather file, otherwise computed from days_data. A month
+        missing from the table is summarized from days_data if they are
+        loaded, so its file is not read again
+        Returns:
+            (MonthSummary): summary holding the extremes and sums of the month
+        """
+        if self.summary is None:
+            file_path = get_file_index(self.path).get(
+                self.year, self.month, self.station
+            )
+            if file_path is None:
+                self.summary = MonthSummary.from_columns(self.get_columns())
+            else:
+                self.summary = get_summary_table(self.path).get(
+                    file_path, self.get_columns if self.is_loaded() else None
+                )
+        return self.summary
+
+    def is_loaded(self):
+        """
+        Checks if the days of the month have been loaded
+        Returns:
+            (boolean):  True, days_data is filled when the month is created
+        """
+        return True
+
     def get_max_month_humidity(self):
         """
         Returns the max humidity for the whole month with respective date
@@ -101,16 +206,7 @@ class MonthData:
                         'date'(date):   date object
                     }
         """
-        if not self.days_data:
-            return {"value": None}
-        max_humidity = {"value": -1000, "date": ""}
-        for day_data in self.days_data:
-            max_arg2 = {"value": day_data.max_humidity, "date": day_data.date}
-            max_humidity = max(
-                max_humidity, max_arg2, key=lambda x: x["value"] or -1000
-            )
-
-        return max_humidity
+        return self.get_summary().get_max_month_humidity()
 
     def get_max_month_temperature(self):
         """
@@ -121,16 +217,7 @@ class MonthData:
                         'date'(date):   date object
                     }
         """
-        if not self.days_data:
-            return {"value": None}
-        max_temperature = {"value": -1000, "date": ""}
-        for day_data in self.days_data:
-            max_arg2 = {"value": day_data.max_temperature, "date": day_data.date}
-            max_temperature = max(
-                max_temperature, max_arg2, key=lambda x: x["value"] or -1000
-            )
-
-        return max_temperature
+        return self.get_summary().get_max_month_temperature()
 
     def get_min_month_temperature(self):
         """
@@ -141,16 +228,7 @@ class MonthData:
                         'date'(date):   date object
                     }
         """
-        if len(self.days_data) == 0:
-            return {"value": None}
-        min_temperature = {"value": 1000, "date": ""}
-        for day_data in self.days_data:
-            min_arg2 = {"value": day_data.min_temperature, "date": day_data.date}
-            min_temperature = min(
-                min_temperature, min_arg2, key=lambda x: x["value"] or 1000
-            )
-
-        return min_temperature
+        return self.get_summary().get_min_month_temperature()
 
     def get_max_month_temperature_avg(self):
         """
@@ -160,15 +238,7 @@ class MonthData:
                             Or
                             None if no data exists for the month
         """
-        if not self.days_data:
-            return {"value": None}
-        sum_highest_temperature = 0
-        for day_data in self.days_data:
-            sum_highest_temperature += day_data.max_temperature or 0
-        return (
-            f"{round(sum_highest_temperature / len(self.days_data))}"
-            f"{TEMPERATURE_UNIT}"
-        )
+        return self.get_summary().get_max_month_temperature_avg()
 
     def get_min_month_temperature_avg(self):
         """
@@ -178,15 +248,7 @@ class MonthData:
                             Or
                             None if no data exists for the month
         """
-        if not self.days_data:
-            return None
-        sum_lowest_temperature = 0
-        for day_data in self.days_data:
-            sum_lowest_temperature += day_data.min_temperature or 0
-        return (
-            f"{round(sum_lowest_temperature / len(self.days_data))}"
-            f"{TEMPERATURE_UNIT}"
-        )
+        return self.get_summary().get_min_month_temperature_avg()
 
     def get_max_month_humidity_avg(self):
         """
@@ -196,12 +258,7 @@ class MonthData:
                             Or
                             None if no data exists for the month
         """
-        if not self.days_data:
-            return None
-        sum_max_humidity = 0
-        for day_data in self.days_data:
-            sum_max_humidity += day_data.max_humidity or 0
-        return f"{round(sum_max_humidity / len(self.days_data))}{HUMIDITY_UNIT}"
+        return self.get_summary().get_max_month_humidity_avg()
 
     def get_month_max_temperatures(self):
         """
@@ -264,26 +321,52 @@ class YearData:
     This class holds data of an entire year
     """
 
-    def __init__(self, year, path=WEATHER_FILES_DIR):
+    month_data_class = MonthData
+
+    def __init__(
+        self, year, path=WEATHER_FILES_DIR, jobs=1, pool=DEFAULT_POOL, **options
+    ):
         """
         Initializes the members year, path and calls populate to fill months_data list
         Args:
             year(str or int):   Value containing 4 digit year e.g '2004'
             path(str):  Value containing path to weather files e.g 'weatherfiles/'
+            jobs(int):  number of workers loading the monthly files
+            pool(str):  'process' or 'thread', the kind of workers
+            options:    months_data(list or None) already loaded month objects of
+                        the year, None to load them from the monthly files.
+                        station(str or None) station name e.g 'Murree', None for
+                        the first station having each month
         """
         self.months_data = []
         self.year = year
         self.path = path
-        self.populate()
+        self.jobs = jobs
+        self.pool = pool
+        self.station = options.get("station")
+        months_data = options.get("months_data")
+        if months_data is None:
+            self.populate()
+        else:
+            self.months_data = [
+                month_data for month_data in months_data if month_data.days_data
+            ]
 
     def populate(self):
         """
-        Initializes the months_data member with MonthData objects
+        Initializes the months_data member with month_data_class objects,
+        the monthly files are loaded by jobs workers
         Returns:
             None
         """
-        for month in range(1, 13):
-            month_data = MonthData(self.year, month, self.path)
+        index = get_file_index(self.path)
+        months = index.get_months(self.year, self.station)
+        file_paths = [index.get(self.year, month, self.station) for month in months]
+        months_columns = load_columns_parallel(file_paths, self.jobs, self.pool)
+        for month, columns in zip(months, months_columns):
+            month_data = self.month_data_class(
+                self.year, month, self.path, columns, self.station
+            )
             if month_data.days_data:
                 self.months_data.append(month_data)
 
@@ -368,14 +451,167 @@ class YearData:
         return max_humidity
 
 
+class YearRangeData(YearData):
+    """
+    This class holds the month summaries of a range of years, so the extremes
+    of decades are combined without reading the daily data
+    """
+
+    def populate(self):
+        """
+        Initializes the months_data member with the MonthSummary objects of
+        every month in the range
+        Returns:
+            None
+        """
+        first_year, last_year = get_year_range(self.year)
+        table = get_summary_table(self.path)
+        self.months_data = table.rollup(first_year, last_year, self.station)
+
+
+class StationsData(YearData):
+    """
+    This class holds the summary of each station for a year or a range of
+    years, so the extremes across all stations are found with the station
+    they were recorded at. The stations are summarized by a pool of workers
+    """
+
+    def __init__(self, year, path=WEATHER_FILES_DIR, jobs=1, pool=DEFAULT_POOL):
+        """
+        Initializes the stations member and calls YearData.__init__
+        Args:
+            year(str):  Value containing 4 digit year e.g '2004'
+                        Or
+                        a range of years e.g '2004:2016'
+            path(str):  Value containing path to weather files e.g 'weatherfiles/'
+            jobs(int):  number of workers summarizing the stations
+            pool(str):  'process' or 'thread', the kind of workers
+        """
+        self.stations = []
+        super().__init__(year, path, jobs, pool)
+
+    def populate(self):
+        """
+        Initializes the months_data member with the summary of each station
+        having days in the year and the stations member with their names
+        Returns:
+            None
+        """
+        years = get_year_range(self.year) or (int(self.year), int(self.year))
+        stations = get_file_index(self.path).stations()
+        summaries = summarize_stations(self.path, stations, years, self.jobs, self.pool)
+        self.stations = [
+            station for station, summary in zip(stations, summaries) if summary.days
+        ]
+        self.months_data = [summary for summary in summaries if summary.days]
+
+    def get_station_extreme(self, column, find_max, unit):
+        """
+        Returns the extreme of a column across the stations, a station only
+        wins if its extreme is strictly better so ties keep the first station
+        Args:
+            column(str):    name of the column e.g 'max_temperature'
+            find_max(bool): True for max, False for min
+            unit(str):  unit appended to the value
+        Returns:
+            (dict or None): {"value": value_with_unit(str), "date": date(date),
+                            "station": station(str)}
+                            Or
+                            None if no station has data
+        """
+        if not self.months_data:
+            return None
+        default_key = MAX_KEY if find_max else MIN_KEY
+        extreme = {"value": default_key, "date": ""}
+        for station, summary in zip(self.stations, self.months_data):
+            candidate = summary.get_extreme(column, find_max)
+            chosen = (max if find_max else min)(
+                extreme, candidate, key=lambda x: x["value"] or default_key
+            )
+            if chosen is candidate:
+                extreme = dict(candidate, station=station)
+        extreme["value"] = f"{extreme['value']}{unit}"
+        return extreme
+
+    def get_max_year_temperature(self):
+        """
+        Returns the max highest temperature across the stations
+        Returns:
+            same as get_station_extreme
+        """
+        return self.get_station_extreme("max_temperature", True, TEMPERATURE_UNIT)
+
+    def get_min_year_temperature(self):
+        """
+        Returns the min lowest temperature across the stations
+        Returns:
+            same as get_station_extreme
+        """
+        return self.get_station_extreme("min_temperature", False, TEMPERATURE_UNIT)
+
+    def get_max_year_humidity(self):
+        """
+        Returns the max humidity across the stations
+        Returns:
+            same as get_station_extreme
+        """
+        return self.get_station_extreme("max_humidity", True, HUMIDITY_UNIT)
+
+
 class ReportGenerator:
     """
-    Contains static functions which generate reports
+    Contains functions which generate reports, each report is assembled in
+    memory and written to the output with a single write
     """
 
-    def __init__(self, month_data=None, year_data=None):
+    def __init__(self, month_data=None, year_data=None, **options):
+        """
+        Initializes the members
+        Args:
+            month_data(MonthData or None):  month of the averages and charts reports
+            year_data(YearData or None):    year of the extremes report
+            options:    output(stream or None) stream the reports are written to,
+                        stdout if None. color(bool) False to write the charts
+                        without escape sequences. separator(str) text written
+                        after each report e.g a blank line between reports.
+                        heading(str or None) line written before each report
+                        e.g the station of the report. span_data(RangeData,
+                        RollingData, TopData, PercentileData or None) days of
+                        the range, rolling, top or percentile report
+        """
         self.month_object = month_data
         self.year_object = year_data
+        self.span_object = options.get("span_data")
+        self.output = options.get("output")
+        self.color = options.get("color", True)
+        self.separator = options.get("separator", "")
+        self.heading = options.get("heading")
+
+    def write(self, lines):
+        """
+        Writes the lines of a report to the output with one write
+        Args:
+            lines(list):    list of lines(str) without line breaks
+        Returns:
+            None
+        """
+        if self.heading is not None:
+            lines = [self.heading] + lines
+        # stdout is looked up on every write so redirect_stdout still works
+        output = self.output or sys.stdout
+        output.write("".join(f"{line}\n" for line in lines) + self.separator)
+
+    def get_missing_month_message(self):
+        """
+        Returns the message written when the month has no weather file
+        Returns:
+            (str):  message containing the month name and year
+        """
+        return (
+            f"We don't have information regarding the weather of "
+            f"{self.month_object.get_name()}, {self.month_object.year} "
+            f"in the given path"
+        )
 
     def generate_averages_report_month(self):
         """
@@ -388,23 +624,23 @@ class ReportGenerator:
             None
         """
         if not self.month_object.days_data:
-            print(
-                f"We don't have information regarding the weather of "
-                f"{self.month_object.get_name()}, {self.month_object.year} "
-                f"in the given path"
-            )
-        else:
-            avg_max_temperature = self.month_object.get_max_month_temperature_avg()
-            avg_min_temperature = self.month_object.get_min_month_temperature_avg()
-            avg_max_humidity = self.month_object.get_max_month_humidity_avg()
-            averages = [avg_max_temperature, avg_min_temperature, avg_max_humidity]
-            starting_message = ["Highest", "Lowest", "Mean Humidity"]
-            for index, val in enumerate(starting_message):
-                print(f"Average {val}: {averages[index]}")
+            self.write([self.get_missing_month_message()])
+            return
+        avg_max_temperature = self.month_object.get_max_month_temperature_avg()
+        avg_min_temperature = self.month_object.get_min_month_temperature_avg()
+        avg_max_humidity = self.month_object.get_max_month_humidity_avg()
+        averages = [avg_max_temperature, avg_min_temperature, avg_max_humidity]
+        starting_message = ["Highest", "Lowest", "Mean Humidity"]
+        self.write(
+            [
+                f"Average {val}: {averages[index]}"
+                for index, val in enumerate(starting_message)
+            ]
+        )
 
     def generate_extremes_report(self):
         """
-        This function prints/generates a report on the console based on the maximums list
+        This function writes a report based on the maximums list
         the report displays the following
         1. max_highest_temperature with date
         2. max_lowest_temperature with date
@@ -413,26 +649,127 @@ class ReportGenerator:
             None
         """
         if not self.year_object.months_data:
-            print(
-                f"We don't have information regarding the weather of "
-                f"{self.year_object.year} in the given path"
+            self.write(
+                [
+                    f"We don't have information regarding the weather of "
+                    f"{self.year_object.year} in the given path"
+                ]
             )
-        else:
-            max_temperature = self.year_object.get_max_year_temperature()
-            min_temperature = self.year_object.get_min_year_temperature()
-            max_humidity = self.year_object.get_max_year_humidity()
-            maximums = [max_temperature, min_temperature, max_humidity]
-            starting_message = ["Highest", "Lowest", "Humidity"]
-            for index, dictionary in enumerate(maximums):
-                print(
-                    f"{starting_message[index]}: {dictionary['value']} on "
-                    f"{dictionary['date'].strftime(FULL_MONTH_NAME)}, "
+            return
+        max_temperature = self.year_object.get_max_year_temperature()
+        min_temperature = self.year_object.get_min_year_temperature()
+        max_humidity = self.year_object.get_max_year_humidity()
+        maximums = [max_temperature, min_temperature, max_humidity]
+        starting_message = ["Highest", "Lowest", "Humidity"]
+        # the dates of a range of years need their year
+        with_year = get_year_range(str(self.year_object.year)) is not None
+        self.write(
+            [
+                f"{starting_message[index]}: {dictionary['value']} on "
+                + (
+                    f"{dictionary['date'].strftime(FULL_MONTH_NAME)} "
+                    f"{dictionary['date'].day}, {dictionary['date'].year}"
+                    if with_year
+                    else f"{dictionary['date'].strftime(FULL_MONTH_NAME)}, "
                     f"{dictionary['date'].day}"
                 )
+                + (f" at {dictionary['station']}" if "station" in dictionary else "")
+                for index, dictionary in enumerate(maximums)
+            ]
+        )
+
+    def generate_range_report(self):
+        """
+        This function writes the report of a span of days
+        the report displays the following
+        1. max_highest_temperature with date
+        2. max_lowest_temperature with date
+        3. max_humidity with date
+        4. average highest temperature
+        5. average lowest temperature
+        6. average mean humidity
+        Returns:
+            None
+        """
+        if not self.span_object.days:
+            self.write(
+                [
+                    f"We don't have information regarding the weather from "
+                    f"{self.span_object.get_name()} in the given path"
+                ]
+            )
+            return
+        lines = [f"From {self.span_object.get_name()}"]
+        starting_message = ["Highest", "Lowest", "Humidity"]
+        for index, dictionary in enumerate(self.span_object.get_extremes()):
+            line = f"{starting_message[index]}: {dictionary['value']}"
+            if dictionary["date"] is not None:
+                line += (
+                    f" on {dictionary['date'].strftime(FULL_MONTH_NAME)} "
+                    f"{dictionary['date'].day}, {dictionary['date'].year}"
+                )
+            lines.append(line)
+        starting_message = ["Highest", "Lowest", "Mean Humidity"]
+        lines += [
+            f"Average {starting_message[index]}: {average}"
+            for index, average in enumerate(self.span_object.get_averages())
+        ]
+        self.write(lines)
+
+    def generate_rolling_report(self):
+        """
+        This function writes the report of windows of days e.g
+        "30 day windows of 2005"
+        "January 1, 2005: Highest 20C avg 14.2C, Lowest 2C avg 6.1C, Humidity 100% avg 81.3%"
+        .
+        .
+        .
+        "December 31, 2005: Highest 19C avg 13.8C, Lowest 1C avg 5.9C, Humidity 98% avg 79.0%"
+        Returns:
+            None
+        """
+        if not self.span_object.rows:
+            self.write(
+                [
+                    f"We don't have information regarding the weather of "
+                    f"{self.span_object.get_name()} in the given path"
+                ]
+            )
+            return
+        self.write([self.span_object.get_name()] + self.span_object.get_lines())
+
+    def generate_years_report(self):
+        """
+        This function writes the top or percentile report of some years, the
+        name of the report followed by its lines e.g
+        "Top 3 days of 2006"
+        "Highest:"
+        "1. 40C on July 12, 2006"
+        .
+        .
+        .
+        Or
+        "Percentiles of 2004 to 2016"
+        "Highest: p50 20C, p95 26C, p99 30C"
+        .
+        .
+        .
+        Returns:
+            None
+        """
+        if not self.span_object.days:
+            self.write(
+                [
+                    f"We don't have information regarding the weather of "
+                    f"{self.span_object.get_years()} in the given path"
+                ]
+            )
+            return
+        self.write([self.span_object.get_name()] + self.span_object.get_lines())
 
     def generate_report_charts(self):
         """
-        This function displays month's report on console
+        This function writes month's report
         A report looks like
         "Month Year"
         "day1 lowest_temp ++++++++++++++ highest_temp"
@@ -441,32 +778,27 @@ class ReportGenerator:
         .
         .
         "day30 lowest_temp ++++++++++++++ highest_temp"
+        the lowest temperature bar is blue and the highest is red if color is on
         Returns:
             None
         """
         if not self.month_object.days_data:
-            print(
-                f"We don't have information regarding the weather of "
-                f"{self.month_object.get_name()}, {self.month_object.year}"
-                f" in the given path"
-            )
+            self.write([self.get_missing_month_message()])
+            return
+        max_temperatures = self.month_object.get_month_max_temperatures()
+        min_temperatures = self.month_object.get_month_min_temperatures()
+        dates = self.month_object.get_month_dates()
+        year, month = dates[0].year, self.month_object.get_name()
+        if self.color:
+            reset, red, blue = RESET_COLOR, RED_COLOR, BLUE_COLOR
         else:
-            max_temperatures = self.month_object.get_month_max_temperatures()
-            min_temperatures = self.month_object.get_month_min_temperatures()
-            dates = self.month_object.get_month_dates()
-            extremes = [
-                [i, j, k] for i, j, k in zip(dates, max_temperatures, min_temperatures)
-            ]
-            year, month = dates[0].year, self.month_object.get_name()
-            print(f"{month} {year}")
-            for entry in extremes:
-                day = f"\33[0m{entry[0].day}"
-                if entry[2] is None or entry[1] is None:
-                    continue
-                red_plus = f"\33[91m{'+' * entry[1]}"
-                blue_plus = f"\33[94m{'+' * entry[2]}"
-                report_line = (
-                    f"{day} {blue_plus}{red_plus} "
-                    f"\33[0m{entry[2]}{TEMPERATURE_UNIT}-{entry[1]}{TEMPERATURE_UNIT}"
-                )
-                print(report_line)
+            reset = red = blue = ""
+        lines = [f"{month} {year}"]
+        for day, highest, lowest in zip(dates, max_temperatures, min_temperatures):
+            if lowest is None or highest is None:
+                continue
+            lines.append(
+                f"{reset}{day.day} {blue}{'+' * lowest}{red}{'+' * highest} "
+                f"{reset}{lowest}{TEMPERATURE_UNIT}-{highest}{TEMPERATURE_UNIT}"
+            )
+        self.write(lines)
@@ -0,0 +1,229 @@
+"""
+This module reads and writes weather databases, SQLite files holding the days
+of every weather file of a directory in a single table keyed by station and
+date. A database can be given as the path of the reports, its months are
+indexed as the weather files they were ingested from like the months of an
+archive, and the SQL backend answers the reports with aggregate queries.
+sqlite3 is only imported once a database is read or written
+"""
+import os
+from array import array
+from datetime import date
+
+from constants import COLUMNS, MISSING
+from modules.archive import get_member_name, get_path_key
+
+# first bytes of every SQLite database file
+SQLITE_MAGIC = b"SQLite format 3\0"
+SCHEMA = [
+    """
+    CREATE TABLE days (
+        station TEXT NOT NULL,
+        date TEXT NOT NULL,
+        year INTEGER NOT NULL,
+        month INTEGER NOT NULL,
+        max_temperature INTEGER,
+        min_temperature INTEGER,
+        max_humidity INTEGER,
+        mean_humidity INTEGER,
+        PRIMARY KEY (station, date)
+    )
+    """,
+    "CREATE INDEX days_date ON days (date)",
+    "CREATE INDEX days_station_month ON days (station, year, month)",
+]
+# a day repeating the date of an earlier day of its station fills the
+# readings the earlier day is missing
+INSERT_QUERY = (
+    "INSERT INTO days VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+    "ON CONFLICT (station, date) DO UPDATE SET "
+    + ", ".join(
+        f"{column} = COALESCE({column}, excluded.{column})" for column in COLUMNS
+    )
+)
+MONTHS_QUERY = "SELECT station, year, month FROM days GROUP BY station, year, month"
+MONTH_QUERY = (
+    f"SELECT date, {', '.join(COLUMNS)} FROM days "
+    "WHERE station = ? AND year = ? AND month = ? ORDER BY date"
+)
+
+# {path(str): (file_key(tuple), process id(int), Database or None)}
+_databases = {}
+
+
+def to_rows(key, columns):
+    """
+    Converts the columns of a weather file to rows of the days table
+    Args:
+        key(tuple): (station(str), year(int), month(int)) of the weather file
+        columns(list):  list of arrays in the format returned by cache.load_columns
+    Returns:
+        (generator):    tuples in the order of the table's columns, days
+                        without a date are left out
+    """
+    station, year, month = key
+    for ordinal, *values in zip(*columns):
+        if ordinal:
+            yield (
+                station,
+                date.fromordinal(ordinal).isoformat(),
+                year,
+                month,
+                *[None if value == MISSING else value for value in values],
+            )
+
+
+def write_database(path, months):
+    """
+    Writes a database in a single transaction, it replaces the file at path
+    only once it is complete
+    Args:
+        path(str):  path of the database e.g 'weather.sqlite'
+        months(iterable):   ((station, year, month), columns) tuples, columns
+                            in the format returned by cache.load_columns
+    Returns:
+        (int):  number of days written
+    """
+    import sqlite3  # pylint: disable=import-outside-toplevel
+
+    temporary_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        connection = sqlite3.connect(temporary_path)
+        try:
+            with connection:
+                connection.execute(SCHEMA[0])
+                for key, columns in months:
+                    connection.executemany(INSERT_QUERY, to_rows(key, columns))
+                # the indexes are built once after the bulk insert
+                for query in SCHEMA[1:]:
+                    connection.execute(query)
+            rows = connection.execute("SELECT COUNT(*) FROM days").fetchone()[0]
+        finally:
+            connection.close()
+        os.replace(temporary_path, path)
+    finally:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+    return rows
+
+
+class Database:
+    """
+    This class gives read only access to the months of a database
+    """
+
+    def __init__(self, path):
+        """
+        Connects to the database and lists its months
+        Args:
+            path(str):  path of the database e.g 'weather.sqlite'
+        Raises:
+            sqlite3.Error:  if the file is not a database with a days table
+        """
+        # pylint: disable=import-outside-toplevel
+        import sqlite3
+        from pathlib import Path
+
+        self.path = path
+        # read only connections let any number of processes query the file
+        uri = f"{Path(path).absolute().as_uri()}?mode=ro"
+        self.connection = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        self.names = {
+            get_member_name(*key): key
+            for key in self.connection.execute(MONTHS_QUERY).fetchall()
+        }
+
+    def query(self, sql, parameters=()):
+        """
+        Runs a query on the database
+        Args:
+            sql(str):   SELECT statement
+            parameters(tuple):  values of the placeholders of the statement
+        Returns:
+            (list): rows(tuple) of the result
+        """
+        return self.connection.execute(sql, parameters).fetchall()
+
+    def read_member(self, name):
+        """
+        Returns the columns used by the reports of a month
+        Args:
+            name(str):  name of the weather file of the month e.g 'Murree_weather_2004_Aug.txt'
+        Returns:
+            (list or None): list of arrays in the format returned by cache.load_columns
+                            Or
+                            None if the database has no such month
+        """
+        key = self.names.get(name)
+        if key is None:
+            return None
+        columns = [array("i")] + [array("h") for _ in COLUMNS]
+        for day, *values in self.query(MONTH_QUERY, key):
+            columns[0].append(date.fromisoformat(day).toordinal())
+            for column, value in zip(columns[1:], values):
+                column.append(MISSING if value is None else value)
+        return columns
+
+
+def is_database(path):
+    """
+    Checks if a file is an SQLite database
+    Args:
+        path(str):  path of a file
+    Returns:
+        (boolean):  True if the file starts with the SQLite header
+    """
+    try:
+        with open(path, "rb") as file:
+            return file.read(len(SQLITE_MAGIC)) == SQLITE_MAGIC
+    except OSError:
+        return False
+
+
+def open_database(path):
+    """
+    Returns the database at a path, it is opened again if the file changed or
+    in a new process as connections can't be shared with forked processes
+    Args:
+        path(str):  path of the database e.g 'weather.sqlite'
+    Returns:
+        (Database or None): database
+                            Or
+                            None if path is not a weather database
+    """
+    path = path.rstrip("/")
+    file_key = get_path_key(path)
+    if file_key is None:
+        return None
+    if path in _databases and _databases[path][:2] == (file_key, os.getpid()):
+        return _databases[path][2]
+    database = None
+    if is_database(path):
+        import sqlite3  # pylint: disable=import-outside-toplevel
+
+        try:
+            database = Database(path)
+        except sqlite3.Error:
+            database = None
+    _databases[path] = (file_key, os.getpid(), database)
+    return database
+
+
+def read_member(file_path):
+    """
+    Returns the columns used by the reports of a weather file stored in a
+    database, file_path is the path of the database joined with the file name
+    Args:
+        file_path(str): e.g 'weather.sqlite/Murree_weather_2004_Aug.txt'
+    Returns:
+        (list or None): list of arrays in the format returned by cache.load_columns
+                        Or
+                        None if file_path is not in a database
+    """
+    directory, name = os.path.split(file_path)
+    if directory not in _databases and not os.path.isfile(directory):
+        return None
+    database = open_database(directory)
+    if database is None:
+        return None
+    return database.read_member(name)
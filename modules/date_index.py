@@ -0,0 +1,305 @@
+"""
+This module answers queries over any span of days. The months having a
+weather file are kept sorted by the ordinal of their first day, so the files
+covering a span are found by bisection and only those are read. The rows of
+the read files are merged into one column per reading sorted by date, with
+prefix sums so the sum of a span is the difference of two prefix sums.
+Missing readings are left out of the extremes and the averages of a span and
+readings of 0 are kept, like in the rolling, top and percentile reports. The
+month and year reports keep skipping 0 in their extremes and counting missing
+readings as 0 in their averages
+"""
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date
+from itertools import accumulate
+
+from constants import (
+    COLUMNS,
+    DEFAULT_POOL,
+    FULL_MONTH_NAME,
+    HUMIDITY_UNIT,
+    MISSING,
+    TEMPERATURE_UNIT,
+    WEATHER_FILES_DIR,
+)
+from modules.cache import DATE_TYPE, VALUE_TYPE
+from modules.file_index import get_file_index
+from modules.parallel import load_columns_parallel
+from modules.utils import get_date_range
+
+# {(path, station): DateIndex}
+_date_indexes = {}
+
+
+class DateIndex:
+    """
+    This class holds the days of the loaded months of a station sorted by date
+    """
+
+    def __init__(self, path=WEATHER_FILES_DIR, station=None):
+        """
+        Initializes the members and lists the months having a file
+        Args:
+            path(str):  Value containing path to weather files e.g 'weatherfiles/'
+            station(str or None):   station name e.g 'Murree'
+                                    Or
+                                    None for the first station having each month
+        """
+        # ordinals of the first day of the months having a file, sorted, and
+        # the file of each
+        self.month_starts = []
+        self.file_paths = []
+        self.loaded = set()
+        self.ordinals = array(DATE_TYPE)
+        self.columns = {column: array(VALUE_TYPE) for column in COLUMNS}
+        # {column: [0, sum of the first row, sum of the first two rows, ...]}
+        self.prefix_sums = {column: [0] for column in COLUMNS}
+        # {column: [0, readings in the first row, in the first two rows, ...]}
+        self.prefix_counts = {column: [0] for column in COLUMNS}
+        index = get_file_index(path)
+        for year, month in sorted(index.month_files):
+            file_path = index.get(year, month, station)
+            if file_path is not None:
+                self.month_starts.append(date(year, month, 1).toordinal())
+                self.file_paths.append(file_path)
+
+    def get_file_paths(self, first, last):
+        """
+        Returns the files of the months overlapping a span of days
+        Args:
+            first(date):    first day of the span
+            last(date): last day of the span
+        Returns:
+            (list): paths to the weather files of the months
+        """
+        start = max(bisect_right(self.month_starts, first.toordinal()) - 1, 0)
+        end = bisect_right(self.month_starts, last.toordinal())
+        return self.file_paths[start:end]
+
+    def load(self, file_paths, jobs=1, pool=DEFAULT_POOL):
+        """
+        Reads the files that are not loaded yet and merges their days into
+        the sorted columns, the prefix sums and counts are computed again if
+        any was read
+        Args:
+            file_paths(list):   paths to weather files of the station
+            jobs(int):  number of workers loading the files
+            pool(str):  'process' or 'thread', the kind of workers
+        Returns:
+            None
+        """
+        file_paths = [path for path in file_paths if path not in self.loaded]
+        if not file_paths:
+            return
+        rows = list(zip(self.ordinals, *self.columns.values()))
+        for columns in load_columns_parallel(file_paths, jobs, pool):
+            # days without a date can't be placed in a span
+            rows += [row for row in zip(*columns) if row[0]]
+        self.loaded.update(file_paths)
+        # sorting is stable so days sharing a date keep their file order
+        rows.sort(key=lambda row: row[0])
+        self.ordinals = array(DATE_TYPE, [row[0] for row in rows])
+        for position, column in enumerate(COLUMNS, 1):
+            values = array(VALUE_TYPE, [row[position] for row in rows])
+            self.columns[column] = values
+            self.prefix_sums[column] = [0] + list(
+                accumulate(0 if value == MISSING else value for value in values)
+            )
+            self.prefix_counts[column] = [0] + list(
+                accumulate(value != MISSING for value in values)
+            )
+
+    def get_rows(self, first, last):
+        """
+        Returns the positions of the loaded days of a span
+        Args:
+            first(date):    first day of the span
+            last(date): last day of the span
+        Returns:
+            (tuple):    (start(int), end(int)) the days are rows start to end - 1
+        """
+        start = bisect_left(self.ordinals, first.toordinal())
+        return start, bisect_right(self.ordinals, last.toordinal(), start)
+
+    def get_sum(self, column, start, end):
+        """
+        Returns the sum and the number of the readings of rows of a column,
+        missing readings are left out
+        Args:
+            column(str):    name of the column e.g 'max_temperature'
+            start(int): first row
+            end(int):   row after the last row
+        Returns:
+            (tuple):    (total(int), count(int)) of the readings
+        """
+        prefix_sums = self.prefix_sums[column]
+        prefix_counts = self.prefix_counts[column]
+        return (
+            prefix_sums[end] - prefix_sums[start],
+            prefix_counts[end] - prefix_counts[start],
+        )
+
+    def get_extreme(self, column, find_max, start, end):
+        """
+        Returns the first max or min reading of rows of a column with its date,
+        only missing readings are left out
+        Args:
+            column(str):    name of the column e.g 'max_temperature'
+            find_max(bool): True for max, False for min
+            start(int): first row
+            end(int):   row after the last row
+        Returns:
+            (tuple or None):    (value(int), date(date))
+                                Or
+                                None if the rows have no readings
+        """
+        values = self.columns[column][start:end]
+        present = [value for value in values if value != MISSING]
+        if not present:
+            return None
+        extreme = max(present) if find_max else min(present)
+        # the rows are sorted by date so the first row holding it is the earliest
+        row = start + values.index(extreme)
+        return extreme, date.fromordinal(self.ordinals[row])
+
+
+def get_date_index(path, station=None):
+    """
+    Returns the date index of the weather files of a station, the months are
+    only listed the first time and only read when a span needs them
+    Args:
+        path(str):  Value containing path to weather files e.g 'weatherfiles/'
+        station(str or None):   station name or None for the first station
+                                having each month
+    Returns:
+        (DateIndex):    date index of the station
+    """
+    if (path, station) not in _date_indexes:
+        _date_indexes[(path, station)] = DateIndex(path, station)
+    return _date_indexes[(path, station)]
+
+
+def drop_date_indexes(path):
+    """
+    Drops the date indexes of the weather files of a path, so the next span
+    lists and reads the files again
+    Args:
+        path(str):  Value containing path to weather files e.g 'weatherfiles/'
+    Returns:
+        None
+    """
+    for key in [key for key in _date_indexes if key[0] == path]:
+        del _date_indexes[key]
+
+
+class RangeData:
+    """
+    This class holds the days of a span e.g '2005-11-15:2006-02-10', it has
+    the extremes and averages used by the range report
+    """
+
+    def __init__(self, date_range, path=WEATHER_FILES_DIR, jobs=1, pool=DEFAULT_POOL):
+        """
+        Initializes the members and loads the months covering the span
+        Args:
+            date_range(str):    Value containing two dates e.g '2005-11-15:2006-02-10'
+            path(str):  Value containing path to weather files e.g 'weatherfiles/'
+            jobs(int):  number of workers loading the files
+            pool(str):  'process' or 'thread', the kind of workers
+        """
+        self.first, self.last = get_date_range(date_range)
+        self.path = path
+        self.index = None
+        self.days = range(0)
+        self.jobs = jobs
+        self.pool = pool
+
+    def populate(self, station=None):
+        """
+        Loads the months of a station covering the span and finds its days
+        Args:
+            station(str or None):   station name or None for the first station
+                                    having each month
+        Returns:
+            None
+        """
+        self.index = get_date_index(self.path, station)
+        self.index.load(
+            self.index.get_file_paths(self.first, self.last), self.jobs, self.pool
+        )
+        self.days = range(*self.index.get_rows(self.first, self.last))
+
+    def get_name(self):
+        """
+        Returns the span in words
+        Returns:
+            (str):  e.g 'November 15, 2005 to February 10, 2006'
+        """
+        return " to ".join(
+            f"{day.strftime(FULL_MONTH_NAME)} {day.day}, {day.year}"
+            for day in (self.first, self.last)
+        )
+
+    def get_extreme(self, column, find_max, unit):
+        """
+        Returns the extreme of a column over the span
+        Args:
+            column(str):    name of the column e.g 'max_temperature'
+            find_max(bool): True for max, False for min
+            unit(str):  unit appended to the value
+        Returns:
+            (dict): {"value": value_with_unit(str), "date": date(date)}
+                    the value is 'no readings' and the date None if every
+                    reading of the span is missing
+        """
+        extreme = self.index.get_extreme(
+            column, find_max, self.days.start, self.days.stop
+        )
+        if extreme is None:
+            return {"value": "no readings", "date": None}
+        return {"value": f"{extreme[0]}{unit}", "date": extreme[1]}
+
+    def get_average(self, column, unit):
+        """
+        Returns the average of a column over the span rounded to 0 decimals,
+        missing readings are left out
+        Args:
+            column(str):    name of the column e.g 'max_temperature'
+            unit(str):  unit appended to the average
+        Returns:
+            (str):  average with unit
+                    Or
+                    'no readings' if every reading of the span is missing
+        """
+        total, count = self.index.get_sum(column, self.days.start, self.days.stop)
+        if not count:
+            return "no readings"
+        return f"{round(total / count)}{unit}"
+
+    def get_extremes(self):
+        """
+        Returns the extremes of the range report
+        Returns:
+            (list): dictionaries returned by get_extreme for the highest
+                    temperature, the lowest temperature and the max humidity
+        """
+        return [
+            self.get_extreme("max_temperature", True, TEMPERATURE_UNIT),
+            self.get_extreme("min_temperature", False, TEMPERATURE_UNIT),
+            self.get_extreme("max_humidity", True, HUMIDITY_UNIT),
+        ]
+
+    def get_averages(self):
+        """
+        Returns the averages of the range report
+        Returns:
+            (list): averages returned by get_average for the highest
+                    temperature, the lowest temperature and the max humidity,
+                    which the month report labels mean humidity
+        """
+        return [
+            self.get_average("max_temperature", TEMPERATURE_UNIT),
+            self.get_average("min_temperature", TEMPERATURE_UNIT),
+            self.get_average("max_humidity", HUMIDITY_UNIT),
+        ]
@@ -0,0 +1,264 @@
+"""
+This module indexes the weather files of a directory so that the files of a
+month can be found without listing the directory again
+"""
+import os
+import re
+
+from constants import months_list
+
+# e.g 'Murree_weather_2004_Aug.txt' or 'Murree_weather_2004_Aug.txt.gz'
+FILE_NAME_REGEX = re.compile(
+    r"""
+    (?P<station>.+)     # station name
+    _weather_
+    (?P<year>\d{4})     # 4 digit year
+    _
+    (?P<month>[A-Za-z]{3})  # 3 letter month name
+    \.txt
+    (\.(gz|bz2|xz))?$   # optional compression suffix
+    """,
+    re.VERBOSE,
+)
+MONTH_NUMBERS = {name[:3].lower(): number for number, name in enumerate(months_list, 1)}
+
+_indexes = {}
+
+
+def parse_file_name(name):
+    """
+    Parses the name of a weather file
+    Args:
+        name(str): file name e.g 'Murree_weather_2004_Aug.txt', 'Murree_weather_2004_Aug.txt.gz'
+    Returns:
+        (tuple or None):    (station(str), year(int), month(int))
+                            Or
+                            None if name is not the name of a weather file
+    """
+    match = FILE_NAME_REGEX.match(name)
+    if not match:
+        return None
+    month = MONTH_NUMBERS.get(match.group("month").lower())
+    if month is None:
+        return None
+    return match.group("station"), int(match.group("year")), month
+
+
+class WeatherFileIndex:
+    """
+    This class holds the paths of the weather files in a directory
+    """
+
+    def __init__(self, path):
+        """
+        Initializes the members and calls populate to scan the directory
+        Args:
+            path(str):  Value containing path to weather files e.g 'weatherfiles/'
+        """
+        self.path = path
+        self.file_paths = []
+        self.files = {}
+        self.month_files = {}
+        self.month_stations = {}
+        self.populate()
+
+    def populate(self):
+        """
+        Scans the directory once and fills file_paths with every file in it,
+        files with {(station, year, month): file_path} for every weather file,
+        month_files with {(year, month): [file_path, ...]} sorted by station
+        and month_stations with {(year, month): [station, ...]} in the same order.
+        If the path is an archive its months are indexed as the weather files
+        they were converted from, inside the archive e.g 'weather.wma/Murree_weather_2004_Aug.txt',
+        the months of a database are indexed the same way.
+        If the path is a tarball or zip file, or the directory holds some,
+        their weather files are indexed inside them
+        e.g 'weather.tar.gz/Murree_weather_2004_Aug.txt'.
+        Compressed weather files e.g 'Murree_weather_2004_Aug.txt.gz' are
+        indexed like the others, a file that is not compressed is preferred
+        Returns:
+            None
+        """
+        container = open_container(self.path)
+        if container is not None:
+            for name in container.names:
+                self.add(os.path.join(self.path, name))
+        else:
+            try:
+                with os.scandir(self.path) as entries:
+                    for entry in entries:
+                        if entry.name.startswith(".") or not entry.is_file():
+                            continue
+                        bundle = not entry.name.endswith(".txt") and open_bundle_file(
+                            entry.path
+                        )
+                        if not bundle:
+                            self.add(entry.path)
+                            continue
+                        for name in bundle.names:
+                            self.add(os.path.join(entry.path, name))
+            except (FileNotFoundError, NotADirectoryError):
+                return
+        self.file_paths.sort()
+        for station, year, month in sorted(self.files):
+            self.month_files.setdefault((year, month), []).append(
+                self.files[(station, year, month)]
+            )
+            self.month_stations.setdefault((year, month), []).append(station)
+
+    def add(self, file_path):
+        """
+        Adds a file to file_paths and to files if it is a weather file
+        Args:
+            file_path(str): path to a file e.g 'weatherfiles/Murree_weather_2004_Aug.txt'
+        Returns:
+            None
+        """
+        self.file_paths.append(file_path)
+        key = parse_file_name(os.path.basename(file_path))
+        if key is None:
+            return
+        # names matching FILE_NAME_REGEX only end without '.txt' if compressed
+        if key not in self.files or not self.files[key].endswith(".txt"):
+            self.files[key] = file_path
+
+    def get(self, year, month, station=None):
+        """
+        Returns the path of the weather file of a month
+        Args:
+            year(str or int):   Value containing 4 digit year e.g '2004'
+            month(int): Number containing value in range 1-12
+            station(str or None):   station name e.g 'Murree'
+                                    Or
+                                    None for the first station having the month
+        Returns:
+            (str or None):  path to the weather file
+                            Or
+                            None if there is no file for the month
+        """
+        year = int(year)
+        if station is not None:
+            return self.files.get((station, year, month))
+        file_paths = self.month_files.get((year, month))
+        return file_paths[0] if file_paths else None
+
+    def get_months(self, year, station=None):
+        """
+        Returns the months of a year that have a weather file
+        Args:
+            year(str or int):   Value containing 4 digit year e.g '2004'
+            station(str or None):   station name or None for any station
+        Returns:
+            (list): sorted list of months(int)
+        """
+        return [
+            month
+            for month in range(1, len(months_list) + 1)
+            if self.get(year, month, station) is not None
+        ]
+
+    def stations(self):
+        """
+        Returns the names of the stations in the directory
+        Returns:
+            (list): sorted list of station names(str)
+        """
+        return sorted({station for station, _, _ in self.files})
+
+    def search(self, pattern, station=None):
+        """
+        Returns the paths of the files whose name contains the pattern
+        Args:
+            pattern(str): a string which contains any pattern e.g '2006', '2005_Jun'
+            station(str or None):   station name to only return its weather files
+        Returns:
+            (list): paths to the files matching the pattern
+        """
+        file_paths = self.file_paths
+        if station is not None:
+            file_paths = sorted(
+                file_path
+                for (name, _, _), file_path in self.files.items()
+                if name == station
+            )
+        return [
+            file_path
+            for file_path in file_paths
+            if pattern in os.path.basename(file_path)
+        ]
+
+
+def is_plain_file(file_path):
+    """
+    Checks if a file is a text file of a directory, a file that is compressed
+    or stored in an archive, a database or a bundle needs the modules reading
+    them, which are only imported for such files
+    Args:
+        file_path(str): path to a file e.g 'weatherfiles/Murree_weather_2004_Aug.txt'
+    Returns:
+        (boolean):  True if the file ends with '.txt' and is not in another file
+    """
+    return file_path.endswith(".txt") and not os.path.isfile(os.path.dirname(file_path))
+
+
+def open_container(path):
+    """
+    Returns the archive, database, tarball or zip file at a path
+    Args:
+        path(str):  Value containing path to weather files e.g 'weather.wma'
+    Returns:
+        (Archive, Database, Bundle or None):    container of the weather files
+                                                Or
+                                                None if path is a directory
+    """
+    if not os.path.isfile(path.rstrip("/")):
+        return None
+    # pylint: disable=import-outside-toplevel
+    from modules.archive import open_archive
+    from modules.compressed import open_bundle
+    from modules.database import open_database
+
+    return open_archive(path) or open_database(path) or open_bundle(path)
+
+
+def open_bundle_file(file_path):
+    """
+    Returns the bundle of a file of a directory if its name is the name of a
+    tarball or a zip file
+    Args:
+        file_path(str): path of a file e.g 'weatherfiles/weather_2004.tar.gz'
+    Returns:
+        (Bundle or None):   bundle returned by compressed.open_bundle
+                            Or
+                            None if the file is not a tarball or a zip file
+    """
+    # pylint: disable=import-outside-toplevel
+    from modules.compressed import is_bundle_name, open_bundle
+
+    return open_bundle(file_path) if is_bundle_name(file_path) else None
+
+
+def get_file_index(path):
+    """
+    Returns the index of a directory, the directory is only scanned the first time
+    Args:
+        path(str):  Value containing path to weather files e.g 'weatherfiles/'
+    Returns:
+        (WeatherFileIndex): index of the weather files in the directory
+    """
+    if path not in _indexes:
+        _indexes[path] = WeatherFileIndex(path)
+    return _indexes[path]
+
+
+def refresh_file_index(path):
+    """
+    Scans a directory again and replaces its index, so files added or removed
+    since the last scan are seen
+    Args:
+        path(str):  Value containing path to weather files e.g 'weatherfiles/'
+    Returns:
+        (WeatherFileIndex): new index of the weather files in the directory
+    """
+    _indexes[path] = WeatherFileIndex(path)
+    return _indexes[path]
@@ -0,0 +1,141 @@
+"""
+This module provides MonthData and YearData classes that only record what they
+hold when they are created. A month reads its weather file the first time its
+days are accessed and answers aggregates from the summary table without them,
+a year creates its months the first time they are accessed
+"""
+from constants import DEFAULT_POOL, WEATHER_FILES_DIR
+from modules.data_models import MonthData, YearData
+from modules.file_index import get_file_index
+
+
+class LazyMonthData(MonthData):
+    """
+    This class holds the data of an entire month, loaded on first access
+    """
+
+    def __init__(self, year, month, path=WEATHER_FILES_DIR, columns=None, station=None):
+        """
+        Initializes the members, the days are only filled if columns are given
+        Args:
+            year(str or int):   Value containing 4 digit year e.g '2004'
+            month(int): Number containing value in range 1-12
+            path(str):  Value containing path to weather files e.g 'weatherfiles/'
+            columns(list or None):  already loaded columns of the month's file
+            station(str or None):   station name or None for the first station
+                                    having the month
+        """
+        self.loaded_days_data = None
+        super().__init__(year, month, path, columns, station)
+
+    @property
+    def days_data(self):
+        """
+        Returns the days of the month, the month's file is read on the first call
+        Returns:
+            (list): list of DayData objects
+        """
+        if self.loaded_days_data is None:
+            self.loaded_days_data = []
+            super().populate()
+        return self.loaded_days_data
+
+    @days_data.setter
+    def days_data(self, days_data):
+        """
+        Replaces the days of the month
+        Args:
+            days_data(list):    list of DayData objects
+        Returns:
+            None
+        """
+        self.loaded_days_data = days_data
+
+    def populate(self, columns=None):
+        """
+        Fills days_data from the given columns, without columns the month's file
+        is read when days_data is first accessed
+        Args:
+            columns(list or None):  columns returned by cache.load_columns
+                                    Or
+                                    None to load them on first access
+        Returns:
+            None
+        """
+        if columns is None:
+            self.loaded_days_data = None
+        else:
+            super().populate(columns)
+
+    def is_loaded(self):
+        """
+        Checks if the days of the month have been loaded
+        Returns:
+            (boolean):  True if days_data has been filled
+        """
+        return self.loaded_days_data is not None
+
+
+class LazyYearData(YearData):
+    """
+    This class holds data of an entire year as LazyMonthData objects, created
+    on first access
+    """
+
+    month_data_class = LazyMonthData
+
+    def __init__(
+        self, year, path=WEATHER_FILES_DIR, jobs=1, pool=DEFAULT_POOL, **options
+    ):
+        """
+        Initializes the members, the months are only created when accessed
+        Args:
+            year(str or int):   Value containing 4 digit year e.g '2004'
+            path(str):  Value containing path to weather files e.g 'weatherfiles/'
+            jobs(int):  unused, each month is loaded on its own when accessed
+            pool(str):  unused
+            options:    months_data and station as for YearData
+        """
+        self.loaded_months_data = None
+        super().__init__(year, path, jobs, pool, **options)
+
+    @property
+    def months_data(self):
+        """
+        Returns the months of the year having days, the months are created on
+        the first call and checked through the summary table without reading
+        their days
+        Returns:
+            (list): list of LazyMonthData objects
+        """
+        if self.loaded_months_data is None:
+            index = get_file_index(self.path)
+            months_data = [
+                self.month_data_class(self.year, month, self.path, station=self.station)
+                for month in index.get_months(self.year, self.station)
+            ]
+            self.loaded_months_data = [
+                month_data
+                for month_data in months_data
+                if month_data.get_summary().days
+            ]
+        return self.loaded_months_data
+
+    @months_data.setter
+    def months_data(self, months_data):
+        """
+        Replaces the months of the year
+        Args:
+            months_data(list):  list of month objects
+        Returns:
+            None
+        """
+        self.loaded_months_data = months_data
+
+    def populate(self):
+        """
+        Leaves the months to be created when months_data is first accessed
+        Returns:
+            None
+        """
+        self.loaded_months_data = None
@@ -0,0 +1,88 @@
+"""
+This module loads weather files on a pool of workers so that the files of a
+year are parsed at the same time, and summarizes stations on a pool of workers
+so that queries across stations scale with the number of cores
+"""
+from itertools import repeat
+
+from modules.cache import load_columns
+from modules.summary import get_summary_table, summarize_station
+
+
+def get_executor(jobs, pool):
+    """
+    Returns the executor that loads weather files, the workers need no setup
+    as each file is parsed with the schema of its own header
+    Args:
+        jobs(int):  number of workers
+        pool(str):  'process' for a process pool, which parses files on all cores
+                    'thread' for a thread pool, which suits slow network mounts
+    Returns:
+        (Executor): ProcessPoolExecutor or ThreadPoolExecutor
+    """
+    # concurrent.futures is only imported by the runs that start workers
+    # pylint: disable=import-outside-toplevel
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+    if pool == "thread":
+        return ThreadPoolExecutor(max_workers=jobs)
+    return ProcessPoolExecutor(max_workers=jobs)
+
+
+def map_parallel(function, items, jobs=1, pool="process"):
+    """
+    Returns the results of a function called with each item, the calls are
+    run by a pool of workers
+    Args:
+        function(function): function taking one item, defined at the top
+                            level of a module so process workers can call it
+        items(list):    arguments of the calls
+        jobs(int):  number of workers, the calls are run one after another if 1
+        pool(str):  'process' or 'thread'
+    Returns:
+        (list): results in the order of items
+    """
+    if jobs <= 1 or len(items) <= 1:
+        return [function(item) for item in items]
+    with get_executor(min(jobs, len(items)), pool) as executor:
+        return list(executor.map(function, items))
+
+
+def load_columns_parallel(file_paths, jobs=1, pool="process"):
+    """
+    Returns the columns of the weather files, loaded by a pool of workers
+    Args:
+        file_paths(list):   list of paths to weather files
+        jobs(int):  number of workers, the files are loaded one after another if 1
+        pool(str):  'process' or 'thread'
+    Returns:
+        (list): list containing the columns returned by cache.load_columns
+                for each file in the order of file_paths
+    """
+    return map_parallel(load_columns, file_paths, jobs, pool)
+
+
+def summarize_stations(path, stations, years, jobs=1, pool="process"):
+    """
+    Returns the summary of each station in a range of years, the stations are
+    summarized by a pool of workers and the summary table rows they computed
+    are kept in the table of this process
+    Args:
+        path(str):  Value containing path to weather files e.g 'weatherfiles/'
+        stations(list): list of station names(str)
+        years(tuple):   (first_year(int), last_year(int)) of the range
+        jobs(int):  number of workers, the stations are summarized one after another if 1
+        pool(str):  'process' or 'thread'
+    Returns:
+        (list): list of MonthSummary objects in the order of stations
+    """
+    arguments = (repeat(path), stations, repeat(years[0]), repeat(years[1]))
+    if jobs <= 1 or len(stations) <= 1:
+        results = list(map(summarize_station, *arguments))
+    else:
+        with get_executor(min(jobs, len(stations)), pool) as executor:
+            results = list(executor.map(summarize_station, *arguments))
+    table = get_summary_table(path)
+    for _, rows in results:
+        table.update(rows)
+    return [summary for summary, _ in results]
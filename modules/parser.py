@@ -0,0 +1,252 @@
+"""
+This module parses the lines of weather files in a single pass. Only the
+fields used by the reports are converted, missing or malformed readings become
+None without raising exceptions and dates become ordinals instead of date objects.
+Months, days and reading strings repeat on almost every line so their
+conversions are looked up in dictionaries after the first time, which also lets
+lines read as bytes be parsed without decoding them.
+Each distinct header is detected once and compiled to a Schema, so directories
+mixing exports with different layouts are parsed at the same speed
+"""
+import re
+from operator import itemgetter
+
+# exports name the date column after the station's time zone e.g 'PKT', 'PKST', 'GST'
+DATE_FIELD_REGEX = re.compile(r"[A-Z]{2,5}$")
+# names of the reading columns, compared without surrounding spaces
+VALUE_FIELDS = ["Max TemperatureC", "Min TemperatureC", "Max Humidity", "Mean Humidity"]
+DAYS_IN_MONTH = [0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31]
+DAYS_BEFORE_MONTH = [0, 0, 31, 59, 90, 120, 151, 181, 212, 243, 273, 304, 334]
+
+# {header(str): Schema or None}
+_schemas = {}
+
+
+def is_leap(year):
+    """
+    Checks if year is a leap year
+    Args:
+        year(int):  4 digit year e.g 2004
+    Returns:
+        (boolean):  True if year is a leap year
+    """
+    return year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+
+
+def get_ordinal(year, month, day):
+    """
+    Returns the proleptic Gregorian ordinal of a date, the same value as
+    date(year, month, day).toordinal() without creating the date
+    Args:
+        year(int):  4 digit year e.g 2004
+        month(int): Number containing value in range 1-12
+        day(int):   day of the month
+    Returns:
+        (int):  ordinal of the date or 0 if the date is not valid
+    """
+    if year < 1 or not 0 < month < 13:
+        return 0
+    leap_day = 1 if month == 2 and is_leap(year) else 0
+    if not 0 < day <= DAYS_IN_MONTH[month] + leap_day:
+        return 0
+    previous_year = year - 1
+    days_before_year = (
+        previous_year * 365
+        + previous_year // 4
+        - previous_year // 100
+        + previous_year // 400
+    )
+    leap_day = 1 if month > 2 and is_leap(year) else 0
+    return days_before_year + DAYS_BEFORE_MONTH[month] + leap_day + day
+
+
+class MonthStarts(dict):
+    """
+    This class maps the 'yyyy-m' part of date fields to the ordinal of the day
+    before the month and the number of days in it, each month is computed once
+    """
+
+    def __missing__(self, prefix):
+        """
+        Computes the start of a month the first time it is looked up
+        Args:
+            prefix(str or bytes):   Value containing year and month e.g '2004-8'
+        Returns:
+            (tuple):    (ordinal of the day before the month(int), days in month(int))
+                        Or
+                        (0, 0) if prefix is not a valid year and month
+        """
+        parts = to_text(prefix).strip().split("-")
+        start = (0, 0)
+        if len(parts) == 2 and all(part.isdecimal() for part in parts):
+            year, month = int(parts[0]), int(parts[1])
+            ordinal = get_ordinal(year, month, 1)
+            if ordinal:
+                leap_day = 1 if month == 2 and is_leap(year) else 0
+                start = (ordinal - 1, DAYS_IN_MONTH[month] + leap_day)
+        self[prefix] = start
+        return start
+
+
+class Readings(dict):
+    """
+    This class maps reading fields to their integer values, weather readings
+    only take a few hundred distinct values so each one is converted once
+    """
+
+    def __missing__(self, field):
+        """
+        Converts a reading field the first time it is looked up
+        Args:
+            field(str or bytes):    Value containing digits with an optional minus sign
+                                    e.g '23', '-4'
+        Returns:
+            (int or None):  value of the reading or None if it is missing or malformed
+        """
+        value = to_int(to_text(field))
+        self[field] = value
+        return value
+
+
+class DayNumbers(dict):
+    """
+    This class maps the day part of date fields to the day of the month
+    """
+
+    def __missing__(self, field):
+        """
+        Converts a day field the first time it is looked up
+        Args:
+            field(str or bytes):    Value containing the day of the month e.g '8'
+        Returns:
+            (int):  day of the month or 0 if the field is malformed
+        """
+        text = to_text(field).strip()
+        day = int(text) if text.isdecimal() else 0
+        self[field] = day
+        return day
+
+
+def to_text(field):
+    """
+    Decodes fields read from a file opened in binary mode, only called the
+    first time a value is seen
+    Args:
+        field(str or bytes):    field of a line
+    Returns:
+        (str):  field as a string, bytes that are not ascii are replaced
+    """
+    if isinstance(field, bytes):
+        return field.decode("ascii", "replace")
+    return field
+
+
+def to_int(field):
+    """
+    Converts a reading field to an integer
+    Args:
+        field(str): Value containing digits with an optional minus sign e.g '23', '-4'
+    Returns:
+        (int or None):  value of the reading or None if it is missing or malformed
+    """
+    field = field.strip()
+    digits = field[1:] if field[:1] == "-" else field
+    return int(field) if digits.isdecimal() else None
+
+
+def make_row_parser(date_index, value_indexes, binary=False):
+    """
+    Returns a function that parses a line to a row
+    Args:
+        date_index(int):    index of the date field
+        value_indexes(list):    indexes of highest temperature, lowest temperature,
+                                max humidity and mean humidity
+        binary(bool):   True to parse lines read as bytes, which are never decoded
+    Returns:
+        (function): function taking a line(str or bytes) and returning
+                    (ordinal(int), highest_temperature, lowest_temperature,
+                    max_humidity, mean_humidity) or None if the line is too short,
+                    the ordinal is 0 if the date is not valid
+    """
+    # the line is only split as far as the last needed field
+    last_index = max(date_index, *value_indexes)
+    get_fields = itemgetter(date_index, *value_indexes)
+    comma, dash = (b",", b"-") if binary else (",", "-")
+    month_starts = MonthStarts()
+    day_numbers = DayNumbers()
+    readings = Readings()
+
+    def parse_row(line):
+        fields = line.split(comma, last_index + 1)
+        if len(fields) <= last_index:
+            return None
+        date_field, first, second, third, fourth = get_fields(fields)
+        prefix, _, day = date_field.rpartition(dash)
+        start, days = month_starts[prefix]
+        day = day_numbers[day]
+        ordinal = start + day if 0 < day <= days else 0
+        return (
+            ordinal,
+            readings[first],
+            readings[second],
+            readings[third],
+            readings[fourth],
+        )
+
+    return parse_row
+
+
+class Schema:
+    """
+    This class holds the positions of the needed columns in a header layout
+    and the row parsers compiled for them
+    """
+
+    def __init__(self, date_index, value_indexes):
+        """
+        Initializes the members and compiles the row parsers of text and bytes
+        Args:
+            date_index(int):    index of the date field
+            value_indexes(list):    indexes of highest temperature, lowest temperature,
+                                    max humidity and mean humidity
+        """
+        self.date_index = date_index
+        self.value_indexes = list(value_indexes)
+        self.parse_row = make_row_parser(date_index, self.value_indexes)
+        self.parse_bytes = make_row_parser(date_index, self.value_indexes, True)
+
+
+def detect_schema(header):
+    """
+    Finds the positions of the needed columns in the header of a weather file
+    Args:
+        header(str):    first line of a weather file
+    Returns:
+        (Schema or None):   schema of the header
+                            Or
+                            None if a needed column is missing
+    """
+    fields = [field.strip() for field in header.split("\n")[0].split(",")]
+    date_indexes = [
+        index for index, field in enumerate(fields) if DATE_FIELD_REGEX.match(field)
+    ]
+    if not date_indexes or not all(name in fields for name in VALUE_FIELDS):
+        return None
+    return Schema(date_indexes[0], [fields.index(name) for name in VALUE_FIELDS])
+
+
+def get_schema(header):
+    """
+    Returns the schema of a header, it is detected the first time the header is seen
+    Args:
+        header(str):    first line of a weather file
+    Returns:
+        (Schema or None):   same as detect_schema
+    """
+    if header not in _schemas:
+        _schemas[header] = detect_schema(header)
+    return _schemas[header]
+
+
+# layout of the bundled exports, used for lines that come without their header
+DEFAULT_SCHEMA = Schema(0, [1, 3, 7, 8])
@@ -0,0 +1,287 @@
+"""
+This module plans the reports of a run, so that every weather file needed by
+any of the requested reports is loaded exactly once
+"""
+from constants import ALL_STATIONS, DEFAULT_POOL, WEATHER_FILES_DIR, months_list
+from modules.data_models import (
+    MonthData,
+    ReportGenerator,
+    StationsData,
+    YearData,
+    YearRangeData,
+)
+from modules.file_index import get_file_index
+from modules.parallel import load_columns_parallel
+from modules.utils import get_year_month
+from modules.validators import is_year_range
+
+
+class QueryPlanner:
+    """
+    This class collects report parameters, loads the union of the months they
+    need into a shared store and generates every report from that store
+    """
+
+    # {flag: ReportGenerator method writing the report of the flag's span}
+    SPAN_REPORTS = {
+        "-r": "generate_range_report",
+        "-w": "generate_rolling_report",
+        "-t": "generate_years_report",
+        "-p": "generate_years_report",
+    }
+
+    def __init__(
+        self,
+        path=WEATHER_FILES_DIR,
+        data_classes=(MonthData, YearData),
+        jobs=1,
+        pool=DEFAULT_POOL,
+        station=None,
+    ):
+        """
+        Initializes the members
+        Args:
+            path(str):  Value containing path to weather files e.g 'weatherfiles/'
+            data_classes(tuple):    tuple containing the month class and the year class
+            jobs(int):  number of workers loading the files
+            pool(str):  'process' or 'thread', the kind of workers
+            station(str or None):   station name e.g 'Murree'
+                                    Or
+                                    ALL_STATIONS to report every station
+                                    Or
+                                    None for the first station having each month
+        """
+        self.path = path
+        self.data_classes = data_classes
+        self.jobs = jobs
+        self.pool = pool
+        self.station = station
+        self.parameters = []
+        # {(station, year, month): month object}
+        self.months = {}
+
+    def add(self, flag, flag_argument):
+        """
+        Adds a validated report parameter
+        Args:
+            flag(str): Value containing flag e.g '-e', '-a', '-c'
+            flag_argument(str): Value containing the year or year_month e.g '2006', '2006/6'
+        Returns:
+            None
+        """
+        self.parameters.append((flag, flag_argument))
+
+    def get_month_stations(self, year, month):
+        """
+        Returns the stations whose file of a month is reported
+        Args:
+            year(int):  4 digit year e.g 2004
+            month(int): Number containing value in range 1-12
+        Returns:
+            (list): list of station names(str) having a file for the month
+        """
+        stations = get_file_index(self.path).month_stations.get((year, month), [])
+        if self.station == ALL_STATIONS:
+            return stations
+        if self.station is None:
+            return stations[:1]
+        return [self.station] if self.station in stations else []
+
+    def get_needed_months(self, parameters):
+        """
+        Returns the months that have a weather file and are needed by the reports
+        Args:
+            parameters(list):   validated [[flag(str), argument(str)],...]
+        Returns:
+            (set): set of (station(str), year(int), month(int)) tuples
+        """
+        months = set()
+        for flag, flag_argument in parameters:
+            if flag == "-e" and (
+                is_year_range(flag_argument) or self.station == ALL_STATIONS
+            ):
+                # these are answered from the summary table
+                continue
+            if flag in ("-r", "-w", "-t", "-p"):
+                # spans are answered from the date index of their station,
+                # windows and rankings stream their files and percentiles
+                # sketch them
+                continue
+            if flag == "-e":
+                year = int(flag_argument)
+                for month in range(1, len(months_list) + 1):
+                    for station in self.get_month_stations(year, month):
+                        months.add((station, year, month))
+            else:
+                year, month = get_year_month(flag_argument)
+                for station in self.get_month_stations(year, month):
+                    months.add((station, year, month))
+        return months
+
+    def load(self, months):
+        """
+        Loads the months that are not loaded yet, each file is read once
+        Args:
+            months(set):    set of (station(str), year(int), month(int)) tuples
+                            having a weather file
+        Returns:
+            None
+        """
+        index = get_file_index(self.path)
+        keys = sorted(months - set(self.months))
+        file_paths = [index.get(year, month, station) for station, year, month in keys]
+        months_columns = load_columns_parallel(file_paths, self.jobs, self.pool)
+        for (station, year, month), columns in zip(keys, months_columns):
+            self.months[(station, year, month)] = self.data_classes[0](
+                year, month, self.path, columns, station
+            )
+
+    def get_month_data(self, year, month, station=None):
+        """
+        Returns the data of a month from the store
+        Args:
+            year(int):  4 digit year e.g 2004
+            month(int): Number containing value in range 1-12
+            station(str or None):   station of the month
+        Returns:
+            (MonthData):    object of the month class, without days if the month
+                            has no weather file
+        """
+        if (station, year, month) not in self.months:
+            return self.data_classes[0](year, month, self.path, station=station)
+        return self.months[(station, year, month)]
+
+    def get_year_data(self, year):
+        """
+        Returns the data of a year built from the months in the store
+        Args:
+            year(str):  Value containing 4 digit year e.g '2004'
+                        Or
+                        a range of years e.g '2004:2016'
+        Returns:
+            (YearData): object of the year class
+                        Or
+                        YearRangeData holding the month summaries of a range of years
+                        Or
+                        StationsData holding the summary of each station if
+                        every station is reported
+        """
+        if self.station == ALL_STATIONS:
+            return StationsData(year, self.path, self.jobs, self.pool)
+        if is_year_range(year):
+            return YearRangeData(year, self.path, station=self.station)
+        months_data = [
+            self.months[(station, int(year), month)]
+            for month in range(1, len(months_list) + 1)
+            for station in self.get_month_stations(int(year), month)
+            if (station, int(year), month) in self.months
+        ]
+        return self.data_classes[1](
+            year, self.path, months_data=months_data, station=self.station
+        )
+
+    def load_all(self):
+        """
+        Loads every month that has a weather file in the path
+        Returns:
+            None
+        """
+        self.load(
+            {
+                (station, year, month)
+                for (year, month) in get_file_index(self.path).month_files
+                for station in self.get_month_stations(year, month)
+            }
+        )
+
+    def generate_span_reports(self, flag, flag_argument, options):
+        """
+        Generates the range, rolling, top or percentile report of each
+        reported station
+        Args:
+            flag(str): Value containing flag '-r', '-w', '-t' or '-p'
+            flag_argument(str): Value containing the dates e.g '2005-11-15:2006-02-10'
+                                Or
+                                the years and days of the windows e.g '2005:30'
+                                Or
+                                the years and days of the rankings e.g '2006:10'
+                                Or
+                                the years of the percentiles e.g '2004:2016'
+            options(dict):  options of the ReportGenerator
+        Returns:
+            None
+        """
+        # the module of a span report is only imported when its flag is given
+        # pylint: disable=import-outside-toplevel
+        if flag == "-r":
+            from modules.date_index import RangeData
+
+            span_data = RangeData(flag_argument, self.path, self.jobs, self.pool)
+        elif flag == "-w":
+            from modules.rolling import RollingData
+
+            span_data = RollingData(flag_argument, self.path)
+        elif flag == "-t":
+            from modules.ranking import TopData
+
+            span_data = TopData(flag_argument, self.path)
+        else:
+            from modules.quantiles import PercentileData
+
+            span_data = PercentileData(flag_argument, self.path, self.jobs, self.pool)
+        if self.station == ALL_STATIONS:
+            stations = get_file_index(self.path).stations()
+        else:
+            stations = [self.station]
+        for station in stations:
+            span_data.populate(station)
+            heading = station if self.station == ALL_STATIONS else None
+            report = ReportGenerator(span_data=span_data, heading=heading, **options)
+            getattr(report, self.SPAN_REPORTS[flag])()
+
+    def execute(self, output=None, color=True):
+        """
+        Generates the reports of the parameters that were added
+        Args:
+            output(stream or None): stream the reports are written to, stdout if None
+            color(bool):    False to write the charts without escape sequences
+        Returns:
+            None
+        """
+        self.generate(self.parameters, output, color)
+
+    def generate(self, parameters, output=None, color=True):
+        """
+        Loads the months needed by the parameters and generates the report of
+        each parameter in the given order, reports are separated by a blank line.
+        If every station is reported the month, range, rolling, top and
+        percentile reports are generated for each station having the month or
+        any file, headed by the station name
+        Args:
+            parameters(list):   validated [[flag(str), argument(str)],...]
+            output(stream or None): stream the reports are written to, stdout if None
+            color(bool):    False to write the charts without escape sequences
+        Returns:
+            None
+        """
+        self.load(self.get_needed_months(parameters))
+        options = {"output": output, "color": color, "separator": "\n"}
+        for flag, flag_argument in parameters:
+            if flag == "-e":
+                year_data = self.get_year_data(flag_argument)
+                report = ReportGenerator(year_data=year_data, **options)
+                report.generate_extremes_report()
+                continue
+            if flag in self.SPAN_REPORTS:
+                self.generate_span_reports(flag, flag_argument, options)
+                continue
+            year, month = get_year_month(flag_argument)
+            stations = self.get_month_stations(year, month)
+            for station in stations or [None]:
+                month_data = self.get_month_data(year, month, station or self.station)
+                heading = station if self.station == ALL_STATIONS else None
+                report = ReportGenerator(month_data, heading=heading, **options)
+                if flag == "-a":
+                    report.generate_averages_report_month()
+                elif flag == "-c":
+                    report.generate_report_charts()
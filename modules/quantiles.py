@@ -0,0 +1,252 @@
+"""
+This module answers percentile queries e.g the median and the 95th percentile
+of the max temperature over decades without keeping the readings. The readings
+are added to KLL sketches, a sketch keeps a stack of compactors, each item of
+the compactor at level h stands for 2 ** h readings, and a full compactor
+sorts its items and promotes every other one to the next level. The sketch
+stays under a few times its size whatever the number of readings, and the
+sketches of different files merge into the sketch of all of them, so every
+year is sketched on its own worker and the sketches are merged at the end
+"""
+from math import ceil
+
+from constants import (
+    COLUMNS,
+    DEFAULT_POOL,
+    HUMIDITY_UNIT,
+    MISSING,
+    TEMPERATURE_UNIT,
+    WEATHER_FILES_DIR,
+)
+from modules.cache import load_columns
+from modules.file_index import get_file_index
+from modules.parallel import map_parallel
+from modules.utils import get_year_range, get_years_name
+
+# number of items of the top compactor, the rank error is about 1.7 / SIZE
+DEFAULT_SIZE = 200
+# each compactor holds this fraction of the items of the compactor above it
+CAPACITY_RATIO = 2 / 3
+MIN_CAPACITY = 2
+PERCENTILES = [50, 95, 99]
+
+
+class KllSketch:
+    """
+    This class holds a mergeable summary of readings that estimates their quantiles
+    """
+
+    def __init__(self, size=DEFAULT_SIZE):
+        """
+        Initializes the members
+        Args:
+            size(int):  number of items of the top compactor, larger is more accurate
+        """
+        self.size = size
+        self.count = 0
+        # levels[h] holds the items of weight 2 ** h
+        self.levels = [[]]
+        self.items = 0
+        self.capacity = self.get_capacity(0)
+        # alternates which half of a compactor is promoted, so the errors cancel
+        self.offset = 0
+
+    def get_capacity(self, level):
+        """
+        Returns the number of items a compactor holds before it is compacted
+        Args:
+            level(int): level of the compactor
+        Returns:
+            (int):  capacity of the compactor
+        """
+        depth = len(self.levels) - level - 1
+        return max(MIN_CAPACITY, ceil(self.size * CAPACITY_RATIO**depth))
+
+    def add(self, value):
+        """
+        Adds a reading to the sketch
+        Args:
+            value(int): reading
+        Returns:
+            None
+        """
+        self.levels[0].append(value)
+        self.count += 1
+        self.items += 1
+        if self.items > self.capacity:
+            self.compress()
+
+    def merge(self, other):
+        """
+        Adds the readings summarized by another sketch to the sketch
+        Args:
+            other(KllSketch):   sketch of other readings, it is left unchanged
+        Returns:
+            None
+        """
+        while len(self.levels) < len(other.levels):
+            self.levels.append([])
+        for items, other_items in zip(self.levels, other.levels):
+            items.extend(other_items)
+        self.count += other.count
+        self.items += other.items
+        self.compress()
+
+    def compress(self):
+        """
+        Compacts the lowest full compactors until the sketch fits its capacity
+        Returns:
+            None
+        """
+        self.capacity = sum(map(self.get_capacity, range(len(self.levels))))
+        while self.items > self.capacity:
+            level = next(
+                level
+                for level, items in enumerate(self.levels)
+                if len(items) >= self.get_capacity(level)
+            )
+            if level == len(self.levels) - 1:
+                self.levels.append([])
+            items = sorted(self.levels[level])
+            # an odd item stays behind so the weight of the sketch is unchanged
+            self.levels[level] = [items.pop()] if len(items) % 2 else []
+            promoted = items[self.offset :: 2]
+            self.levels[level + 1].extend(promoted)
+            self.offset ^= 1
+            self.items -= len(items) - len(promoted)
+            self.capacity = sum(map(self.get_capacity, range(len(self.levels))))
+
+    def get_quantile(self, fraction):
+        """
+        Returns the estimated reading of a rank, the smallest reading that at
+        least a fraction of the readings are not greater than
+        Args:
+            fraction(float):    rank as a fraction of the readings e.g 0.95
+        Returns:
+            (int or None):  estimated reading
+                            Or
+                            None if the sketch has no readings
+        """
+        weighted = sorted(
+            (value, 2**level)
+            for level, items in enumerate(self.levels)
+            for value in items
+        )
+        target = fraction * self.count
+        total = 0
+        for value, weight in weighted:
+            total += weight
+            if total >= target:
+                return value
+        return weighted[-1][0] if weighted else None
+
+
+def sketch_files(file_paths):
+    """
+    Returns the sketches of the readings of weather files, days without a
+    date and missing readings are left out
+    Args:
+        file_paths(list):   paths to weather files
+    Returns:
+        (dict): {column(str): KllSketch} for each column of constants.COLUMNS
+    """
+    sketches = {column: KllSketch() for column in COLUMNS}
+    for file_path in file_paths:
+        columns = load_columns(file_path)
+        for column, values in zip(COLUMNS, columns[1:]):
+            add = sketches[column].add
+            for ordinal, value in zip(columns[0], values):
+                if ordinal and value != MISSING:
+                    add(value)
+    return sketches
+
+
+class PercentileData:
+    """
+    This class holds the sketches of some years e.g '2004:2016', it has the
+    lines of the percentile report
+    """
+
+    # (column, label, unit)
+    STATS = [
+        ("max_temperature", "Highest", TEMPERATURE_UNIT),
+        ("min_temperature", "Lowest", TEMPERATURE_UNIT),
+        ("max_humidity", "Humidity", HUMIDITY_UNIT),
+    ]
+
+    def __init__(self, years, path=WEATHER_FILES_DIR, jobs=1, pool=DEFAULT_POOL):
+        """
+        Initializes the members
+        Args:
+            years(str): Value containing a year or two years e.g '2005', '2004:2016'
+            path(str):  Value containing path to weather files e.g 'weatherfiles/'
+            jobs(int):  number of workers sketching the years
+            pool(str):  'process' or 'thread', the kind of workers
+        """
+        year_range = get_year_range(years) or (int(years), int(years))
+        self.first_year, self.last_year = year_range
+        self.path = path
+        self.jobs = jobs
+        self.pool = pool
+        self.sketches = {}
+        self.days = 0
+
+    def populate(self, station=None):
+        """
+        Sketches the readings of the years of a station, each year is
+        sketched by a worker and the sketches of the years are merged
+        Args:
+            station(str or None):   station name or None for the first station
+                                    having each month
+        Returns:
+            None
+        """
+        index = get_file_index(self.path)
+        years = {}
+        for year, month in sorted(index.month_files):
+            file_path = index.get(year, month, station)
+            if self.first_year <= year <= self.last_year and file_path is not None:
+                years.setdefault(year, []).append(file_path)
+        self.sketches = {column: KllSketch() for column in COLUMNS}
+        for sketches in map_parallel(
+            sketch_files, list(years.values()), self.jobs, self.pool
+        ):
+            for column, sketch in sketches.items():
+                self.sketches[column].merge(sketch)
+        self.days = max(sketch.count for sketch in self.sketches.values())
+
+    def get_years(self):
+        """
+        Returns the years of the percentiles in words
+        Returns:
+            (str):  e.g '2005' or '2004 to 2016'
+        """
+        return get_years_name(self.first_year, self.last_year)
+
+    def get_name(self):
+        """
+        Returns the percentiles and years in words
+        Returns:
+            (str):  e.g 'Percentiles of 2005' or 'Percentiles of 2004 to 2016'
+        """
+        return f"Percentiles of {self.get_years()}"
+
+    def get_lines(self):
+        """
+        Returns a line for each column with the percentiles of its readings
+        Returns:
+            (list): lines(str) e.g 'Highest: p50 24C, p95 37C, p99 41C'
+        """
+        lines = []
+        for column, label, unit in self.STATS:
+            sketch = self.sketches[column]
+            values = []
+            for percentile in PERCENTILES:
+                value = sketch.get_quantile(percentile / 100)
+                values.append(
+                    f"p{percentile} -"
+                    if value is None
+                    else f"p{percentile} {value}{unit}"
+                )
+            lines.append(f"{label}: {', '.join(values)}")
+        return lines
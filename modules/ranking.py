@@ -0,0 +1,149 @@
+"""
+This module answers top N queries e.g the 10 hottest days of 2006. The days
+are streamed in date order and each ranking keeps its N best days in a heap,
+a day only enters the heap if it beats the worst day kept, so a ranking over
+decades holds N days whatever the number of days streamed
+"""
+import heapq
+from datetime import date
+
+from constants import (
+    FULL_MONTH_NAME,
+    HUMIDITY_UNIT,
+    TEMPERATURE_UNIT,
+    WEATHER_FILES_DIR,
+)
+from modules.rolling import stream_days
+from modules.utils import get_window, get_years_name
+
+
+class TopDays:
+    """
+    This class holds the days with the largest or smallest readings of a column
+    """
+
+    def __init__(self, count, largest=True):
+        """
+        Initializes the members
+        Args:
+            count(int): number of days kept
+            largest(bool):  True to keep the largest readings, False for the smallest
+        """
+        self.count = count
+        self.sign = 1 if largest else -1
+        # (key, -position, date) of the kept days, the worst day is at the
+        # front and among equal readings the latest day is the worst
+        self.heap = []
+        self.position = 0
+
+    def push(self, value, day):
+        """
+        Offers the reading of a day, it is kept if it is one of the best so
+        far, ties keep the earlier day
+        Args:
+            value(int or None): reading of the day or None if it is missing
+            day(date):  date of the reading
+        Returns:
+            None
+        """
+        if value is None:
+            return
+        self.position += 1
+        item = (self.sign * value, -self.position, day)
+        if len(self.heap) < self.count:
+            heapq.heappush(self.heap, item)
+        elif item > self.heap[0]:
+            heapq.heapreplace(self.heap, item)
+
+    def get_days(self):
+        """
+        Returns the kept days, best first
+        Returns:
+            (list): (value(int), date(date)) tuples
+        """
+        return [
+            (self.sign * key, day)
+            for key, _, day in sorted(
+                self.heap, key=lambda item: item[:2], reverse=True
+            )
+        ]
+
+
+class TopData:
+    """
+    This class holds the rankings of the days of some years e.g '2006:10', it
+    has the lines of the top report
+    """
+
+    # (column, label, unit, True for the largest readings)
+    STATS = [
+        ("max_temperature", "Highest", TEMPERATURE_UNIT, True),
+        ("min_temperature", "Lowest", TEMPERATURE_UNIT, False),
+        ("max_humidity", "Humidity", HUMIDITY_UNIT, True),
+    ]
+
+    def __init__(self, top, path=WEATHER_FILES_DIR):
+        """
+        Initializes the members
+        Args:
+            top(str):   Value containing one or two years and the number of
+                        days of each ranking e.g '2006:10', '2004:2016:5'
+            path(str):  Value containing path to weather files e.g 'weatherfiles/'
+        """
+        # the years and the count are written like the years and days of a window
+        first_year, last_year, self.count = get_window(top)
+        self.first = date(first_year, 1, 1)
+        self.last = date(last_year, 12, 31)
+        self.path = path
+        self.rankings = {}
+        self.days = 0
+
+    def populate(self, station=None):
+        """
+        Ranks the days of the years of a station
+        Args:
+            station(str or None):   station name or None for the first station
+                                    having each month
+        Returns:
+            None
+        """
+        self.rankings = {
+            column: TopDays(self.count, largest) for column, _, _, largest in self.STATS
+        }
+        self.days = 0
+        for day in stream_days(self.path, self.first, self.last, station):
+            self.days += 1
+            for column, ranking in self.rankings.items():
+                ranking.push(getattr(day, column), day.date)
+
+    def get_years(self):
+        """
+        Returns the years of the rankings in words
+        Returns:
+            (str):  e.g '2006' or '2004 to 2016'
+        """
+        return get_years_name(self.first.year, self.last.year)
+
+    def get_name(self):
+        """
+        Returns the rankings and years in words
+        Returns:
+            (str):  e.g 'Top 10 days of 2006' or 'Top 5 days of 2004 to 2016'
+        """
+        return f"Top {self.count} days of {self.get_years()}"
+
+    def get_lines(self):
+        """
+        Returns the lines of each ranking, a heading and a line for each day
+        Returns:
+            (list): lines(str) e.g 'Highest:', '1. 45C on June 5, 2006'
+        """
+        lines = []
+        for column, label, unit, _ in self.STATS:
+            lines.append(f"{label}:")
+            for rank, (value, day) in enumerate(self.rankings[column].get_days(), 1):
+                lines.append(
+                    f"{rank}. {value}{unit} on "
+                    f"{day.strftime(FULL_MONTH_NAME)} {day.day}, {day.year}"
+                )
+        return lines
@@ -0,0 +1,224 @@
+"""
+This module computes statistics over windows of days that move one day at a
+time e.g 7 day moving averages. The days are streamed in date order across the
+weather files, each window keeps the sum of its readings so the average is
+updated in O(1) per day, and monotonic deques so its max and min are too.
+A missing reading only leaves a gap in the windows containing its day, it is
+left out of their averages and extremes while a reading of 0 is kept, the
+same rule as the span reports of modules.date_index
+"""
+from collections import deque
+from datetime import date, timedelta
+
+from constants import (
+    FULL_MONTH_NAME,
+    HUMIDITY_UNIT,
+    TEMPERATURE_UNIT,
+    WEATHER_FILES_DIR,
+)
+from modules.cache import load_records
+from modules.data_models import DayData
+from modules.file_index import get_file_index
+from modules.utils import get_window, get_years_name
+
+
+class RollingWindow:
+    """
+    This class holds the readings of a column over the last days
+    """
+
+    def __init__(self, days):
+        """
+        Initializes the members
+        Args:
+            days(int):  number of days in the window
+        """
+        self.days = days
+        # (ordinal, value) of the readings of the window in date order
+        self.values = deque()
+        self.total = 0
+        # readings that may still become the max or min of the window, the
+        # values decrease from the front of maximums and increase in minimums
+        self.maximums = deque()
+        self.minimums = deque()
+
+    def push(self, ordinal, value):
+        """
+        Moves the window to end on a day and adds the day's reading
+        Args:
+            ordinal(int):   ordinal of the day, later than the days already pushed
+            value(int or None): reading of the day or None if it is missing
+        Returns:
+            None
+        """
+        start = ordinal - self.days
+        while self.values and self.values[0][0] <= start:
+            self.total -= self.values.popleft()[1]
+        for extremes in (self.maximums, self.minimums):
+            while extremes and extremes[0][0] <= start:
+                extremes.popleft()
+        if value is None:
+            return
+        self.values.append((ordinal, value))
+        self.total += value
+        while self.maximums and self.maximums[-1][1] <= value:
+            self.maximums.pop()
+        self.maximums.append((ordinal, value))
+        while self.minimums and self.minimums[-1][1] >= value:
+            self.minimums.pop()
+        self.minimums.append((ordinal, value))
+
+    def get_average(self):
+        """
+        Returns the average of the readings in the window, missing readings
+        are left out
+        Returns:
+            (float or None):    average
+                                Or
+                                None if the window has no readings
+        """
+        return self.total / len(self.values) if self.values else None
+
+    def get_max(self):
+        """
+        Returns the max reading in the window
+        Returns:
+            (int or None):  max reading or None if the window has no readings
+        """
+        return self.maximums[0][1] if self.maximums else None
+
+    def get_min(self):
+        """
+        Returns the min reading in the window
+        Returns:
+            (int or None):  min reading or None if the window has no readings
+        """
+        return self.minimums[0][1] if self.minimums else None
+
+
+def stream_days(path, first, last, station=None):
+    """
+    Yields the days of a span in date order, one weather file is read at a time
+    Args:
+        path(str):  Value containing path to weather files e.g 'weatherfiles/'
+        first(date):    first day of the span
+        last(date): last day of the span
+        station(str or None):   station name or None for the first station
+                                having each month
+    Returns:
+        (generator):    DayData objects without lines, days without a date or
+                        repeating an earlier date are left out
+    """
+    index = get_file_index(path)
+    previous = first - timedelta(days=1)
+    for year, month in sorted(index.month_files):
+        if not (first.year, first.month) <= (year, month) <= (last.year, last.month):
+            continue
+        file_path = index.get(year, month, station)
+        if file_path is None:
+            continue
+        records = [record for record in load_records(file_path) if record[0]]
+        for record in sorted(records, key=lambda record: record[0]):
+            if previous < record[0] <= last:
+                previous = record[0]
+                yield DayData(None, record, keep_line=False)
+
+
+def rolling_stats(days, size, columns):
+    """
+    Yields the statistics of the windows ending on each day
+    Args:
+        days(iterable): DayData objects in date order
+        size(int):  number of days in a window
+        columns(list):  names of the DayData members e.g ['max_temperature']
+    Returns:
+        (generator):    (date(date), stats(dict)) tuples, stats has an
+                        (average, max, min) tuple for each column
+    """
+    windows = {column: RollingWindow(size) for column in columns}
+    for day in days:
+        ordinal = day.date.toordinal()
+        for column, window in windows.items():
+            window.push(ordinal, getattr(day, column))
+        yield day.date, {
+            column: (window.get_average(), window.get_max(), window.get_min())
+            for column, window in windows.items()
+        }
+
+
+class RollingData:
+    """
+    This class holds the windows of the days of some years e.g '2005:30', it
+    has the lines of the rolling report
+    """
+
+    # (column, label, unit, position of the extreme in the stats tuple)
+    STATS = [
+        ("max_temperature", "Highest", TEMPERATURE_UNIT, 1),
+        ("min_temperature", "Lowest", TEMPERATURE_UNIT, 2),
+        ("max_humidity", "Humidity", HUMIDITY_UNIT, 1),
+    ]
+
+    def __init__(self, window, path=WEATHER_FILES_DIR):
+        """
+        Initializes the members
+        Args:
+            window(str):    Value containing one or two years and a number of
+                            days e.g '2005:30', '2004:2006:7'
+            path(str):  Value containing path to weather files e.g 'weatherfiles/'
+        """
+        first_year, last_year, self.size = get_window(window)
+        self.first = date(first_year, 1, 1)
+        self.last = date(last_year, 12, 31)
+        self.path = path
+        self.rows = []
+
+    def populate(self, station=None):
+        """
+        Computes the windows ending on each day of the years of a station, the
+        days before the first year are read so the first windows are full
+        Args:
+            station(str or None):   station name or None for the first station
+                                    having each month
+        Returns:
+            None
+        """
+        days = stream_days(
+            self.path, self.first - timedelta(days=self.size - 1), self.last, station
+        )
+        self.rows = [
+            row
+            for row in rolling_stats(days, self.size, [stat[0] for stat in self.STATS])
+            if row[0] >= self.first
+        ]
+
+    def get_name(self):
+        """
+        Returns the windows and years in words
+        Returns:
+            (str):  e.g '30 day windows of 2005' or '7 day windows of 2004 to 2006'
+        """
+        years = get_years_name(self.first.year, self.last.year)
+        return f"{self.size} day windows of {years}"
+
+    def get_lines(self):
+        """
+        Returns a line for each day with the extreme and the average of the
+        window ending on the day, averages are rounded to 1 decimal
+        Returns:
+            (list): lines(str) e.g 'January 7, 2005: Highest 12C avg 9.4C, ...'
+        """
+        lines = []
+        for day, stats in self.rows:
+            values = []
+            for column, label, unit, position in self.STATS:
+                average, extreme = stats[column][0], stats[column][position]
+                if average is None:
+                    values.append(f"{label} -")
+                else:
+                    values.append(f"{label} {extreme}{unit} avg {average:.1f}{unit}")
+            lines.append(
+                f"{day.strftime(FULL_MONTH_NAME)} {day.day}, {day.year}: "
+                + ", ".join(values)
+            )
+        return lines
@@ -0,0 +1,107 @@
+"""
+This module serves reports from a long running process that keeps every
+weather file of a path loaded in memory. A request is one line containing
+report flags e.g '-e 2005 -a 2005/6', the response is the text of the reports.
+Reports are generated on a worker thread so the event loop keeps accepting
+and reading connections during a slow report, the reports themselves are
+generated one at a time as every request shares the planner's store
+"""
+import asyncio
+import io
+import shlex
+import threading
+from contextlib import redirect_stdout
+from getopt import GetoptError, getopt
+
+from constants import ALLOWED_PARAMETERS, LOCALHOST
+from modules.utils import validate_command
+
+
+class WeatherServer:
+    """
+    This class answers report requests from a warm QueryPlanner
+    """
+
+    def __init__(self, planner):
+        """
+        Initializes the planner member
+        Args:
+            planner(QueryPlanner):  planner whose store is shared by all requests
+        """
+        self.planner = planner
+        # held while a request is answered, the store and stdout are shared
+        self.lock = threading.Lock()
+
+    def answer(self, request):
+        """
+        Returns the reports for a request
+        Args:
+            request(str):   line containing report flags e.g '-e 2005 -a 2005/6'
+        Returns:
+            (str):  text printed by the reports or the reason the request is invalid
+        """
+        try:
+            parameters, _ = getopt(shlex.split(request), ALLOWED_PARAMETERS)
+        except (GetoptError, ValueError):
+            return "Invalid flag or no flag argument\n"
+        output = io.StringIO()
+        # validation prints its messages, requests are answered under the
+        # lock so no other request can print while stdout is redirected
+        with self.lock:
+            with redirect_stdout(output):
+                is_valid = all(validate_command(flag, arg) for flag, arg in parameters)
+            if is_valid:
+                self.planner.generate(parameters, output)
+        return output.getvalue()
+
+    async def handle(self, reader, writer):
+        """
+        Answers the request of a client connection and closes it
+        Args:
+            reader(asyncio.StreamReader):   stream reading the request
+            writer(asyncio.StreamWriter):   stream writing the response
+        Returns:
+            None
+        """
+        request = await reader.readline()
+        loop = asyncio.get_running_loop()
+        response = await loop.run_in_executor(None, self.answer, request.decode())
+        writer.write(response.encode())
+        await writer.drain()
+        writer.close()
+
+    async def serve(self, address):
+        """
+        Serves requests until the process is stopped
+        Args:
+            address(str):   port number for a TCP socket on localhost e.g '8765'
+                            Or
+                            path of a Unix socket e.g '/tmp/weatherman.sock'
+        Returns:
+            None
+        """
+        if address.isdigit():
+            server = await asyncio.start_server(self.handle, LOCALHOST, int(address))
+        else:
+            server = await asyncio.start_unix_server(self.handle, address)
+        async with server:
+            await server.serve_forever()
+
+
+def serve(planner, address):
+    """
+    Loads every weather file of the planner's path and serves reports on the address
+    Args:
+        planner(QueryPlanner):  planner holding the path, data classes and workers
+        address(str):   port number or path of a Unix socket
+    Returns:
+        None
+    """
+    planner.load_all()
+    print(f"Serving {len(planner.months)} months of weather data on {address}")
+    try:
+        asyncio.run(WeatherServer(planner).serve(address))
+    except OSError as error:
+        print(f"Could not serve on {address}: {error.strerror}")
+    except KeyboardInterrupt:
+        print("Server stopped")
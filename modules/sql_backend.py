@@ -0,0 +1,140 @@
+"""
+This module provides MonthData and YearData classes for weather databases,
+the sums, counts and extremes of the reports are computed by SQLite with
+aggregate queries on the indexed days table instead of loops over DayData
+"""
+from datetime import date
+
+from constants import COLUMNS, MAX_KEY, MIN_KEY
+from modules.data_models import MonthData, YearData
+from modules.database import open_database
+from modules.file_index import get_file_index
+from modules.summary import EXTREMES, MonthSummary
+
+SUMS_QUERY = (
+    "SELECT station, month, COUNT(*), "
+    + ", ".join(f"COALESCE(SUM({column}), 0)" for column in COLUMNS)
+    + " FROM days WHERE {where} GROUP BY station, month"
+)
+# readings that are 0 or don't beat the default key are skipped like in
+# summary.find_extreme_index, ties keep the first date
+EXTREME_QUERY = """
+    SELECT days.station, days.month, days.{column}, MIN(days.date)
+    FROM days JOIN (
+        SELECT station, month, {aggregate}({column}) AS value
+        FROM days
+        WHERE {where} AND {column} != 0 AND {column} {bound}
+        GROUP BY station, month
+    ) AS extremes
+    ON days.station = extremes.station
+    AND days.month = extremes.month
+    AND days.{column} = extremes.value
+    WHERE days.year = ?
+    GROUP BY days.station, days.month
+"""
+
+
+def get_conditions(year, station=None, month=None):
+    """
+    Returns the WHERE clause selecting the days of a year
+    Args:
+        year(int):  4 digit year e.g 2004
+        station(str or None):   station name or None for every station
+        month(int or None): Number containing value in range 1-12 or None for every month
+    Returns:
+        (tuple):    (where(str), parameters(list)) the clause and the values
+                    of its placeholders
+    """
+    conditions, parameters = ["year = ?"], [year]
+    if station is not None:
+        conditions.append("station = ?")
+        parameters.append(station)
+    if month is not None:
+        conditions.append("month = ?")
+        parameters.append(month)
+    return " AND ".join(conditions), parameters
+
+
+def summarize(database, year, station=None, month=None):
+    """
+    Returns the summaries of the months of a year computed by the database
+    Args:
+        database(Database): database holding the days
+        year(int):  4 digit year e.g 2004
+        station(str or None):   station name or None for every station
+        month(int or None): Number containing value in range 1-12 or None for every month
+    Returns:
+        (dict): {(station(str), month(int)): MonthSummary} of the months having days
+    """
+    where, parameters = get_conditions(year, station, month)
+    summaries = {}
+    for row in database.query(SUMS_QUERY.format(where=where), parameters):
+        # row holds the station, the month, the days and the sums
+        summaries[row[:2]] = MonthSummary(row[2], dict(zip(COLUMNS, row[3:])))
+    for column, find_max in EXTREMES:
+        query = EXTREME_QUERY.format(
+            column=column,
+            aggregate="MAX" if find_max else "MIN",
+            bound=f"> {MAX_KEY}" if find_max else f"< {MIN_KEY}",
+            where=where,
+        )
+        for station_name, month_number, value, day in database.query(
+            query, parameters + [year]
+        ):
+            summaries[(station_name, month_number)].extremes[column] = [
+                value,
+                date.fromisoformat(day).toordinal(),
+            ]
+    return summaries
+
+
+class SqlMonthData(MonthData):
+    """
+    This class holds the days of a month of a database, its summary is
+    computed by the database
+    """
+
+    def get_summary(self):
+        """
+        Returns the summary of the month computed with aggregate queries,
+        months that are not in a database are summarized like in MonthData
+        Returns:
+            (MonthSummary): summary holding the extremes and sums of the month
+        """
+        database = open_database(self.path)
+        if database is None:
+            return super().get_summary()
+        if self.summary is None:
+            index = get_file_index(self.path)
+            stations = index.month_stations.get((int(self.year), self.month), [])
+            station = self.station or (stations[0] if stations else None)
+            summaries = summarize(database, int(self.year), station, self.month)
+            self.summary = summaries.get((station, self.month), MonthSummary())
+        return self.summary
+
+
+class SqlYearData(YearData):
+    """
+    This class holds the month summaries of a year of a database, the days
+    of the year are not read
+    """
+
+    month_data_class = SqlMonthData
+
+    def populate(self):
+        """
+        Initializes the months_data member with the summaries of the months of
+        the year computed with aggregate queries, without a station the first
+        station having each month is used like in MonthData
+        Returns:
+            None
+        """
+        database = open_database(self.path)
+        if database is None:
+            super().populate()
+            return
+        months = {}
+        summaries = summarize(database, int(self.year), self.station)
+        for (_, month), summary in sorted(summaries.items()):
+            months.setdefault(month, summary)
+        self.months_data = [months[month] for month in sorted(months)]
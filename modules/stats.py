@@ -0,0 +1,318 @@
+"""
+This module measures where the time of a run goes. The stages are measured by
+replacing functions and methods with timed wrappers, which only happens when
+--stats is given, so a run without it calls the original functions
+"""
+import cProfile
+import inspect
+import os
+import pstats
+import sys
+import time
+from contextlib import contextmanager
+from copy import copy
+from functools import wraps
+
+from constants import DEFAULT_JOBS, DEFAULT_POOL
+from modules import cache, utils
+from modules.data_models import DayData, MonthData, ReportGenerator, YearData
+from modules.file_index import WeatherFileIndex
+from modules.planner import QueryPlanner
+
+COUNTERS = [
+    "weather files read",
+    "cache files read",
+    "cache misses",
+    "bytes read",
+    "rows parsed",
+    "rows rejected",
+]
+# functions replaced in every module that imported them
+FUNCTIONS = [
+    (utils, "pattern_search"),
+    (utils, "read_data"),
+    (utils, "read_lines"),
+    (utils, "read_rows"),
+    (utils, "map_rows"),
+    (cache, "read_cache"),
+    (cache, "update_columns"),
+]
+# methods replaced on the classes and on the subclasses overriding them
+METHODS = [
+    (WeatherFileIndex, ["populate"]),
+    (QueryPlanner, ["load"]),
+    (DayData, ["populate"]),
+    (
+        MonthData,
+        [
+            "get_max_month_humidity",
+            "get_max_month_temperature",
+            "get_min_month_temperature",
+            "get_max_month_temperature_avg",
+            "get_min_month_temperature_avg",
+            "get_max_month_humidity_avg",
+            "get_month_max_temperatures",
+            "get_month_min_temperatures",
+            "get_month_dates",
+        ],
+    ),
+    (
+        YearData,
+        [
+            "get_max_year_temperature",
+            "get_min_year_temperature",
+            "get_max_year_humidity",
+        ],
+    ),
+    # every report, so the reports added later are measured too
+    (
+        ReportGenerator,
+        [name for name in vars(ReportGenerator) if name.startswith("generate_")],
+    ),
+]
+PROFILE_LINES = 30
+
+
+class Stats:
+    """
+    This class keeps the timers of the stages and the counters of a run
+    """
+
+    def __init__(self):
+        """
+        Initializes the members
+        """
+        # {stage(str): [calls(int), seconds(float)]}
+        self.timers = {}
+        self.counters = dict.fromkeys(COUNTERS, 0)
+
+    def count_file(self, counter, file_path, offset=0):
+        """
+        Counts a file that is read and its bytes
+        Args:
+            counter(str):   name of the counter of the file
+            file_path(str): path of the file
+            offset(int):    offset the file is read from
+        Returns:
+            None
+        """
+        self.counters[counter] += 1
+        try:
+            self.counters["bytes read"] += os.path.getsize(file_path) - offset
+        except OSError:
+            pass
+
+    def count_weather_file(self, *args):
+        """
+        Counts a weather file that is read and its bytes
+        Args:
+            args:   arguments of the reader, the path of the weather file and
+                    the offset it is read from if given
+        Returns:
+            None
+        """
+        self.count_file("weather files read", *args[:2])
+
+    def count_rows(self, schema):
+        """
+        Returns a copy of a schema whose row parsers count the rows
+        Args:
+            schema(Schema or None): schema returned by parser.get_schema
+        Returns:
+            (Schema or None):   counting copy of the schema
+        """
+        if schema is None:
+            return None
+        schema = copy(schema)
+        schema.parse_row = self.count_parsed(schema.parse_row)
+        schema.parse_bytes = self.count_parsed(schema.parse_bytes)
+        return schema
+
+    def count_parsed(self, parse):
+        """
+        Returns a wrapper of a row parser counting the parsed and rejected rows
+        Args:
+            parse(function):    row parser of a schema
+        Returns:
+            (function): wrapper of the parser
+        """
+        counters = self.counters
+
+        def parse_row(line):
+            row = parse(line)
+            counters["rows parsed" if row is not None else "rows rejected"] += 1
+            return row
+
+        return parse_row
+
+    def time(self, name, function, before=None):
+        """
+        Returns a wrapper of a function that adds the time spent in it to a
+        stage, the time of a generator is the time spent producing its items
+        Args:
+            name(str):  name of the stage
+            function(function): function to measure
+            before(function or None):   function called with the arguments of each call
+        Returns:
+            (function): wrapper of the function
+        """
+        timer = self.timers.setdefault(name, [0, 0.0])
+
+        if inspect.isgeneratorfunction(function):
+
+            @wraps(function)
+            def timed_generator(*args, **kwargs):
+                if before is not None:
+                    before(*args)
+                timer[0] += 1
+                start = time.perf_counter()
+                iterator = function(*args, **kwargs)
+                for item in iterator:
+                    timer[1] += time.perf_counter() - start
+                    yield item
+                    start = time.perf_counter()
+                timer[1] += time.perf_counter() - start
+
+            return timed_generator
+
+        @wraps(function)
+        def timed(*args, **kwargs):
+            if before is not None:
+                before(*args)
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                timer[0] += 1
+                timer[1] += time.perf_counter() - start
+
+        return timed
+
+    def time_read_cache(self, function):
+        """
+        Returns a wrapper of cache.read_cache counting hits and misses
+        Args:
+            function(function): cache.read_cache
+        Returns:
+            (function): wrapper of the function
+        """
+
+        @wraps(function)
+        def counted(file_path):
+            cached = function(file_path)
+            if cached is None:
+                self.counters["cache misses"] += 1
+            else:
+                self.count_file("cache files read", cache.get_cache_path(file_path))
+            return cached
+
+        return self.time(function.__qualname__, counted)
+
+    def install(self):
+        """
+        Replaces the functions and methods of the stages with measured wrappers
+        Returns:
+            None
+        """
+        for module, name in FUNCTIONS:
+            function = getattr(module, name)
+            if function is cache.read_cache:
+                wrapper = self.time_read_cache(function)
+            else:
+                reads_file = name in ("read_lines", "read_rows", "map_rows")
+                before = self.count_weather_file if reads_file else None
+                wrapper = self.time(function.__qualname__, function, before)
+            replace(function, wrapper)
+        get_schema = utils.get_schema
+        replace(get_schema, lambda header: self.count_rows(get_schema(header)))
+        for base_class, names in METHODS:
+            for data_class in [base_class] + get_subclasses(base_class):
+                for name in names:
+                    if name in vars(data_class):
+                        method = vars(data_class)[name]
+                        stage = f"{data_class.__name__}.{name}"
+                        setattr(data_class, name, self.time(stage, method))
+
+    def get_summary(self):
+        """
+        Returns the summary of the timers and counters
+        Returns:
+            (str):  text containing a line for each stage that was called and
+                    for each counter
+        """
+        lines = [
+            f"{'Stage (seconds include inner stages)':<48} {'Calls':>7} {'Seconds':>10}"
+        ]
+        for name, (calls, seconds) in sorted(
+            self.timers.items(), key=lambda item: -item[1][1]
+        ):
+            if calls:
+                lines.append(f"{name:<48} {calls:>7} {seconds:>10.6f}")
+        lines.append("")
+        for name, value in self.counters.items():
+            lines.append(f"{name:<48} {value:>18}")
+        return "\n".join(lines)
+
+
+def get_subclasses(base_class):
+    """
+    Returns every subclass of a class that has been imported
+    Args:
+        base_class(type):   class e.g MonthData
+    Returns:
+        (list): list of classes
+    """
+    subclasses = []
+    for subclass in base_class.__subclasses__():
+        subclasses += [subclass] + get_subclasses(subclass)
+    return subclasses
+
+
+def replace(function, wrapper):
+    """
+    Replaces a function with a wrapper in every module of the package that imported it
+    Args:
+        function(function): original function
+        wrapper(function):  function used instead
+    Returns:
+        None
+    """
+    for name, module in list(sys.modules.items()):
+        if not name.startswith("modules."):
+            continue
+        for attribute, value in list(vars(module).items()):
+            if value is function:
+                setattr(module, attribute, wrapper)
+
+
+@contextmanager
+def measure(settings):
+    """
+    Measures the code run inside the context as asked by the settings and
+    prints the results to stderr when it ends, nothing is replaced if neither
+    --stats nor --profile is given
+    Args:
+        settings(dict): {long_flag(str): argument(str)}
+    Returns:
+        (Generator):    context manager
+    """
+    stats = Stats() if "--stats" in settings else None
+    profile = cProfile.Profile() if "--profile" in settings else None
+    if stats is not None:
+        stats.install()
+    if profile is not None:
+        profile.enable()
+    try:
+        yield
+    finally:
+        if profile is not None:
+            profile.disable()
+            profile_stats = pstats.Stats(profile, stream=sys.stderr)
+            profile_stats.sort_stats("cumulative").print_stats(PROFILE_LINES)
+        if stats is not None:
+            print(stats.get_summary(), file=sys.stderr)
+            jobs = int(settings.get("--jobs", DEFAULT_JOBS))
+            if jobs > 1 and settings.get("--pool", DEFAULT_POOL) == "process":
+                print(
+                    "Files loaded by worker processes are not counted", file=sys.stderr
+                )
@@ -0,0 +1,384 @@
+"""
+This module keeps a persistent table with a summary row for each weather file,
+holding the extremes of the month with their dates and the sums needed for the
+averages. Year and multi year extremes are combined from these rows without
+reading the daily data again
+"""
+import atexit
+import json
+import os
+from datetime import date
+
+from constants import (
+    CACHE_DIR_NAME,
+    COLUMNS,
+    HUMIDITY_UNIT,
+    MAX_KEY,
+    MIN_KEY,
+    TEMPERATURE_UNIT,
+)
+from modules.cache import MAGIC, MISSING, get_file_key, update_columns
+from modules.file_index import get_file_index, parse_file_name
+
+SUMMARY_FILE_NAME = "summaries.json"
+# (column, find_max) of the extremes used by the reports
+EXTREMES = [
+    ("max_temperature", True),
+    ("min_temperature", False),
+    ("max_humidity", True),
+]
+_tables = {}
+
+
+def find_extreme_index(values, find_max):
+    """
+    Returns the index of the first max or min reading, readings that are
+    missing or 0 are skipped like the `value or -1000` keys of MonthData
+    Args:
+        values(array or list):  readings containing cache.MISSING for missing readings
+        find_max(bool): True for max, False for min
+    Returns:
+        (int or None):  index of the reading
+                        Or
+                        None if no reading beats the default key
+    """
+    default_key = MAX_KEY if find_max else MIN_KEY
+    keys = [default_key if value in (0, MISSING) else value for value in values]
+    if not keys:
+        return None
+    extreme = max(keys) if find_max else min(keys)
+    if extreme == default_key or (extreme > default_key) != find_max:
+        return None
+    return keys.index(extreme)
+
+
+class MonthSummary:
+    """
+    This class holds the summary of a month, it has the aggregate methods of
+    MonthData so YearData can combine summaries instead of months
+    """
+
+    __slots__ = ("days", "sums", "extremes")
+
+    def __init__(self, days=0, sums=None, extremes=None):
+        """
+        Initializes the members
+        Args:
+            days(int):  number of days in the month's file
+            sums(dict or None): {column(str): sum of the readings(int)}
+            extremes(dict or None): {column(str): [value(int or None), date ordinal(int)]}
+                                    value is None if no reading beats the default key
+        """
+        self.days = days
+        self.sums = sums or dict.fromkeys(COLUMNS, 0)
+        self.extremes = extremes or {column: [None, 0] for column, _ in EXTREMES}
+
+    @classmethod
+    def from_columns(cls, columns):
+        """
+        Returns the summary of the columns of a weather file
+        Args:
+            columns(list):  list of arrays in the format returned by cache.load_columns
+        Returns:
+            (MonthSummary): summary of the columns
+        """
+        values = dict(zip(COLUMNS, columns[1:]))
+        sums = {
+            column: sum(value for value in values[column] if value != MISSING)
+            for column in COLUMNS
+        }
+        extremes = {}
+        for column, find_max in EXTREMES:
+            index = find_extreme_index(values[column], find_max)
+            if index is None:
+                extremes[column] = [None, 0]
+            else:
+                extremes[column] = [values[column][index], columns[0][index]]
+        return cls(len(columns[0]), sums, extremes)
+
+    def extend(self, later):
+        """
+        Returns the summary of the rows of this summary followed by the rows of
+        another one, an extreme of the later rows only wins if it is strictly
+        better so ties keep the first date like MonthData
+        Args:
+            later(MonthSummary):    summary of the rows appended after these rows
+        Returns:
+            (MonthSummary): summary of all the rows
+        """
+        sums = {column: self.sums[column] + later.sums[column] for column in COLUMNS}
+        extremes = {}
+        for column, find_max in EXTREMES:
+            value, later_value = self.extremes[column][0], later.extremes[column][0]
+            is_better = later_value is not None and (
+                value is None
+                or (later_value > value if find_max else later_value < value)
+            )
+            extremes[column] = list(
+                later.extremes[column] if is_better else self.extremes[column]
+            )
+        return MonthSummary(self.days + later.days, sums, extremes)
+
+    def to_dict(self):
+        """
+        Returns the summary as a dictionary that can be written as JSON
+        Returns:
+            (dict): {"days": days, "sums": sums, "extremes": extremes}
+        """
+        return {"days": self.days, "sums": self.sums, "extremes": self.extremes}
+
+    def get_extreme(self, column, find_max):
+        """
+        Returns the extreme of a column in the format of the MonthData methods
+        Args:
+            column(str):    name of the column e.g 'max_temperature'
+            find_max(bool): True for max, False for min
+        Returns:
+            (dict): {
+                        'value'(int or None): reading or None if no data,
+                        'date'(date):   date object
+                    }
+        """
+        if not self.days:
+            return {"value": None}
+        value, ordinal = self.extremes[column]
+        if value is None:
+            return {"value": MAX_KEY if find_max else MIN_KEY, "date": ""}
+        return {"value": value, "date": date.fromordinal(ordinal) if ordinal else None}
+
+    def get_average(self, column, unit):
+        """
+        Returns the average of a column rounded to 0 decimals, missing readings
+        count as 0 like in MonthData
+        Args:
+            column(str):    name of the column e.g 'max_temperature'
+            unit(str):  unit appended to the average
+        Returns:
+            (str or None):  average with unit or None if there are no days
+        """
+        if not self.days:
+            return None
+        return f"{round(self.sums[column] / self.days)}{unit}"
+
+    def get_max_month_humidity(self):
+        """
+        Returns the max humidity for the whole month with respective date
+        Returns:
+            same as MonthData.get_max_month_humidity
+        """
+        return self.get_extreme("max_humidity", True)
+
+    def get_max_month_temperature(self):
+        """
+        Returns the max highest temperature for the whole month with respective date
+        Returns:
+            same as MonthData.get_max_month_temperature
+        """
+        return self.get_extreme("max_temperature", True)
+
+    def get_min_month_temperature(self):
+        """
+        Returns the min lowest temperature for the whole month with respective date
+        Returns:
+            same as MonthData.get_min_month_temperature
+        """
+        return self.get_extreme("min_temperature", False)
+
+    def get_max_month_temperature_avg(self):
+        """
+        Returns the average highest_temperature rounded to 0 decimals
+        Returns:
+            same as MonthData.get_max_month_temperature_avg
+        """
+        if not self.days:
+            return {"value": None}
+        return self.get_average("max_temperature", TEMPERATURE_UNIT)
+
+    def get_min_month_temperature_avg(self):
+        """
+        Returns the average lowest_temperature rounded to 0 decimals
+        Returns:
+            same as MonthData.get_min_month_temperature_avg
+        """
+        return self.get_average("min_temperature", TEMPERATURE_UNIT)
+
+    def get_max_month_humidity_avg(self):
+        """
+        Returns the average max humidity rounded to 0 decimals
+        Returns:
+            same as MonthData.get_max_month_humidity_avg
+        """
+        return self.get_average("max_humidity", HUMIDITY_UNIT)
+
+
+class SummaryTable:
+    """
+    This class holds the summaries of the weather files in a directory and
+    keeps them in a JSON file next to the binary cache
+    """
+
+    def __init__(self, path):
+        """
+        Initializes the members and calls populate to read the table
+        Args:
+            path(str):  Value containing path to weather files e.g 'weatherfiles/'
+        """
+        self.path = path
+        self.table_path = os.path.join(path, CACHE_DIR_NAME, SUMMARY_FILE_NAME)
+        self.rows = {}
+        self.changed = False
+        self.populate()
+
+    def populate(self):
+        """
+        Fills rows with {file_name: [file_key(list), MonthSummary]} from the table file
+        Returns:
+            None
+        """
+        try:
+            with open(self.table_path, "r", encoding="utf-8") as file:
+                rows = json.load(file)
+        except (OSError, ValueError):
+            return
+        for name, (file_key, summary) in rows.items():
+            self.rows[name] = [file_key, MonthSummary(**summary)]
+
+    def get(self, file_path, get_columns=None):
+        """
+        Returns the summary of a weather file, it is only computed if the file
+        has changed since its row was written and only from the new rows if
+        the file has grown since then
+        Args:
+            file_path(str): path to a weather file e.g 'weatherfiles/Murree_weather_2004_Aug.txt'
+            get_columns(callable or None):  returns the columns of the file
+                                            already loaded by the caller in the
+                                            format returned by cache.load_columns,
+                                            it is only called if the row has to
+                                            be computed and the file is not read
+                                            again
+                                            Or
+                                            None to read the file if needed
+        Returns:
+            (MonthSummary): summary of the file
+        """
+        name = os.path.basename(file_path)
+        # rows computed by an older version of the parser are computed again
+        file_key = [*get_file_key(file_path), MAGIC.decode()]
+        row = self.rows.get(name)
+        if row is not None and row[0] == file_key:
+            return row[1]
+        if get_columns is not None:
+            row = [file_key, MonthSummary.from_columns(get_columns())]
+        else:
+            columns, *keys, kept_rows = update_columns(file_path)
+            file_key, previous_key = [
+                [*key, MAGIC.decode()] if key else None for key in keys
+            ]
+            if row is not None and row[0] == previous_key and row[1].days == kept_rows:
+                later = MonthSummary.from_columns(
+                    [column[kept_rows:] for column in columns]
+                )
+                summary = row[1].extend(later)
+            else:
+                summary = MonthSummary.from_columns(columns)
+            row = [file_key, summary]
+        self.rows[name] = row
+        self.changed = True
+        return row[1]
+
+    def rollup(self, first_year, last_year, station=None):
+        """
+        Returns the summaries of every month in a range of years
+        Args:
+            first_year(int):    first year of the range e.g 2004
+            last_year(int): last year of the range e.g 2016
+            station(str or None):   station name or None for the first station
+                                    having each month
+        Returns:
+            (list): list of MonthSummary objects of the months having days
+        """
+        index = get_file_index(self.path)
+        summaries = []
+        for year in range(first_year, last_year + 1):
+            for month in index.get_months(year, station):
+                summary = self.get(index.get(year, month, station))
+                if summary.days:
+                    summaries.append(summary)
+        return summaries
+
+    def update(self, rows):
+        """
+        Adds rows computed by another process, e.g a worker of a pool
+        Args:
+            rows(dict): {file_name: [file_key(list), MonthSummary]}
+        Returns:
+            None
+        """
+        for name, row in rows.items():
+            if name not in self.rows or self.rows[name][0] != row[0]:
+                self.rows[name] = row
+                self.changed = True
+
+    def save(self):
+        """
+        Writes the table file if a row has changed. Failures are ignored as
+        the table is only an optimization
+        Returns:
+            None
+        """
+        if not self.changed:
+            return
+        rows = {
+            name: [key, summary.to_dict()] for name, (key, summary) in self.rows.items()
+        }
+        temporary_path = f"{self.table_path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.table_path), exist_ok=True)
+            with open(temporary_path, "w", encoding="utf-8") as file:
+                json.dump(rows, file)
+            os.replace(temporary_path, self.table_path)
+            self.changed = False
+        except OSError:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+
+
+def get_summary_table(path):
+    """
+    Returns the summary table of a directory, it is read the first time and
+    written when the program exits
+    Args:
+        path(str):  Value containing path to weather files e.g 'weatherfiles/'
+    Returns:
+        (SummaryTable): summary table of the directory
+    """
+    if path not in _tables:
+        _tables[path] = SummaryTable(path)
+        atexit.register(_tables[path].save)
+    return _tables[path]
+
+
+def summarize_station(path, station, first_year, last_year):
+    """
+    Returns the summary of every month of a station in a range of years, the
+    months are combined in order so ties keep the first date
+    Args:
+        path(str):  Value containing path to weather files e.g 'weatherfiles/'
+        station(str):   station name e.g 'Murree'
+        first_year(int):    first year of the range e.g 2004
+        last_year(int): last year of the range e.g 2016
+    Returns:
+        (tuple):    (summary(MonthSummary), rows(dict)) the summary of the station
+                    and the rows of the summary table for its weather files,
+                    so a worker process can hand them to the main process
+    """
+    table = get_summary_table(path)
+    summary = MonthSummary()
+    for month_summary in table.rollup(first_year, last_year, station):
+        summary = summary.extend(month_summary)
+    rows = {
+        name: row
+        for name, row in table.rows.items()
+        if (parse_file_name(name) or [None])[0] == station
+    }
+    return summary, rows
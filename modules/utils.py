@@ -2,50 +2,53 @@
 This module contains functions that are used frequently
 at multiple places in the application
 """
-# pylint:disable= global-statement
-import glob
+import io
+import mmap
 from datetime import date
 
 from constants import FULL_MONTH_NAME, validators
-from modules.validators import is_month, is_year, is_year_month
+from modules import validators as validator_functions
+from modules.file_index import get_file_index, is_plain_file
+from modules.parser import DEFAULT_SCHEMA, get_schema
+from modules.validators import (
+    is_date_range,
+    is_month,
+    is_window,
+    is_year,
+    is_year_month,
+    is_year_range,
+)
 
-DATE_INDEX = None
-MAX_TEMPERATURE_INDEX = None
-MIN_TEMPERATURE_INDEX = None
-MAX_HUMIDITY_INDEX = None
-MEAN_HUMIDITY_INDEX = None
+
+def open_text(file_path):
+    """
+    Opens a weather file for reading text, files that are compressed or in a
+    bundle are opened by compressed.open_text
+    Args:
+        file_path(str): path to a weather file e.g 'weatherfiles/Murree_weather_2004_Aug.txt'
+    Returns:
+        (stream):   text stream of the file
+    """
+    if is_plain_file(file_path):
+        return open(file_path, "r", encoding="utf-8")
+    # pylint: disable=import-outside-toplevel
+    from modules.compressed import open_text as open_compressed_text
+
+    return open_compressed_text(file_path)
 
 
-def initialize_indexes(path):
+def read_schema(file_path):
     """
-    Initializes the indexes from a file in the path
+    Returns the schema of a weather file detected from its header
     Args:
-        path(str): Value containing path to weather files like 'weatherfiles/'
+        file_path(str): path to a weather file e.g 'weatherfiles/Murree_weather_2004_Aug.txt'
     Returns:
-        (int or None):  0 if indexes are initialized
-                        Or
-                        None if no files exist in the path
+        (Schema or None):   schema of the file
+                            Or
+                            None if the header lacks a needed column
     """
-    files = glob.glob(f"{path}*")
-    if not files:
-        return None
-    with open(files[0], "r") as file:
-        first_line = file.readline()
-    fields = first_line.split("\n")[0].split(",")
-    global DATE_INDEX, MIN_TEMPERATURE_INDEX, MAX_TEMPERATURE_INDEX
-    global MAX_HUMIDITY_INDEX, MEAN_HUMIDITY_INDEX
-    for index, field in enumerate(fields):
-        if field == "PKT":
-            DATE_INDEX = index
-        elif field == "Max TemperatureC":
-            MAX_TEMPERATURE_INDEX = index
-        elif field == "Min TemperatureC":
-            MIN_TEMPERATURE_INDEX = index
-        elif field == "Max Humidity":
-            MAX_HUMIDITY_INDEX = index
-        elif field == " Mean Humidity":
-            MEAN_HUMIDITY_INDEX = index
-    return 0
+    with open_text(file_path) as file:
+        return get_schema(file.readline())
 
 
 def validate_command(flag, flag_input):
@@ -60,7 +63,7 @@ def validate_command(flag, flag_input):
     """
     is_valid = False
     if flag in validators:
-        if validators[flag](flag_input):
+        if getattr(validator_functions, validators[flag])(flag_input):
             is_valid = True
         else:
             print(f"Invalid flag argument '{flag_input}' for flag '{flag}'")
@@ -80,47 +83,187 @@ def parse_line(line):
     return line.split("\n")[0].split(",")
 
 
-def pattern_search(pattern, path):
+def pattern_search(pattern, path, station=None):
     """
     This function returns all the files in the given path that match the pattern given
     Args:
         pattern(str): a string which contains any pattern e.g '2006', '2007', '2005/6', etc
         path(str): a value containing path like: 'weatherfiles/'
+        station(str or None):   station name to only search its weather files
     Returns:
         (list or None): path to all the files matching the pattern
                         Or
                         None if no files found
     """
-    return glob.glob(path + f"*{pattern}*")
+    return get_file_index(path).search(pattern, station)
 
 
-def read_data(pattern, path):
+def read_data(pattern, path, station=None):
     """
     This function reads data from the files in the given path that match the pattern
     Args:
         pattern(str): value containing 4 digit year like '2002', '2003', '2004', etc
         path(str): value containing path like: 'weatherfiles/'
+        station(str or None):   station name to only read its weather files
     Returns:
         (Generator or list):
-            Generator object containing all lines of a file
+            Generator object containing an iterator over the lines of each file,
+            lines are read lazily so each iterator must be consumed before
+            the next one is requested
             Or
             empty list if no file exists for a given year
     """
-    files = pattern_search(pattern, path)
+    files = pattern_search(pattern, path, station)
     if not files:
         yield []
     for i in files:
-        with open(i, "r") as file:
-            # skip first line as it contains field names
-            yield file.readlines()[1:]
+        yield read_lines(i)
+
+
+def read_lines(file_path):
+    """
+    Lazily reads the lines of a weather file, one line is kept in memory at a
+    time, compressed files are decompressed while they are read
+    Args:
+        file_path(str): path to a weather file e.g 'weatherfiles/Murree_weather_2004_Aug.txt'
+    Returns:
+        (Generator):    Generator object yielding each line(str) after the header
+    """
+    with open_text(file_path) as file:
+        # skip first line as it contains field names
+        next(file, None)
+        yield from file
+
+
+def get_record(line, schema=DEFAULT_SCHEMA):
+    """
+    Returns the values of a parsed line that are used by the reports
+    Args:
+        line(list): a list of strings containing different fields at different index
+                    please have a look at any weatherfile for more clarity
+        schema(Schema): positions of the fields in the line
+    Returns:
+        (tuple):    (date, highest_temperature, lowest_temperature,
+                    max_humidity, mean_humidity)
+    """
+    return (
+        get_date(line, schema),
+        get_highest_temperature(line, schema),
+        get_lowest_temperature(line, schema),
+        get_max_humidity(line, schema),
+        get_mean_humidity(line, schema),
+    )
+
+
+def parse_row(line, schema=DEFAULT_SCHEMA):
+    """
+    Parses a raw line read from weather file to a row with the fast parser
+    Args:
+        line(str):   raw line read from weather file
+        schema(Schema): positions of the fields in the line
+    Returns:
+        (tuple or None):    (ordinal, highest_temperature, lowest_temperature,
+                            max_humidity, mean_humidity)
+                            Or
+                            None if the line does not have all the fields
+    """
+    return schema.parse_row(line)
+
+
+def row_to_record(row):
+    """
+    Converts a row returned by parse_row to a record
+    Args:
+        row(tuple): row containing the ordinal of the date
+    Returns:
+        (tuple):    values in the format returned by get_record
+    """
+    return (date.fromordinal(row[0]) if row[0] else None,) + tuple(row[1:])
+
+
+def read_rows(file_path):
+    """
+    Lazily reads a weather file and parses each of its lines with the parser
+    compiled for its header, lines that don't have all the fields are skipped
+    Args:
+        file_path(str): path to a weather file e.g 'weatherfiles/Murree_weather_2004_Aug.txt'
+    Returns:
+        (Generator):    Generator object yielding the rows returned by parse_row,
+                        nothing if the header lacks a needed column
+    """
+    with open_text(file_path) as file:
+        schema = get_schema(file.readline())
+        if schema is None:
+            return
+        parse = schema.parse_row
+        for line in file:
+            row = parse(line)
+            if row is not None:
+                yield row
+
+
+def map_rows(file_path, offset=0, progress=None):
+    """
+    Lazily parses a weather file mapped into memory. The lines are parsed as
+    bytes, so nothing is decoded or copied into a file buffer and the pages
+    are read straight from the OS page cache. Compressed weather files are
+    decompressed into memory and parsed the same way. Lines that don't have
+    all the fields are skipped
+    Args:
+        file_path(str): path to a weather file e.g 'weatherfiles/Murree_weather_2004_Aug.txt'
+        offset(int):    byte offset of the first line parsed, it must be the
+                        start of a line, the header is never parsed as a row
+        progress(dict or None): filled when the file has been parsed with
+                                'end' the offset after the last complete line and
+                                'complete_rows' the rows yielded from complete lines
+    Returns:
+        (Generator):    Generator object yielding the rows returned by parse_row,
+                        nothing if the file is empty or the header lacks a needed column
+    """
+    content = None
+    if not is_plain_file(file_path):
+        # pylint: disable=import-outside-toplevel
+        from modules.compressed import read_compressed
+
+        content = read_compressed(file_path)
+    if content is not None:
+        # BytesIO reads the lines and content is searched like the mapped file
+        buffer = io.BytesIO(content)
+    else:
+        with open(file_path, "rb") as file:
+            try:
+                buffer = content = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # empty files can't be mapped
+                return
+    with buffer:
+        schema = get_schema(buffer.readline().decode("ascii", "replace"))
+        if schema is None:
+            return
+        start = max(offset, buffer.tell())
+        # a line without a newline may still be being written
+        end = content.rfind(b"\n", start) + 1 or start
+        buffer.seek(start)
+        parse = schema.parse_bytes
+        rows = 0
+        row = None
+        for line in iter(buffer.readline, b""):
+            row = parse(line)
+            if row is not None:
+                rows += 1
+                yield row
+        if progress is not None:
+            partial = end < len(content) and row is not None
+            progress.update(end=end, complete_rows=rows - partial)
 
 
-def get_date(line):
+def get_date(line, schema=DEFAULT_SCHEMA):
     """
     Returns the date from the line read of a weather file
     Args:
         line(list): a list of strings containing different fields at different index
                     please have a look at any weatherfile for more clarity
+        schema(Schema): positions of the fields in the line
     Returns:
          (date or None):    date object
                             OR
@@ -128,76 +271,80 @@ def get_date(line):
     """
     try:
         # split into [yyyy, mm, dd] then convert to int and return date object
-        return date(*[int(i) for i in line[DATE_INDEX].split("-")])
+        return date(*[int(i) for i in line[schema.date_index].split("-")])
     except IndexError:
         return None
 
 
-def get_highest_temperature(line):
+def get_highest_temperature(line, schema=DEFAULT_SCHEMA):
     """
     Returns the highest temperature from the line read of a weather file
     Args:
         line(list): a list of strings containing different fields at different index
                     please have a look at any weatherfile for more clarity
+        schema(Schema): positions of the fields in the line
     Returns:
          (int or None): highest temperature
                         OR
                         None if there is no entry
     """
     try:
-        highest_temperature = int(line[MAX_TEMPERATURE_INDEX])
+        highest_temperature = int(line[schema.value_indexes[0]])
         return highest_temperature
     except ValueError:
         return None
 
 
-def get_lowest_temperature(line):
+def get_lowest_temperature(line, schema=DEFAULT_SCHEMA):
     """
     Returns the lowest temperature from the line read of a weather file
     Args:
         line(list): a list of strings containing different fields at different index
                     please have a look at any weatherfile for more clarity
+        schema(Schema): positions of the fields in the line
     Returns:
           (int or None):    lowest temperature
                             OR
                             None if there is no entry
     """
     try:
-        return int(line[MIN_TEMPERATURE_INDEX])
+        return int(line[schema.value_indexes[1]])
     except ValueError:
         return None
 
 
-def get_max_humidity(line):
+def get_max_humidity(line, schema=DEFAULT_SCHEMA):
     """
     Returns the maximum humidity from the line read of a weather file
     Args:
         line(list): a list of strings containing different fields at different index
                     please have a look at any weatherfile for more clarity
+        schema(Schema): positions of the fields in the line
     Returns:
           (int or None):    max humidity
                             Or
                             None if there is no entry or wrong entry
     """
     try:
-        return int(line[MAX_HUMIDITY_INDEX])
+        return int(line[schema.value_indexes[2]])
     except ValueError:
         return None
 
 
-def get_mean_humidity(line):
+def get_mean_humidity(line, schema=DEFAULT_SCHEMA):
     """
     Returns the mean humidity from the line read of a weather file
     Args:
         line(list): a list of strings containing different fields at different index
                     please have a look at any weatherfile for more clarity
+        schema(Schema): positions of the fields in the line
     Returns:
           (int or None):    mean humidity
                             Or
                             None if there is no entry or wrong entry
     """
     try:
-        return int(line[MEAN_HUMIDITY_INDEX])
+        return int(line[schema.value_indexes[3]])
     except ValueError:
         return None
 
@@ -267,3 +414,65 @@ def get_year_month(year_month):
         year, month = year_month.split("/")
         return get_year(year), get_month(month)
     return None
+
+
+def get_year_range(year_range):
+    """
+    Returns a tuple containing the first and the last year of a range
+    Args:
+        year_range(str):    Value containing two 4 digit years like '2004:2016'
+    Returns:
+        (tuple or None):    A tuple containing first_year(int) and last_year(int)
+                            Or
+                            None if year_range is not in right format
+    """
+    if is_year_range(year_range):
+        first_year, last_year = year_range.split(":")
+        return int(first_year), int(last_year)
+    return None
+
+
+def get_date_range(date_range):
+    """
+    Returns a tuple containing the first and the last date of a range
+    Args:
+        date_range(str):    Value containing two dates like '2005-11-15:2006-02-10'
+    Returns:
+        (tuple or None):    A tuple containing first_date(date) and last_date(date)
+                            Or
+                            None if date_range is not in right format
+    """
+    if is_date_range(date_range):
+        return tuple(date(*map(int, text.split("-"))) for text in date_range.split(":"))
+    return None
+
+
+def get_window(window):
+    """
+    Returns a tuple containing the years and the days of rolling windows
+    Args:
+        window(str):    Value containing one or two years and a number of days
+                        like '2005:30' or '2004:2006:7'
+    Returns:
+        (tuple or None):    A tuple containing first_year(int), last_year(int) and days(int)
+                            Or
+                            None if window is not in right format
+    """
+    if is_window(window):
+        numbers = [int(number) for number in window.split(":")]
+        return numbers[0], numbers[-2], numbers[-1]
+    return None
+
+
+def get_years_name(first_year, last_year):
+    """
+    Returns a range of years in words
+    Args:
+        first_year(int):    4 digit year e.g 2004
+        last_year(int): 4 digit year, the same as first_year for a single year
+    Returns:
+        (str):  e.g '2005' or '2004 to 2016'
+    """
+    if last_year == first_year:
+        return f"{first_year}"
+    return f"{first_year} to {last_year}"
@@ -2,6 +2,61 @@
 This module provides validators that verify the values of variables
 """
 import re
+from datetime import date
+
+# {name: (pattern(str), flags(int))} of the validators, a pattern is compiled
+# the first time it is matched so a run only compiles the patterns it uses
+PATTERNS = {
+    "year": (
+        """
+        [1-9]       # starting character must be in range 1-9
+        \\d{3}\\b   # must end with 3 digits(0-9)
+        """,
+        re.VERBOSE,
+    ),
+    "month": (
+        """
+        0?[1-9]\\b  # 0 is optional but must end with a digit(1-9)
+        |           # or
+        1[0-2]\\b   # start with 1 and end with digit(0-2)
+        """,
+        re.VERBOSE,
+    ),
+    "year_month": (
+        """
+        [1-9]       # starting character must be in range 1-9
+        \\d{3}\\b   # must end with 3 digits(0-9)
+        /           # followed by a slash
+        0?[1-9]\\b  # 0 is optional but must end with a digit(1-9)
+        |           # or
+        1[0-2]\\b   # start with 1 and end with digit(0-2)
+        """,
+        re.VERBOSE,
+    ),
+    "year_range": (r"[1-9]\d{3}:[1-9]\d{3}$", 0),
+    "positive_number": (r"0*[1-9]\d*$", 0),
+    "station": (r"[^/\\]+$", 0),
+    "date_range": (r"(\d{4})-(\d{1,2})-(\d{1,2}):(\d{4})-(\d{1,2})-(\d{1,2})$", 0),
+    "window": (r"([1-9]\d{3})(?::([1-9]\d{3}))?:(\d+)$", 0),
+}
+
+# {name: compiled pattern}
+_regexes = {}
+
+
+def match(name, value):
+    """
+    Matches the start of a value with a pattern of PATTERNS, the pattern is
+    compiled on its first use
+    Args:
+        name(str):  name of the pattern e.g 'year'
+        value(str): Value to match
+    Returns:
+        (Match or None):    match object if the value matches the pattern
+    """
+    if name not in _regexes:
+        _regexes[name] = re.compile(*PATTERNS[name])
+    return _regexes[name].match(value)
 
 
 def is_year(year):
@@ -14,11 +69,7 @@ def is_year(year):
         (boolean):  True if year contains 4 digit year
                     False if year does not contain 4 digit year
     """
-    regex = """
-            [1-9]       # starting character must be in range 1-9
-            \\d{3}\\b   # must end with 3 digits(0-9)
-    """
-    return isinstance(year, str) and re.match(regex, year, re.VERBOSE)
+    return isinstance(year, str) and match("year", year)
 
 
 def is_month(month):
@@ -31,12 +82,7 @@ def is_month(month):
         (boolean):  True if month contains digits(1-9 or 01-12)
                     False if it does not contain digits(01-12 or 1-9)
     """
-    regex = """
-           0?[1-9]\\b  # 0 is optional but must end with a digit(1-9)
-           |           # or
-           1[0-2]\\b   # start with 1 and end with digit(0-2)
-    """
-    return isinstance(month, str) and re.match(regex, month, re.VERBOSE)
+    return isinstance(month, str) and match("month", month)
 
 
 def is_year_month(year_month):
@@ -49,13 +95,177 @@ def is_year_month(year_month):
         (boolean):  True if year_month contains year and month
                     False if year_month is not in correct format
     """
+    return isinstance(year_month, str) and match("year_month", year_month)
+
+
+def is_year_range(year_range):
+    """
+    Checks if year_range contains two 4 digit years separated by a colon,
+    the first not after the second e.g '2004:2016'
+    Args:
+        year_range(str): Value containing the first and the last year
+    Returns:
+        (boolean):  True if year_range contains two years in order
+                    False if year_range is not in correct format
+    """
+    if not isinstance(year_range, str) or not match("year_range", year_range):
+        return False
+    first_year, last_year = year_range.split(":")
+    return int(first_year) <= int(last_year)
+
+
+def is_year_or_year_range(value):
+    """
+    Checks if value contains a 4 digit year or a range of years
+    e.g '2004', '2004:2016'
+    Args:
+        value(str): Value containing a year or a range of years
+    Returns:
+        (boolean):  True if value contains a year or a range of years
+                    False otherwise
+    """
+    # is_year also matches the first year of a range, so a value with a colon
+    # must be a range
+    if isinstance(value, str) and ":" in value:
+        return is_year_range(value)
+    return is_year(value)
+
+
+def is_backend(backend):
+    """
+    Checks if backend is the name of a data backend
+    Args:
+        backend(str): Value containing backend name e.g 'python', 'compact', 'numpy'
+    Returns:
+        (boolean):  True if backend is 'python', 'compact', 'numpy' or 'sqlite'
+                    False otherwise
+    """
+    return backend in ("python", "compact", "numpy", "sqlite")
+
+
+def is_positive_number(number):
+    """
+    Checks if number contains a positive integer e.g '1', '32'
+    Args:
+        number(str): Value containing digits
+    Returns:
+        (boolean):  True if number contains an integer greater than 0
+                    False otherwise
+    """
+    return isinstance(number, str) and match("positive_number", number)
+
+
+def is_pool(pool):
+    """
+    Checks if pool is the name of a kind of worker pool
+    Args:
+        pool(str): Value containing pool name e.g 'process', 'thread'
+    Returns:
+        (boolean):  True if pool is 'process' or 'thread'
+                    False otherwise
+    """
+    return pool in ("process", "thread")
 
-    regex = """
-    [1-9]       # starting character must be in range 1-9
-    \\d{3}\\b   # must end with 3 digits(0-9)
-    /           # followed by a slash
-    0?[1-9]\\b  # 0 is optional but must end with a digit(1-9)
-    |           # or
-    1[0-2]\\b   # start with 1 and end with digit(0-2)
+
+def is_address(address):
+    """
+    Checks if address contains a port number or the path of a Unix socket
+    Args:
+        address(str): Value containing address e.g '8765', '/tmp/weatherman.sock'
+    Returns:
+        (boolean):  True if address is not empty
+                    False otherwise
+    """
+    return isinstance(address, str) and bool(address.strip())
+
+
+def is_path(path):
+    """
+    Checks if path contains the path of a file to write e.g 'reports.txt'
+    Args:
+        path(str): Value containing path of a file
+    Returns:
+        (boolean):  True if path is not empty
+                    False otherwise
+    """
+    return isinstance(path, str) and bool(path.strip())
+
+
+def is_empty(value):
+    """
+    Checks if value is empty, the argument of flags that take no argument
+    e.g '--stats'
+    Args:
+        value(str): Value given to the flag
+    Returns:
+        (boolean):  True if value is an empty string
+                    False otherwise
+    """
+    return value == ""
+
+
+def is_station(station):
+    """
+    Checks if station contains a station name as it appears in the names of
+    the weather files e.g 'Murree' for 'Murree_weather_2004_Aug.txt'
+    Args:
+        station(str): Value containing station name
+    Returns:
+        (boolean):  True if station is a name without path separators
+                    False otherwise
+    """
+    return isinstance(station, str) and match("station", station)
+
+
+def is_date_range(date_range):
+    """
+    Checks if date_range contains two dates separated by a colon, the first
+    not after the second e.g '2005-11-15:2006-02-10'
+    Args:
+        date_range(str): Value containing the first and the last date
+    Returns:
+        (boolean):  True if date_range contains two dates in order
+                    False if date_range is not in correct format
+    """
+    if not isinstance(date_range, str):
+        return False
+    dates = match("date_range", date_range)
+    if not dates:
+        return False
+    numbers = [int(number) for number in dates.groups()]
+    try:
+        return date(*numbers[:3]) <= date(*numbers[3:])
+    except ValueError:
+        return False
+
+
+def is_window(window):
+    """
+    Checks if window contains a year or two years and the days of the windows
+    separated by colons e.g '2005:30', '2004:2006:7'
+    Args:
+        window(str): Value containing the years and the number of days
+    Returns:
+        (boolean):  True if window contains years in order and a positive number of days
+                    False if window is not in correct format
+    """
+    if not isinstance(window, str):
+        return False
+    years = match("window", window)
+    if not years:
+        return False
+    first_year, last_year, days = years.groups()
+    return int(first_year) <= int(last_year or first_year) and int(days) > 0
+
+
+def is_top(top):
+    """
+    Checks if top contains a year or two years and the number of days of
+    each ranking separated by colons e.g '2006:10', '2004:2016:5'
+    Args:
+        top(str): Value containing the years and the number of days
+    Returns:
+        (boolean):  True if top contains years in order and a positive number of days
+                    False if top is not in correct format
     """
-    return isinstance(year_month, str) and re.match(regex, year_month, re.VERBOSE)
+    return is_window(top)
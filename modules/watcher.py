@@ -0,0 +1,101 @@
+"""
+This module keeps the reports of a run up to date while rows are appended to
+the weather files. The directory is polled, the months whose file was added,
+changed or removed are dropped from the planner's store and every report is
+generated again, the changed files are read from the offset their cache
+stopped at
+"""
+import os
+import time
+
+from modules.cache import get_file_key
+from modules.date_index import drop_date_indexes
+from modules.file_index import parse_file_name, refresh_file_index
+from modules.summary import get_summary_table
+
+
+class Watcher:
+    """
+    This class remembers the weather files of a directory to find the ones
+    that changed since the last poll
+    """
+
+    def __init__(self, planner):
+        """
+        Initializes the members
+        Args:
+            planner(QueryPlanner):  planner holding the parameters and the store
+        """
+        self.planner = planner
+        # {file_path(str): file_key(tuple)}
+        self.file_keys = {}
+
+    def get_file_keys(self):
+        """
+        Scans the directory of the planner again and returns the key of each
+        weather file
+        Returns:
+            (dict): {file_path(str): file_key(tuple)} of the weather files
+        """
+        file_keys = {}
+        for file_path in refresh_file_index(self.planner.path).files.values():
+            try:
+                file_keys[file_path] = get_file_key(file_path)
+            except OSError:
+                # removed since the directory was scanned
+                continue
+        return file_keys
+
+    def poll(self):
+        """
+        Drops the months whose weather file changed since the last poll from
+        the planner's store and the date indexes, so they are loaded again
+        Returns:
+            (boolean):  True if a weather file was added, changed or removed
+        """
+        file_keys = self.get_file_keys()
+        changed = [
+            file_path
+            for file_path in set(file_keys) | set(self.file_keys)
+            if file_keys.get(file_path) != self.file_keys.get(file_path)
+        ]
+        self.file_keys = file_keys
+        for file_path in changed:
+            self.planner.months.pop(parse_file_name(os.path.basename(file_path)), None)
+        if changed:
+            drop_date_indexes(self.planner.path)
+        return bool(changed)
+
+
+def watch(planner, interval, output_path=None, color=True):
+    """
+    Generates the reports of the planner's parameters every time a weather
+    file changes, until interrupted with Ctrl+C
+    Args:
+        planner(QueryPlanner):  planner holding the parameters
+        interval(int):  seconds between two polls of the directory
+        output_path(str or None):   file rewritten with the reports, stdout if None
+        color(bool):    False to write the charts without escape sequences
+    Returns:
+        None
+    """
+    watcher = Watcher(planner)
+    table = get_summary_table(planner.path)
+    try:
+        while True:
+            if watcher.poll():
+                if output_path is None:
+                    print(f"Reports at {time.strftime('%Y-%m-%d %H:%M:%S')}\n")
+                    planner.execute(color=color)
+                else:
+                    try:
+                        with open(output_path, "w", encoding="utf-8") as output:
+                            planner.execute(output, color)
+                    except OSError as error:
+                        print(f"Could not write to {output_path}: {error.strerror}")
+                        return
+                # the aggregates of the appended rows are kept for the next run
+                table.save()
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        print("Stopped watching")
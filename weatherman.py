@@ -2,11 +2,22 @@
 Weatherman is a software that generates reports about the past weather of murree
 """
 import sys
-from getopt import GetoptError, getopt
+from contextlib import nullcontext
+from getopt import GetoptError, getopt, gnu_getopt
 
-from constants import ALLOWED_PARAMETERS, WEATHER_FILES_DIR
-from modules.data_models import MonthData, ReportGenerator, YearData
-from modules.utils import get_year_month, initialize_indexes, validate_command
+from constants import (
+    ALL_STATIONS,
+    ALLOWED_PARAMETERS,
+    DEFAULT_BACKEND,
+    DEFAULT_JOBS,
+    DEFAULT_POOL,
+    LONG_PARAMETERS,
+    WEATHER_FILES_DIR,
+)
+from modules.data_models import MonthData, YearData
+from modules.file_index import get_file_index
+from modules.planner import QueryPlanner
+from modules.utils import validate_command
 
 
 def re_take_input():
@@ -26,14 +37,14 @@ def re_take_input():
         return re_take_input()
     try:
         path = WEATHER_FILES_DIR
-        parameters, args = getopt(parameters, ALLOWED_PARAMETERS)
+        parameters, args = getopt(parameters, ALLOWED_PARAMETERS, LONG_PARAMETERS)
         if args:
             path = args[0]
 
         if not path.endswith("/"):
             path += "/"
         if not parameters:
-            parameters = getopt(args[1:], ALLOWED_PARAMETERS)[0]
+            parameters = getopt(args[1:], ALLOWED_PARAMETERS, LONG_PARAMETERS)[0]
 
         return path, parameters
     except GetoptError:
@@ -41,25 +52,256 @@ def re_take_input():
         return re_take_input()
 
 
-def main():
+def split_parameters(parameters):
     """
-    The driver function for weatherman.
+    Splits the parameters into report parameters and settings
+    Args:
+        parameters(list):   [[flag(str), argument(str)],...] returned by getopt
+    Returns:
+        (tuple):    tuple containing report_parameters(list) and settings(dict)
+                    report_parameters contains [[flag(str), argument(str)],...]
+                    settings contains {long_flag(str): argument(str)}
+    """
+    report_parameters, settings = [], {}
+    for flag, flag_argument in parameters:
+        if flag.startswith("--"):
+            settings[flag] = flag_argument
+        else:
+            report_parameters.append((flag, flag_argument))
+    return report_parameters, settings
+
+
+def get_data_classes(backend):
+    """
+    Returns the classes that hold the data of a month and a year for a backend
+    Args:
+        backend(str):   Value containing backend name e.g 'python', 'compact', 'numpy', 'sqlite'
+    Returns:
+        (tuple):    tuple containing the month class and the year class
+    """
+    # pylint: disable=import-outside-toplevel
+    if backend == "sqlite":
+        from modules.sql_backend import SqlMonthData, SqlYearData
+
+        return SqlMonthData, SqlYearData
+    if backend == "compact":
+        from modules.compact_data import CompactMonthData, CompactYearData
+
+        return CompactMonthData, CompactYearData
+    if backend == "numpy":
+        from modules.array_backend import NUMPY_AVAILABLE, ArrayMonthData, ArrayYearData
+
+        if NUMPY_AVAILABLE:
+            return ArrayMonthData, ArrayYearData
+        print("NumPy is not installed, using the python backend")
+    return MonthData, YearData
+
+
+def print_remote_reports(address, parameters):
+    """
+    Prints the reports generated by a weatherman server started with --serve
+    Args:
+        address(str):   port number or path of the server's Unix socket
+        parameters(list):   validated [[flag(str), argument(str)],...]
     Returns:
         None
     """
+    from modules.client import query  # pylint: disable=import-outside-toplevel
+
     try:
-        path = WEATHER_FILES_DIR
-        parameters, args = getopt(sys.argv[1:], ALLOWED_PARAMETERS)
-        if args:
-            path, parameters = args[0], getopt(args[1:], ALLOWED_PARAMETERS)[0]
+        print(query(address, parameters), end="")
+    except OSError as error:
+        print(f"Could not connect to {address}: {error.strerror or error}")
+
+
+def measure_reports(settings):
+    """
+    Returns the context measuring the reports, modules.stats is only imported
+    if --stats or --profile is given
+    Args:
+        settings(dict): {long_flag(str): argument(str)}
+    Returns:
+        (ContextManager):   context returned by stats.measure or a context doing nothing
+    """
+    if "--stats" not in settings and "--profile" not in settings:
+        return nullcontext()
+    from modules.stats import measure  # pylint: disable=import-outside-toplevel
+
+    return measure(settings)
+
+
+def generate_reports(path, parameters):
+    """
+    Generates the report of each report parameter using the settings, the
+    files needed by all reports are loaded once before any report is generated.
+    -r reports the extremes and averages of a span of days, -w the moving
+    extremes and averages of windows of days, -t the days with the highest
+    and lowest readings of some years and -p the percentiles of their readings.
+    --stats and --profile print where the time went to stderr, --output writes
+    the reports to a file instead of stdout, --watch generates them again
+    whenever the weather files change, --station reports one station and
+    --all-stations reports every station, --db reports from a database with
+    the sqlite backend
+    Args:
+        path(str):  Value containing path to weather files e.g 'weatherfiles/'
+        parameters(list):   validated [[flag(str), argument(str)],...]
+    Returns:
+        None
+    """
+    parameters, settings = split_parameters(parameters)
+    if "--connect" in settings:
+        print_remote_reports(settings["--connect"], parameters)
+        return
+    planner = create_planner(path, settings)
+    if planner is None:
+        return
+    run_planner(planner, parameters, settings)
+
+
+def create_planner(path, settings):
+    """
+    Returns the planner of the reports with the backend, workers and station
+    chosen by the settings
+    Args:
+        path(str):  Value containing path to weather files e.g 'weatherfiles/'
+        settings(dict): {long_flag(str): argument(str)}
+    Returns:
+        (QueryPlanner or None): planner
+                                Or
+                                None if --station names no station of the path
+    """
+    station = settings.get("--station")
+    if "--all-stations" in settings:
+        station = ALL_STATIONS
+    elif station is not None and station not in get_file_index(path).stations():
+        print(f"There is no station {station} in {path}")
+        return None
+    backend = "sqlite" if "--db" in settings else settings.get("--backend")
+    return QueryPlanner(
+        path,
+        get_data_classes(backend or DEFAULT_BACKEND),
+        int(settings.get("--jobs", DEFAULT_JOBS)),
+        settings.get("--pool", DEFAULT_POOL),
+        station,
+    )
+
+
+def run_planner(planner, parameters, settings):
+    """
+    Serves the reports, watches the weather files or writes the reports of
+    the parameters once to stdout or to the --output file
+    Args:
+        planner(QueryPlanner):  planner of the reports
+        parameters(list):   validated report parameters [[flag(str), argument(str)],...]
+        settings(dict): {long_flag(str): argument(str)}
+    Returns:
+        None
+    """
+    color = "--no-color" not in settings
+    # the modules of --serve and --watch are only imported when they are given
+    # pylint: disable=import-outside-toplevel
+    if "--serve" in settings:
+        from modules.server import serve
+
+        serve(planner, settings["--serve"])
+        return
+    for flag, flag_argument in parameters:
+        planner.add(flag, flag_argument)
+    if "--watch" in settings:
+        from modules.watcher import watch
+
+        try:
+            watch(planner, int(settings["--watch"]), settings.get("--output"), color)
+        except OSError as error:
+            print(f"Could not write to {settings['--output']}: {error.strerror}")
+        return
+    if "--output" not in settings:
+        planner.execute(color=color)
+        return
+    try:
+        with open(settings["--output"], "w", encoding="utf-8") as output:
+            planner.execute(output, color)
+    except OSError as error:
+        print(f"Could not write to {settings['--output']}: {error.strerror}")
+
+
+def convert_files(arguments):
+    """
+    Converts a directory of weather files into an archive that can be given
+    as the path of the reports, for 'weatherman.py convert path archive'
+    Args:
+        arguments(list):    arguments after 'convert', the directory and the archive path
+    Returns:
+        None
+    """
+    from modules.converter import convert  # pylint: disable=import-outside-toplevel
+
+    if len(arguments) != 2:
+        print("The correct command format is: 'weatherman.py convert path archive'")
+        return
+    source, destination = arguments
+    if not get_file_index(source).files:
+        print(f"There are no weather files in {source}. Please give a correct path")
+        return
+    try:
+        months, rows = convert(source, destination)
+    except OSError as error:
+        print(f"Could not write to {destination}: {error.strerror}")
+        return
+    print(f"Converted {rows} rows of {months} months from {source} to {destination}")
+
+
+def ingest_files(arguments):
+    """
+    Loads the days of a directory of weather files into a database that can
+    be given to the reports with --db, for 'weatherman.py ingest path --db database'
+    Args:
+        arguments(list):    arguments after 'ingest', the directory and the --db option
+    Returns:
+        None
+    """
+    # pylint: disable=import-outside-toplevel
+    import sqlite3
+
+    from modules.converter import ingest
+
+    usage = "The correct command format is: 'weatherman.py ingest path --db database'"
+    try:
+        options, args = gnu_getopt(arguments, "", ["db="])
     except GetoptError:
-        print("Invalid flag or no flag argument")
-        path, parameters = re_take_input()
+        options, args = [], []
+    if len(args) != 1 or not options:
+        print(usage)
+        return
+    source, destination = args[0], options[-1][1]
+    if not get_file_index(source).files:
+        print(f"There are no weather files in {source}. Please give a correct path")
+        return
+    try:
+        months, rows = ingest(source, destination)
+    except (OSError, sqlite3.Error) as error:
+        print(f"Could not write to {destination}: {getattr(error, 'strerror', error)}")
+        return
+    print(f"Ingested {rows} rows of {months} months from {source} into {destination}")
+
+
+def validate_input(path, parameters):
+    """
+    Validates the path and every parameter, the user is asked for a new
+    command until one is valid
+    Args:
+        path(str):  Value containing path to weather files e.g 'weatherfiles/'
+        parameters(list):   [[flag(str), argument(str)],...] returned by getopt
+    Returns:
+        (tuple):    tuple containing the valid path(str) and parameters(list)
+    """
     iteration = 0
     valid_input = True
     while iteration < len(parameters):
         flag, flag_argument = parameters[iteration]
-        if initialize_indexes(path) is None:
+        # a client gets its reports from a server, so it needs no weather files
+        is_client = any(flag == "--connect" for flag, _ in parameters)
+        if not is_client and not get_file_index(path).file_paths:
             print(
                 f"There are no weather files in {path}. " f"Please give a correct path"
             )
@@ -74,20 +316,38 @@ def main():
             path, parameters = re_take_input()
             continue
         iteration += 1
+    return path, parameters
 
-    for parameter in parameters:
-        flag, flag_argument = parameter
-        if flag == "-e":
-            year_data = YearData(flag_argument, path)
-            ReportGenerator(year_data=year_data).generate_extremes_report()
-        else:
-            year, month = get_year_month(flag_argument)
-            month_data = MonthData(year, month, path)
-            if flag == "-a":
-                ReportGenerator(month_data).generate_averages_report_month()
-            elif flag == "-c":
-                ReportGenerator(month_data).generate_report_charts()
-        print()
+
+def main():
+    """
+    The driver function for weatherman.
+    Returns:
+        None
+    """
+    if sys.argv[1:2] == ["convert"]:
+        convert_files(sys.argv[2:])
+        return
+    if sys.argv[1:2] == ["ingest"]:
+        ingest_files(sys.argv[2:])
+        return
+    try:
+        path = WEATHER_FILES_DIR
+        parameters, args = getopt(sys.argv[1:], ALLOWED_PARAMETERS, LONG_PARAMETERS)
+        if args:
+            path, parameters = (
+                args[0],
+                getopt(args[1:], ALLOWED_PARAMETERS, LONG_PARAMETERS)[0],
+            )
+    except GetoptError:
+        print("Invalid flag or no flag argument")
+        path, parameters = re_take_input()
+    # the reports of --db are read from the database
+    path = next((value for flag, value in parameters if flag == "--db"), path)
+    # measured from here so --stats also times the scan of the weather files
+    with measure_reports(split_parameters(parameters)[1]):
+        path, parameters = validate_input(path, parameters)
+        generate_reports(path, parameters)
 
 
 if __name__ == "__main__":